@@ -15,6 +15,23 @@ class Settings(BaseSettings):
     INITIAL_ADMIN_PASSWORD: str
     RESET_DB_ON_START: bool
     DISABLE_STUDENT_ACCOUNTS: bool
+    # Conflict scans: worker processes (0 = one per CPU, 1 = always serial) and the
+    # number of lessons from which a scan is split across them by date. Only used
+    # when the NumPy kernel below is off or NumPy is not installed
+    CONFLICT_SCAN_WORKERS: int = 0
+    CONFLICT_SCAN_PARALLEL_THRESHOLD: int = 20000
+    # Detect conflicts of whole scans with the NumPy kernel when NumPy is installed;
+    # takes precedence over the process pool above
+    CONFLICT_SCAN_VECTORIZED: bool = True
+    # Memory budget of the in-process conflicts summary cache
+    CONFLICT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Backend ("memory" or "none") and memory budget of the calendar week cache
+    CALENDAR_CACHE_BACKEND: str = "memory"
+    CALENDAR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Memory budget of the in-process cache of list totals
+    LIST_COUNT_CACHE_MAX_BYTES: int = 1024 * 1024
+    # Largest batch accepted by the recurring template import
+    TEMPLATE_IMPORT_MAX_TEMPLATES: int = 1000
 
     model_config = SettingsConfigDict(
         env_file=BASE_DIR / ".env", env_file_encoding="utf-8"
@@ -2,9 +2,14 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
+from .utils.resource_versions import track_resource_versions
+
 engine = create_engine("sqlite:///data.db")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Committed writes bump the resource versions list and calendar ETags are built from
+track_resource_versions(SessionLocal)
+
 
 class Base(DeclarativeBase):
     def __init__(self, **entries):
@@ -16,3 +16,7 @@ from .lesson import Lesson
 from .academic_year import AcademicYear
 from .university_holiday import UniversityHoliday
 from .recurring_template import RecurringLessonTemplate
+from .recurring_lesson_exception import RecurringLessonException
+from .lesson_conflict import LessonConflict, LessonConflictMember
+from .resource_version import ResourceVersion
+from .lesson_change import LessonChange
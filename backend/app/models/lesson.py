@@ -26,6 +26,7 @@ class Lesson(Base):
     - schedule_id: FK to Schedule (owning timetable).
     - group_id: FK to Group (attending cohort).
     - subject_assignment_id: FK to SubjectAssignment (subject/professor/workload).
+    - professor_user_id: denormalized professor (user) ID resolved from the subject assignment.
     - room_id: optional FK to Room (physical location) when not online.
     - is_online: marks whether the lesson is conducted online.
     - date/start_time/end_time: temporal bounds for the lesson occurrence.
@@ -33,9 +34,11 @@ class Lesson(Base):
     - relationships: schedule, group, subject_assignment, room.
     - convenience properties: workload, professor, subject.
     - indices: support fast conflict checks and calendar queries.
+    - change versions are kept per schedule (__version_scope__) for calendar ETags.
     """
 
     __tablename__ = "lesson"
+    __version_scope__ = "schedule_id"
 
     id: Mapped[int] = mapped_column(primary_key=True)  # Unique identifier (primary key)
 
@@ -48,6 +51,9 @@ class Lesson(Base):
     subject_assignment_id: Mapped[int] = mapped_column(
         ForeignKey("subject_assignment.id")
     )  # FK to subject assignment (links subject + professor/workload)
+    professor_user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), nullable=True
+    )  # Denormalized professor of the assignment, kept in sync by repositories/services
     room_id: Mapped[int] = mapped_column(
         ForeignKey("room.id"), nullable=True
     )  # Optional FK to room (null for online or TBA)
@@ -113,10 +119,20 @@ class Lesson(Base):
         Index("idx_room_time_conflict", "room_id", "date", "start_time", "end_time"),
         # Group-time conflict: a group cannot attend multiple lessons at the same time
         Index("idx_group_time_conflict", "group_id", "date", "start_time", "end_time"),
+        # Professor-time conflict: a professor cannot teach in two places at once
+        Index(
+            "idx_professor_time_conflict",
+            "professor_user_id",
+            "date",
+            "start_time",
+            "end_time",
+        ),
         # Calendar filtering: by schedule and start time
         Index("idx_lesson_calendar", "schedule_id", "date", "start_time"),
         # Filtering by subject assignment and group
         Index("idx_lesson_subject_group", "subject_assignment_id", "group_id"),
+        # Generated lessons of a template on given dates (holiday/availability propagation)
+        Index("idx_lesson_template_date", "recurring_template_id", "date"),
     )
 
     # Computed properties for convenience
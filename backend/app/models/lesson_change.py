@@ -0,0 +1,75 @@
+from __future__ import annotations
+from ..database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DDL, Boolean, Index, Integer, event
+
+
+class LessonChange(Base):
+    """
+    Entry of the lesson change log read by delta-sync clients (GET /api/lesson/changes).
+
+    Written by triggers on the lesson table in the writing transaction, so every
+    write path is logged: ORM writes and cascades, bulk template generation and
+    set-based updates/deletes alike. Only the latest entry per (lesson, schedule) is
+    kept, so the log grows with the number of lessons, not of writes.
+
+    Fields overview:
+    - seq: change sequence; AUTOINCREMENT never reuses a value, so cursors stay valid
+      when older entries are replaced.
+    - lesson_id: changed lesson (no FK: tombstones outlive their lesson).
+    - schedule_id: schedule the lesson is in, or was in for a tombstone.
+    - is_deleted: tombstone; the lesson was deleted or moved to another schedule.
+    """
+
+    __tablename__ = "lesson_change"
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    lesson_id: Mapped[int] = mapped_column(Integer)
+    schedule_id: Mapped[int] = mapped_column(Integer)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    __table_args__ = (
+        Index("idx_lesson_change_schedule_seq", "schedule_id", "seq"),
+        Index("idx_lesson_change_lesson", "lesson_id", "schedule_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+# Each trigger replaces the entries of the written lesson in the affected schedules
+LESSON_CHANGE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_insert AFTER INSERT ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = NEW.id AND schedule_id = NEW.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (NEW.id, NEW.schedule_id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_update AFTER UPDATE ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = OLD.id AND schedule_id IN (OLD.schedule_id, NEW.schedule_id);
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        SELECT OLD.id, OLD.schedule_id, 1 WHERE OLD.schedule_id IS NOT NEW.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (NEW.id, NEW.schedule_id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_delete AFTER DELETE ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = OLD.id AND schedule_id = OLD.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (OLD.id, OLD.schedule_id, 1);
+    END
+    """,
+)
+
+# Fresh databases get the triggers with the tables from Base.metadata.create_all
+for trigger in LESSON_CHANGE_TRIGGERS:
+    event.listen(
+        Base.metadata, "after_create", DDL(trigger).execute_if(dialect="sqlite")
+    )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from ..database import Base
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Date, Time, ForeignKey, Index
+from datetime import date as date_type, time
+
+
+class LessonConflict(Base):
+    """
+    Persisted result of conflict detection for one resource on one date.
+    Maintained incrementally by lesson writes, so the conflicts summary is a read
+    instead of a full rescan of the lesson table.
+
+    Fields overview:
+    - id: numeric primary key.
+    - type: conflict type ("room", "professor", "group").
+    - date: date of the conflicting lessons.
+    - resource_id: room ID, professor user ID, or group ID depending on type.
+    - start_time/end_time: time span covered by the overlapping lessons.
+    - severity: severity level; the human-readable message is built when read, so
+      it always shows the current room, professor and group names.
+    - members: lessons involved in the conflict.
+    - indices: lookup by (date, type, resource) for incremental rechecks.
+    """
+
+    __tablename__ = "lesson_conflict"
+
+    id: Mapped[int] = mapped_column(primary_key=True)  # Unique identifier (primary key)
+    type: Mapped[str] = mapped_column(String(20))  # "room" | "professor" | "group"
+    date: Mapped[date_type] = mapped_column(Date)  # Date of the conflicting lessons
+    resource_id: Mapped[int] = mapped_column()  # Room/professor/group identifier
+    start_time: Mapped[time] = mapped_column(Time)  # Earliest start in the cluster
+    end_time: Mapped[time] = mapped_column(Time)  # Latest end in the cluster
+    severity: Mapped[str] = mapped_column(String(20), default="error")
+
+    # Relationships
+    members: Mapped[list["LessonConflictMember"]] = relationship(
+        "LessonConflictMember",
+        back_populates="conflict",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+        order_by="LessonConflictMember.id",
+    )  # One-to-many: lessons involved in this conflict
+
+    __table_args__ = (
+        # Incremental recheck: replace conflicts of one resource on one date
+        Index("idx_lesson_conflict_resource", "date", "type", "resource_id"),
+    )
+
+    @property
+    def lesson_ids(self) -> list[int]:
+        return [member.lesson_id for member in self.members]
+
+    @property
+    def schedule_ids(self) -> set[int]:
+        return {member.schedule_id for member in self.members}
+
+
+class LessonConflictMember(Base):
+    """
+    Lesson participating in a persisted LessonConflict.
+
+    The lesson's schedule_id is copied here so conflict scope (single/shared) and
+    schedule filtering can be resolved without loading the lessons themselves.
+    lesson_id is intentionally not a foreign key: lessons may be removed by bulk
+    deletes, after which the affected conflicts are recomputed.
+    """
+
+    __tablename__ = "lesson_conflict_member"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    conflict_id: Mapped[int] = mapped_column(
+        ForeignKey("lesson_conflict.id", ondelete="CASCADE"), index=True
+    )  # FK to the parent conflict
+    lesson_id: Mapped[int] = mapped_column(index=True)  # Involved lesson
+    schedule_id: Mapped[int] = mapped_column()  # Schedule of the involved lesson
+
+    conflict: Mapped["LessonConflict"] = relationship(
+        "LessonConflict", back_populates="members"
+    )
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from ..database import Base
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Boolean,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    Time,
+    UniqueConstraint,
+)
+from datetime import date as date_type, time
+from typing import TYPE_CHECKING
+from ..utils.enums import LessonTypeEnum
+
+if TYPE_CHECKING:
+    from .recurring_template import RecurringLessonTemplate
+    from .room import Room
+
+
+class RecurringLessonException(Base):
+    """
+    Deviation of one occurrence of a virtual recurring template from its pattern.
+
+    Virtual templates do not materialize Lesson rows; their occurrences are expanded
+    at read time, and only the occurrences that were cancelled, moved or otherwise
+    overridden are stored here.
+
+    Fields overview:
+    - id: numeric primary key
+    - template_id: FK to the virtual RecurringLessonTemplate
+    - occurrence_date: date of the occurrence in the template's pattern (unique per template)
+    - is_cancelled: the occurrence does not take place
+    - date/start_time/end_time: new placement of the occurrence (null = as in the template)
+    - room_id/is_online/lesson_type: overridden lesson values (null = as in the template)
+    """
+
+    __tablename__ = "recurring_lesson_exception"
+
+    id: Mapped[int] = mapped_column(primary_key=True)  # Unique identifier (primary key)
+
+    template_id: Mapped[int] = mapped_column(
+        ForeignKey("recurring_lesson_template.id", ondelete="CASCADE")
+    )
+    occurrence_date: Mapped[date_type] = mapped_column(Date)  # Date in the pattern
+    is_cancelled: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Overrides (null = take the value from the template)
+    date: Mapped[date_type] = mapped_column(Date, nullable=True)  # Moved to this date
+    start_time: Mapped[time] = mapped_column(Time, nullable=True)
+    end_time: Mapped[time] = mapped_column(Time, nullable=True)
+    room_id: Mapped[int] = mapped_column(ForeignKey("room.id"), nullable=True)
+    is_online: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    lesson_type: Mapped[LessonTypeEnum] = mapped_column(
+        Enum(LessonTypeEnum, create_constraint=True, name="lesson_type_enum"),
+        nullable=True,
+    )
+
+    # Relationships
+    template: Mapped["RecurringLessonTemplate"] = relationship(
+        "RecurringLessonTemplate", back_populates="exceptions"
+    )
+    room: Mapped["Room"] = relationship("Room")
+
+    __table_args__ = (
+        # One exception per occurrence
+        UniqueConstraint(
+            "template_id", "occurrence_date", name="uq_recurring_exception_occurrence"
+        ),
+        # Occurrences moved into a read window
+        Index("idx_recurring_exception_date", "date"),
+    )
@@ -2,10 +2,22 @@ from __future__ import annotations
 
 from ..database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Enum, Date, Time, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import (
+    String,
+    Integer,
+    Text,
+    Enum,
+    Date,
+    Time,
+    DateTime,
+    ForeignKey,
+    Boolean,
+    false,
+    func,
+)
 from datetime import datetime, date, time
 from typing import TYPE_CHECKING, List
-from ..utils.enums import LessonTypeEnum
+from ..utils.enums import LessonTypeEnum, WeekParityEnum
 
 
 if TYPE_CHECKING:
@@ -14,6 +26,7 @@ if TYPE_CHECKING:
     from .subject_assignment import SubjectAssignment
     from .room import Room
     from .lesson import Lesson
+    from .recurring_lesson_exception import RecurringLessonException
 
 
 class RecurringLessonTemplate(Base):
@@ -30,13 +43,20 @@ class RecurringLessonTemplate(Base):
     - schedule_id: FK to Schedule this template belongs to
     - group_id: FK to Group that will attend these lessons
     - subject_assignment_id: FK to SubjectAssignment (professor + subject + workload)
+    - professor_user_id: denormalized professor (user) ID resolved from the subject assignment
     - room_id: optional FK to Room (can be null for online lessons)
     - lesson_type: type of lesson (lecture, practice, lab, seminar)
     - is_online: whether lessons are conducted online
     - days_of_week: JSON array of weekday numbers (0=Monday, 6=Sunday)
+    - weekday_mask: days_of_week compiled into a bitmask (bit 0 = Monday) when saved
+    - week_interval: lessons every N-th week, counted from the week of start_date
+    - week_parity: only odd or even academic weeks (week 1 = first week of the semester)
+    - include_dates/exclude_dates: JSON arrays of ISO dates added to / skipped from the pattern
     - start_time/end_time: time bounds for each lesson occurrence
     - start_date: first date to generate lessons from
     - end_date: last date to generate lessons until (null = until semester end)
+    - is_virtual: no Lesson rows are generated; occurrences are expanded at read time
+      and only their exceptions (cancelled/moved/overridden) are stored
     """
 
     __tablename__ = "recurring_lesson_template"
@@ -53,6 +73,9 @@ class RecurringLessonTemplate(Base):
     subject_assignment_id: Mapped[int] = mapped_column(
         ForeignKey("subject_assignment.id")
     )
+    professor_user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), nullable=True, index=True
+    )  # Denormalized professor of the assignment
     room_id: Mapped[int] = mapped_column(
         ForeignKey("room.id"), nullable=True
     )  # Nullable for online lessons
@@ -68,6 +91,22 @@ class RecurringLessonTemplate(Base):
     days_of_week: Mapped[str] = mapped_column(
         String(20)
     )  # JSON array: "[1,3,5]" for Mon,Wed,Fri
+    weekday_mask: Mapped[int] = mapped_column(
+        Integer, nullable=True
+    )  # Compiled days_of_week: bit 0 = Monday
+    week_interval: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1"
+    )  # Every N-th week
+    week_parity: Mapped[WeekParityEnum] = mapped_column(
+        Enum(WeekParityEnum, create_constraint=True, name="week_parity_enum"),
+        nullable=True,
+    )  # Odd/even academic weeks only (null = every week)
+    include_dates: Mapped[str] = mapped_column(
+        Text, nullable=True
+    )  # JSON array: '["2025-10-04"]' extra lesson dates
+    exclude_dates: Mapped[str] = mapped_column(
+        Text, nullable=True
+    )  # JSON array: '["2025-11-03"]' skipped lesson dates
     start_time: Mapped[time] = mapped_column(Time)  # Start time for each lesson
     end_time: Mapped[time] = mapped_column(Time)  # End time for each lesson
 
@@ -79,6 +118,11 @@ class RecurringLessonTemplate(Base):
         Date, nullable=True
     )  # Last date (null = until semester end)
 
+    # Storage mode
+    is_virtual: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false()
+    )  # Occurrences are expanded lazily instead of stored as lessons
+
     # Relationships
     schedule: Mapped["Schedule"] = relationship("Schedule")
     group: Mapped["Group"] = relationship("Group")
@@ -87,3 +131,8 @@ class RecurringLessonTemplate(Base):
     lessons: Mapped[List["Lesson"]] = relationship(
         "Lesson", back_populates="recurring_template", cascade="all, delete-orphan"
     )
+    exceptions: Mapped[List["RecurringLessonException"]] = relationship(
+        "RecurringLessonException",
+        back_populates="template",
+        cascade="all, delete-orphan",
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from ..database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Integer, String
+
+
+class ResourceVersion(Base):
+    """
+    Change version of a table, or of one scope of a table's rows, for HTTP ETags.
+    Maintained by session events on every committed write (see utils.resource_versions),
+    so list and calendar endpoints can tell whether their data changed without
+    loading it.
+
+    Fields overview:
+    - resource: table name.
+    - scope_id: 0 for the whole table; for scoped tables (lessons, scoped by schedule)
+      the scope value, or -1 for set-based writes whose rows' scopes are unknown.
+    - version: time of the last write in nanoseconds (unique across database resets,
+      unlike a counter).
+    """
+
+    __tablename__ = "resource_version"
+
+    resource: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scope_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger)
@@ -14,3 +14,6 @@ from .subject_assignment import SubjectAssignmentRepository
 from .lesson import LessonRepository
 from .university_holiday import UniversityHolidayRepository
 from .recurring_template import RecurringLessonTemplateRepository
+from .recurring_lesson_exception import RecurringLessonExceptionRepository
+from .lesson_conflict import LessonConflictRepository
+from .lesson_change import LessonChangeRepository
@@ -1,6 +1,611 @@
+from typing import Any
+from sqlalchemy import and_, false, func, insert, or_, select, union, update
+from sqlalchemy.orm import selectinload
 from .base import BaseRepository
-from ..models.lesson import Lesson
+from .subject_assignment import SubjectAssignmentRepository
+from ..models import (
+    Lesson,
+    Group,
+    Room,
+    Subject,
+    SubjectAssignment,
+    ProfessorWorkload,
+    ProfessorContract,
+    ProfessorProfile,
+    User,
+)
+
+
+class LessonRow:
+    """
+    Lightweight, read-only projection of a lesson for analytics paths.
+
+    Carries only the scalar columns conflict detection and hour counting need,
+    including the denormalized professor user ID, so no ORM objects or
+    relationship loads are involved.
+    """
+
+    __slots__ = (
+        "id",
+        "date",
+        "start_time",
+        "end_time",
+        "room_id",
+        "group_id",
+        "schedule_id",
+        "subject_assignment_id",
+        "is_online",
+        "professor_user_id",
+    )
+
+    def __init__(
+        self,
+        id,
+        date,
+        start_time,
+        end_time,
+        room_id,
+        group_id,
+        schedule_id,
+        subject_assignment_id,
+        is_online,
+        professor_user_id,
+    ):
+        self.id = id
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.room_id = room_id
+        self.group_id = group_id
+        self.schedule_id = schedule_id
+        self.subject_assignment_id = subject_assignment_id
+        self.is_online = is_online
+        self.professor_user_id = professor_user_id
+
+
+class LessonExportRow:
+    """
+    Read-only projection of a lesson with the display values used by schedule exports.
+    """
+
+    __slots__ = (
+        "id",
+        "date",
+        "start_time",
+        "end_time",
+        "is_online",
+        "group_name",
+        "room_number",
+        "subject_name",
+        "subject_color",
+        "professor_name",
+        "professor_surname",
+    )
+
+    def __init__(
+        self,
+        id,
+        date,
+        start_time,
+        end_time,
+        is_online,
+        group_name,
+        room_number,
+        subject_name,
+        subject_color,
+        professor_name,
+        professor_surname,
+    ):
+        self.id = id
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.is_online = is_online
+        self.group_name = group_name
+        self.room_number = room_number
+        self.subject_name = subject_name
+        self.subject_color = subject_color
+        self.professor_name = professor_name
+        self.professor_surname = professor_surname
 
 
 class LessonRepository(BaseRepository):
     model = Lesson
+
+    def create(self, model_data: dict[str, Any]):
+        """
+        Create a lesson, filling the denormalized professor_user_id from its assignment.
+
+        Args:
+            model_data (dict[str, Any]): Keyword arguments for the Lesson constructor.
+
+        Returns:
+            Lesson: The newly created and refreshed lesson.
+        """
+        lesson = self.add(model_data)
+        self.db.commit()
+        self.db.refresh(lesson)
+        return lesson
+
+    def add(self, model_data: dict[str, Any]) -> Lesson:
+        """
+        Add a lesson like create(), but only flush it (the transaction is not committed).
+
+        Args:
+            model_data (dict[str, Any]): Keyword arguments for the Lesson constructor.
+
+        Returns:
+            Lesson: The flushed lesson (ID assigned).
+        """
+        lesson = Lesson(
+            **{
+                **model_data,
+                "professor_user_id": SubjectAssignmentRepository(
+                    self.db
+                ).professor_user_id(model_data.get("subject_assignment_id")),
+            }
+        )
+        self.db.add(lesson)
+        self.db.flush()
+        return lesson
+
+    def bulk_create(self, rows: list[dict[str, Any]]) -> list[int]:
+        """
+        Insert many lessons with a single batched INSERT ... RETURNING.
+
+        professor_user_id is resolved once per distinct subject assignment. No ORM
+        objects are built, nothing is refreshed, and the transaction is not committed.
+
+        Args:
+            rows (list[dict[str, Any]]): Column values per lesson; all rows must have the same keys.
+
+        Returns:
+            list[int]: IDs of the inserted lessons (not necessarily in the order of rows).
+        """
+        if not rows:
+            return []
+
+        assignments = SubjectAssignmentRepository(self.db)
+        professors = {
+            subject_assignment_id: assignments.professor_user_id(subject_assignment_id)
+            for subject_assignment_id in {row["subject_assignment_id"] for row in rows}
+        }
+        return list(
+            self.db.scalars(
+                insert(Lesson).returning(Lesson.id),
+                [
+                    {
+                        **row,
+                        "professor_user_id": professors[row["subject_assignment_id"]],
+                    }
+                    for row in rows
+                ],
+            )
+        )
+
+    def update(self, db_model: Lesson, update_data: dict[str, Any]):
+        """
+        Update a lesson, re-resolving professor_user_id when the assignment changes.
+
+        Args:
+            db_model (Lesson): The lesson to update.
+            update_data (dict[str, Any]): Mapping of column names to new values.
+
+        Returns:
+            Lesson: The updated and refreshed lesson.
+        """
+        self.assign(db_model, update_data)
+        self.db.commit()
+        self.db.refresh(db_model)
+        return db_model
+
+    def assign(self, db_model: Lesson, update_data: dict[str, Any]) -> Lesson:
+        """
+        Apply an update like update(), but only flush it (the transaction is not committed).
+
+        Args:
+            db_model (Lesson): The lesson to update.
+            update_data (dict[str, Any]): Mapping of column names to new values.
+
+        Returns:
+            Lesson: The flushed lesson.
+        """
+        if "subject_assignment_id" in update_data:
+            update_data = {
+                **update_data,
+                "professor_user_id": SubjectAssignmentRepository(
+                    self.db
+                ).professor_user_id(update_data["subject_assignment_id"]),
+            }
+        for column in db_model.__table__.columns:
+            if column.key in update_data:
+                setattr(db_model, column.key, update_data[column.key])
+        self.db.flush()
+        return db_model
+
+    def sync_professor_user_ids(self, subject_assignment_ids) -> None:
+        """
+        Re-resolve professor_user_id of lessons using the given assignments.
+
+        Issued as one correlated UPDATE after an assignment, workload or contract
+        is moved to another professor. Does not commit.
+
+        Args:
+            subject_assignment_ids (Iterable[int]): Assignments whose professor may have changed.
+        """
+        subject_assignment_ids = list(subject_assignment_ids)
+        if not subject_assignment_ids:
+            return
+
+        self.db.execute(
+            update(Lesson)
+            .where(Lesson.subject_assignment_id.in_(subject_assignment_ids))
+            .values(
+                professor_user_id=SubjectAssignmentRepository.professor_user_id_of(
+                    Lesson.subject_assignment_id
+                )
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+
+    def get_rows(self, *criteria) -> list[LessonRow]:
+        """
+        Load lessons as LessonRow projections with a single column query.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions on Lesson (e.g. Lesson.date >= x).
+
+        Returns:
+            list[LessonRow]: Rows ordered by date and start time.
+        """
+        stmt = (
+            select(
+                Lesson.id,
+                Lesson.date,
+                Lesson.start_time,
+                Lesson.end_time,
+                Lesson.room_id,
+                Lesson.group_id,
+                Lesson.schedule_id,
+                Lesson.subject_assignment_id,
+                Lesson.is_online,
+                Lesson.professor_user_id,
+            )
+            .where(*criteria)
+            .order_by(Lesson.date, Lesson.start_time, Lesson.id)
+        )
+        return [LessonRow(*row) for row in self.db.execute(stmt)]
+
+    def get_export_rows(self, *criteria) -> list[LessonExportRow]:
+        """
+        Load lessons as LessonExportRow projections with a single joined column query.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions on Lesson.
+
+        Returns:
+            list[LessonExportRow]: Rows ordered by date and start time.
+        """
+        stmt = (
+            select(
+                Lesson.id,
+                Lesson.date,
+                Lesson.start_time,
+                Lesson.end_time,
+                Lesson.is_online,
+                Group.name,
+                Room.number,
+                Subject.name,
+                Subject.color,
+                User.name,
+                User.surname,
+            )
+            .outerjoin(Group, Lesson.group_id == Group.id)
+            .outerjoin(Room, Lesson.room_id == Room.id)
+            .outerjoin(
+                SubjectAssignment, Lesson.subject_assignment_id == SubjectAssignment.id
+            )
+            .outerjoin(Subject, SubjectAssignment.subject_id == Subject.id)
+            .outerjoin(User, Lesson.professor_user_id == User.id)
+            .where(*criteria)
+            .order_by(Lesson.date, Lesson.start_time, Lesson.id)
+        )
+        return [LessonExportRow(*row) for row in self.db.execute(stmt)]
+
+    def hydrate(self, lesson_ids) -> dict[int, Lesson]:
+        """
+        Load full Lesson objects (with relations) for the given IDs.
+
+        Args:
+            lesson_ids (Iterable[int]): IDs of lessons that end up in a response.
+
+        Returns:
+            dict[int, Lesson]: Lessons keyed by ID.
+        """
+        lesson_ids = set(lesson_ids)
+        if not lesson_ids:
+            return {}
+
+        return {
+            lesson.id: lesson
+            for lesson in self.query_with_relations()
+            .filter(Lesson.id.in_(lesson_ids))
+            .all()
+        }
+
+    def query_with_relations(self):
+        """
+        Build a Lesson query that eager-loads everything LessonOut and conflict messages need.
+
+        Returns:
+            Query: Lesson query with group/semester, room, schedule, subject and the
+                subject_assignment -> workload -> contract -> professor_profile -> user chain.
+        """
+        return self.db.query(Lesson).options(
+            selectinload(Lesson.group).selectinload(Group.semester),
+            selectinload(Lesson.room),
+            selectinload(Lesson.schedule),
+            selectinload(Lesson.subject_assignment).selectinload(
+                SubjectAssignment.subject
+            ),
+            selectinload(Lesson.subject_assignment)
+            .selectinload(SubjectAssignment.workload)
+            .selectinload(ProfessorWorkload.contract)
+            .selectinload(ProfessorContract.professor_profile)
+            .selectinload(ProfessorProfile.user),
+        )
+
+    def find_overlapping(
+        self,
+        lesson_date,
+        start_time,
+        end_time,
+        *,
+        room_id: int | None = None,
+        group_id: int | None = None,
+        professor_user_id: int | None = None,
+        exclude_lesson_id: int | None = None,
+    ) -> list[Lesson]:
+        """
+        Find lessons on a date whose time overlaps [start_time, end_time) for given resources.
+
+        Each resource is probed with its own query so that every probe is a range scan
+        on its composite index (idx_room_time_conflict, idx_group_time_conflict,
+        idx_professor_time_conflict) instead of one OR-ed full scan.
+
+        Args:
+            lesson_date (date): Date to probe.
+            start_time (time): Candidate start time.
+            end_time (time): Candidate end time.
+            room_id (int | None): Room to probe (skipped when None).
+            group_id (int | None): Group to probe (skipped when None).
+            professor_user_id (int | None): Professor (user) to probe (skipped when None).
+            exclude_lesson_id (int | None): Lesson to ignore (the one being edited).
+
+        Returns:
+            list[Lesson]: Distinct overlapping lessons with relations loaded, ordered by start time.
+        """
+        return self.find_overlapping_between(
+            lesson_date,
+            lesson_date,
+            start_time,
+            end_time,
+            room_id=room_id,
+            group_id=group_id,
+            professor_user_id=professor_user_id,
+            exclude_lesson_id=exclude_lesson_id,
+        )
+
+    def find_overlapping_between(
+        self,
+        date_from,
+        date_to,
+        start_time,
+        end_time,
+        *,
+        room_id: int | None = None,
+        group_id: int | None = None,
+        professor_user_id: int | None = None,
+        exclude_lesson_id: int | None = None,
+        standalone_only: bool = False,
+    ) -> list[Lesson]:
+        """
+        Find lessons in a date range whose time overlaps [start_time, end_time) for given resources.
+
+        Same per-resource index probes as find_overlapping, over a range of dates.
+
+        Args:
+            date_from (date): First date to probe (inclusive).
+            date_to (date): Last date to probe (inclusive).
+            start_time (time): Candidate start time.
+            end_time (time): Candidate end time.
+            room_id (int | None): Room to probe (skipped when None).
+            group_id (int | None): Group to probe (skipped when None).
+            professor_user_id (int | None): Professor (user) to probe (skipped when None).
+            exclude_lesson_id (int | None): Lesson to ignore (the one being edited).
+            standalone_only (bool): Only lessons not generated from a recurring template.
+
+        Returns:
+            list[Lesson]: Distinct overlapping lessons with relations loaded, ordered by date and start time.
+        """
+        probes = []
+        if room_id is not None:
+            probes.append(Lesson.room_id == room_id)
+        if group_id is not None:
+            probes.append(Lesson.group_id == group_id)
+        if professor_user_id is not None:
+            probes.append(Lesson.professor_user_id == professor_user_id)
+
+        found: dict[int, Lesson] = {}
+        for probe in probes:
+            query = self.query_with_relations().filter(
+                probe,
+                Lesson.date >= date_from,
+                Lesson.date <= date_to,
+                Lesson.start_time < end_time,
+                Lesson.end_time > start_time,
+            )
+            if exclude_lesson_id is not None:
+                query = query.filter(Lesson.id != exclude_lesson_id)
+            if standalone_only:
+                query = query.filter(Lesson.recurring_template_id.is_(None))
+
+            for lesson in query.all():
+                found[lesson.id] = lesson
+
+        return sorted(
+            found.values(),
+            key=lambda lesson: (lesson.date, lesson.start_time, lesson.id),
+        )
+
+    def schedule_footprint_ids(
+        self,
+        schedule_id: int,
+        date_from=None,
+        date_to=None,
+        conflict_types: list[str] | None = None,
+    ):
+        """
+        Select IDs of lessons that share a room, group or professor on the same date
+        with a lesson of the given schedule (the schedule's own lessons included).
+
+        Two steps, both in the database: the distinct (resource, date) pairs the
+        schedule uses in the window are collected first, then lessons of any schedule
+        on those pairs are matched through the (resource, date, ...) conflict indexes.
+        Every overlap cluster that contains a lesson of the schedule is fully covered,
+        so conflicts touching the schedule come out exactly as from a full scan.
+
+        Args:
+            schedule_id (int): Target schedule.
+            date_from (date | None): Inclusive start of the window.
+            date_to (date | None): Inclusive end of the window.
+            conflict_types (list[str] | None): Subset of "room", "professor", "group"; None for all.
+
+        Returns:
+            CompoundSelect: Unexecuted UNION of lesson IDs, usable in Lesson.id.in_().
+        """
+        window = [Lesson.schedule_id == schedule_id]
+        if date_from:
+            window.append(Lesson.date >= date_from)
+        if date_to:
+            window.append(Lesson.date <= date_to)
+
+        resources = []
+        if not conflict_types or "room" in conflict_types:
+            resources.append((Lesson.room_id, Lesson.is_online.is_not(True)))
+        if not conflict_types or "professor" in conflict_types:
+            resources.append((Lesson.professor_user_id, None))
+        if not conflict_types or "group" in conflict_types:
+            resources.append((Lesson.group_id, None))
+
+        selects = []
+        for column, condition in resources:
+            used = select(column.label("resource_id"), Lesson.date.label("date")).where(
+                *window, column.is_not(None)
+            )
+            if condition is not None:
+                used = used.where(condition)
+            used = used.distinct().subquery()
+
+            selects.append(
+                select(Lesson.id).join(
+                    used,
+                    and_(column == used.c.resource_id, Lesson.date == used.c.date),
+                )
+            )
+
+        if not selects:
+            return select(Lesson.id).where(false())
+        return union(*selects)
+
+    def find_conflict_candidate_ids(
+        self,
+        date_from=None,
+        date_to=None,
+        conflict_types: list[str] | None = None,
+        within=None,
+    ) -> set[int]:
+        """
+        Return IDs of lessons that overlap another lesson of the same room, group or professor.
+
+        Runs entirely in the database. Lessons are partitioned by (resource, date) and
+        ordered by start time; a lesson is a candidate when it starts before the running
+        maximum end time of the preceding rows, or when the next row starts before it
+        ends. The running MAX (rather than a plain LAG of the previous end) also catches
+        a lesson overlapping a long lesson two or more rows back.
+
+        Every lesson in an overlap cluster of size >= 2 is returned, and no other
+        lesson, so sweeping only these lessons yields the same clusters as sweeping all.
+
+        Args:
+            date_from (date | None): Inclusive start of the window.
+            date_to (date | None): Inclusive end of the window.
+            conflict_types (list[str] | None): Subset of "room", "professor", "group"; None for all.
+            within (Select | None): Lesson ID select to restrict the search to, e.g. schedule_footprint_ids().
+
+        Returns:
+            set[int]: Lesson IDs taking part in at least one overlap.
+        """
+        base = select(
+            Lesson.id,
+            Lesson.date,
+            Lesson.start_time,
+            Lesson.end_time,
+            Lesson.room_id,
+            Lesson.group_id,
+            Lesson.is_online,
+            Lesson.professor_user_id.label("professor_id"),
+        )
+        if date_from:
+            base = base.where(Lesson.date >= date_from)
+        if date_to:
+            base = base.where(Lesson.date <= date_to)
+        if within is not None:
+            base = base.where(Lesson.id.in_(within))
+        base = base.subquery()
+
+        partitions = []
+        if not conflict_types or "room" in conflict_types:
+            partitions.append(
+                (
+                    base.c.room_id,
+                    and_(base.c.room_id.is_not(None), base.c.is_online.is_not(True)),
+                )
+            )
+        if not conflict_types or "professor" in conflict_types:
+            partitions.append((base.c.professor_id, base.c.professor_id.is_not(None)))
+        if not conflict_types or "group" in conflict_types:
+            partitions.append((base.c.group_id, base.c.group_id.is_not(None)))
+
+        selects = []
+        for resource, condition in partitions:
+            window = {
+                "partition_by": (resource, base.c.date),
+                "order_by": (base.c.start_time, base.c.end_time, base.c.id),
+            }
+            ranked = (
+                select(
+                    base.c.id,
+                    base.c.start_time,
+                    base.c.end_time,
+                    func.max(base.c.end_time)
+                    .over(rows=(None, -1), **window)
+                    .label("prev_max_end"),
+                    func.lead(base.c.start_time).over(**window).label("next_start"),
+                )
+                .where(condition)
+                .subquery()
+            )
+            selects.append(
+                select(ranked.c.id).where(
+                    or_(
+                        ranked.c.start_time < ranked.c.prev_max_end,
+                        ranked.c.next_start < ranked.c.end_time,
+                    )
+                )
+            )
+
+        if not selects:
+            return set()
+
+        return set(self.db.execute(union(*selects)).scalars())
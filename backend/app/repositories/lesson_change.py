@@ -0,0 +1,27 @@
+from typing import Optional
+
+from .base import BaseRepository
+from ..models import LessonChange
+
+
+class LessonChangeRepository(BaseRepository):
+    model = LessonChange
+
+    def get_since(
+        self, since: int, schedule_id: Optional[int], limit: int
+    ) -> list[LessonChange]:
+        """
+        Read change log entries after a sequence number, oldest first.
+
+        Args:
+            since (int): Last sequence number the client has seen.
+            schedule_id (Optional[int]): Schedule to restrict to (all schedules when None).
+            limit (int): Maximum number of entries.
+
+        Returns:
+            list[LessonChange]: Entries with seq > since ordered by seq.
+        """
+        query = self.query().filter(LessonChange.seq > since)
+        if schedule_id is not None:
+            query = query.filter(LessonChange.schedule_id == schedule_id)
+        return query.order_by(LessonChange.seq).limit(limit).all()
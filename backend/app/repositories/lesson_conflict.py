@@ -0,0 +1,6 @@
+from .base import BaseRepository
+from ..models.lesson_conflict import LessonConflict
+
+
+class LessonConflictRepository(BaseRepository):
+    model = LessonConflict
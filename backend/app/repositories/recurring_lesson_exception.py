@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, or_, select
+
+from .base import BaseRepository
+from ..models.recurring_lesson_exception import RecurringLessonException
+
+
+class RecurringLessonExceptionRepository(BaseRepository):
+    model = RecurringLessonException
+
+    def get_for_occurrence(
+        self, template_id: int, occurrence_date: date
+    ) -> Optional[RecurringLessonException]:
+        """
+        Find the exception of one occurrence of a virtual template.
+
+        Args:
+            template_id (int): Virtual template.
+            occurrence_date (date): Date of the occurrence in the template's pattern.
+
+        Returns:
+            Optional[RecurringLessonException]: The exception, or None if the occurrence follows the pattern.
+        """
+        return (
+            self.query()
+            .filter(
+                RecurringLessonException.template_id == template_id,
+                RecurringLessonException.occurrence_date == occurrence_date,
+            )
+            .first()
+        )
+
+    def get_for_templates(
+        self,
+        template_ids: Iterable[int],
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> list[RecurringLessonException]:
+        """
+        Load exceptions of templates whose occurrence date or new date falls in a window.
+
+        Args:
+            template_ids (Iterable[int]): Virtual templates.
+            date_from (Optional[date]): First date of the window (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date of the window (inclusive); None for unbounded.
+
+        Returns:
+            list[RecurringLessonException]: Matching exceptions.
+        """
+        template_ids = list(template_ids)
+        if not template_ids:
+            return []
+
+        query = self.query().filter(
+            RecurringLessonException.template_id.in_(template_ids)
+        )
+        if date_from or date_to:
+            query = query.filter(
+                or_(
+                    _in_window(
+                        RecurringLessonException.occurrence_date, date_from, date_to
+                    ),
+                    _in_window(RecurringLessonException.date, date_from, date_to),
+                )
+            )
+        return query.all()
+
+    def moved_into_template_ids(
+        self, date_from: Optional[date], date_to: Optional[date]
+    ):
+        """
+        Select IDs of templates with an occurrence moved into a window.
+
+        Args:
+            date_from (Optional[date]): First date of the window (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date of the window (inclusive); None for unbounded.
+
+        Returns:
+            Select: Template ID select, for use in an IN clause.
+        """
+        return select(RecurringLessonException.template_id).where(
+            RecurringLessonException.is_cancelled.is_(False),
+            _in_window(RecurringLessonException.date, date_from, date_to),
+        )
+
+
+def _in_window(column, date_from: Optional[date], date_to: Optional[date]):
+    """
+    Condition that a nullable date column is set and lies in [date_from, date_to].
+    """
+    conditions = [column.is_not(None)]
+    if date_from:
+        conditions.append(column >= date_from)
+    if date_to:
+        conditions.append(column <= date_to)
+    return and_(*conditions)
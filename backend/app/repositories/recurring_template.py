@@ -1,6 +1,307 @@
+from datetime import date
+from typing import Any, Optional
+from sqlalchemy import and_, or_, true, update
+from sqlalchemy.orm import selectinload
+
 from .base import BaseRepository
+from .subject_assignment import SubjectAssignmentRepository
+from ..models import (
+    Group,
+    ProfessorContract,
+    ProfessorProfile,
+    ProfessorWorkload,
+    Schedule,
+    SubjectAssignment,
+)
 from ..models.recurring_template import RecurringLessonTemplate
+from ..utils.recurrence import format_dates, weekday_mask
 
 
 class RecurringLessonTemplateRepository(BaseRepository):
     model = RecurringLessonTemplate
+
+    def create(self, model_data: dict[str, Any]):
+        """
+        Create a template, filling the denormalized professor_user_id from its assignment
+        and compiling its recurrence rule.
+
+        Args:
+            model_data (dict[str, Any]): Keyword arguments for the template constructor.
+
+        Returns:
+            RecurringLessonTemplate: The newly created and refreshed template.
+        """
+        return super().create(
+            {
+                **_compile_rule(model_data),
+                "professor_user_id": SubjectAssignmentRepository(
+                    self.db
+                ).professor_user_id(model_data.get("subject_assignment_id")),
+            }
+        )
+
+    def bulk_create(self, rows: list[dict[str, Any]]) -> list[RecurringLessonTemplate]:
+        """
+        Add many templates in one flush, like create() but without committing.
+
+        professor_user_id is resolved once per distinct subject assignment.
+
+        Args:
+            rows (list[dict[str, Any]]): Keyword arguments per template.
+
+        Returns:
+            list[RecurringLessonTemplate]: The flushed templates (IDs assigned), in the order of rows.
+        """
+        assignments = SubjectAssignmentRepository(self.db)
+        professors = {
+            subject_assignment_id: assignments.professor_user_id(subject_assignment_id)
+            for subject_assignment_id in {row["subject_assignment_id"] for row in rows}
+        }
+        templates = [
+            RecurringLessonTemplate(
+                **_compile_rule(row),
+                professor_user_id=professors[row["subject_assignment_id"]],
+            )
+            for row in rows
+        ]
+        self.db.add_all(templates)
+        self.db.flush()
+        return templates
+
+    def update(self, db_model: RecurringLessonTemplate, update_data: dict[str, Any]):
+        """
+        Update a template, re-resolving professor_user_id when the assignment changes
+        and recompiling the changed parts of its recurrence rule.
+
+        Args:
+            db_model (RecurringLessonTemplate): The template to update.
+            update_data (dict[str, Any]): Mapping of column names to new values.
+
+        Returns:
+            RecurringLessonTemplate: The updated and refreshed template.
+        """
+        update_data = _compile_rule(update_data)
+        if "subject_assignment_id" in update_data:
+            update_data = {
+                **update_data,
+                "professor_user_id": SubjectAssignmentRepository(
+                    self.db
+                ).professor_user_id(update_data["subject_assignment_id"]),
+            }
+        return super().update(db_model, update_data)
+
+    def sync_professor_user_ids(self, subject_assignment_ids) -> None:
+        """
+        Re-resolve professor_user_id of templates using the given assignments. Does not commit.
+
+        Args:
+            subject_assignment_ids (Iterable[int]): Assignments whose professor may have changed.
+        """
+        subject_assignment_ids = list(subject_assignment_ids)
+        if not subject_assignment_ids:
+            return
+
+        self.db.execute(
+            update(RecurringLessonTemplate)
+            .where(
+                RecurringLessonTemplate.subject_assignment_id.in_(
+                    subject_assignment_ids
+                )
+            )
+            .values(
+                professor_user_id=SubjectAssignmentRepository.professor_user_id_of(
+                    RecurringLessonTemplate.subject_assignment_id
+                )
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+
+    def find_overlapping(
+        self,
+        date_from,
+        date_to,
+        start_time,
+        end_time,
+        *,
+        room_id: int | None = None,
+        group_id: int | None = None,
+        professor_user_id: int | None = None,
+        exclude_template_id: int | None = None,
+    ) -> list[RecurringLessonTemplate]:
+        """
+        Find templates sharing a resource whose date range and time window overlap the given ones.
+
+        Weekdays, holidays and the conflict rules are left to the caller. Templates
+        without an end_date are treated as open-ended here.
+
+        Args:
+            date_from (date): First date of the range (inclusive).
+            date_to (date): Last date of the range (inclusive).
+            start_time (time): Start of the time window.
+            end_time (time): End of the time window.
+            room_id (int | None): Room to match (skipped when None).
+            group_id (int | None): Group to match (skipped when None).
+            professor_user_id (int | None): Professor (user) to match (skipped when None).
+            exclude_template_id (int | None): Template to ignore (the one being checked).
+
+        Returns:
+            list[RecurringLessonTemplate]: Matching templates ordered by ID.
+        """
+        resources = []
+        if room_id is not None:
+            resources.append(RecurringLessonTemplate.room_id == room_id)
+        if group_id is not None:
+            resources.append(RecurringLessonTemplate.group_id == group_id)
+        if professor_user_id is not None:
+            resources.append(
+                RecurringLessonTemplate.professor_user_id == professor_user_id
+            )
+        if not resources:
+            return []
+
+        query = self.query().filter(
+            or_(*resources),
+            RecurringLessonTemplate.start_date <= date_to,
+            or_(
+                RecurringLessonTemplate.end_date.is_(None),
+                RecurringLessonTemplate.end_date >= date_from,
+            ),
+            RecurringLessonTemplate.start_time < end_time,
+            RecurringLessonTemplate.end_time > start_time,
+        )
+        if exclude_template_id is not None:
+            query = query.filter(RecurringLessonTemplate.id != exclude_template_id)
+
+        return query.order_by(RecurringLessonTemplate.id).all()
+
+    def find_virtual(
+        self, *criteria, with_relations: bool = True
+    ) -> list[RecurringLessonTemplate]:
+        """
+        Find virtual templates, optionally with the relations LessonOut and exports need.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions on RecurringLessonTemplate
+                (e.g. overlaps_window()).
+            with_relations (bool): Eager-load relations (see query_with_relations); skip
+                it when only the scalar columns of the occurrences are read.
+
+        Returns:
+            list[RecurringLessonTemplate]: Matching templates ordered by ID.
+        """
+        query = self.query_with_relations() if with_relations else self.query()
+        return (
+            query.filter(RecurringLessonTemplate.is_virtual.is_(True), *criteria)
+            .order_by(RecurringLessonTemplate.id)
+            .all()
+        )
+
+    def find_recurring_on(
+        self,
+        date_from: Optional[date],
+        date_to: Optional[date],
+        weekdays_mask: int,
+        *criteria,
+    ) -> list[RecurringLessonTemplate]:
+        """
+        Find templates overlapping a date window whose pattern can fall on given weekdays.
+
+        Matched on the compiled weekday_mask (templates with include dates always match),
+        so templates that never have lessons on those weekdays are not loaded; exact
+        dates are left to the caller.
+
+        Args:
+            date_from (Optional[date]): First date of the window (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date of the window (inclusive); None for unbounded.
+            weekdays_mask (int): Weekdays to match as a bitmask (bit 0 = Monday).
+            *criteria: Additional filter expressions on RecurringLessonTemplate.
+
+        Returns:
+            list[RecurringLessonTemplate]: Matching templates (virtual ones included) ordered by ID.
+        """
+        return (
+            self.query()
+            .filter(
+                self.overlaps_window(date_from, date_to),
+                or_(
+                    RecurringLessonTemplate.weekday_mask.op("&")(weekdays_mask) != 0,
+                    RecurringLessonTemplate.weekday_mask.is_(None),
+                    RecurringLessonTemplate.include_dates.is_not(None),
+                ),
+                *criteria,
+            )
+            .order_by(RecurringLessonTemplate.id)
+            .all()
+        )
+
+    @staticmethod
+    def overlaps_window(date_from: Optional[date], date_to: Optional[date]):
+        """
+        Condition that a template's date range overlaps [date_from, date_to].
+
+        Args:
+            date_from (Optional[date]): First date of the window (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date of the window (inclusive); None for unbounded.
+
+        Returns:
+            ColumnElement[bool]: Filter expression on RecurringLessonTemplate.
+        """
+        conditions = []
+        if date_to:
+            conditions.append(RecurringLessonTemplate.start_date <= date_to)
+        if date_from:
+            conditions.append(
+                or_(
+                    RecurringLessonTemplate.end_date.is_(None),
+                    RecurringLessonTemplate.end_date >= date_from,
+                )
+            )
+        return and_(true(), *conditions)
+
+    def query_with_relations(self):
+        """
+        Build a template query that eager-loads everything occurrence expansion and LessonOut need.
+
+        Returns:
+            Query: Template query with group/semester, room, schedule/semester, subject and the
+                subject_assignment -> workload -> contract -> professor_profile -> user chain.
+        """
+        return self.db.query(RecurringLessonTemplate).options(
+            selectinload(RecurringLessonTemplate.group).selectinload(Group.semester),
+            selectinload(RecurringLessonTemplate.room),
+            selectinload(RecurringLessonTemplate.schedule).selectinload(
+                Schedule.semester
+            ),
+            selectinload(RecurringLessonTemplate.subject_assignment).selectinload(
+                SubjectAssignment.subject
+            ),
+            selectinload(RecurringLessonTemplate.subject_assignment)
+            .selectinload(SubjectAssignment.workload)
+            .selectinload(ProfessorWorkload.contract)
+            .selectinload(ProfessorContract.professor_profile)
+            .selectinload(ProfessorProfile.user),
+        )
+
+
+def _compile_rule(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Store the recurrence fields present in create/update data in compiled form.
+
+    days_of_week is compiled into weekday_mask once here, so lesson generation never
+    parses it again; date lists are stored as sorted JSON arrays of ISO dates.
+
+    Args:
+        data (dict[str, Any]): Template columns to write.
+
+    Returns:
+        dict[str, Any]: The data with compiled recurrence fields.
+    """
+    data = dict(data)
+    if "days_of_week" in data:
+        data["weekday_mask"] = weekday_mask(data["days_of_week"])
+    if "week_interval" in data:
+        data["week_interval"] = data["week_interval"] or 1
+    for field in ("include_dates", "exclude_dates"):
+        if field in data:
+            data[field] = format_dates(data[field])
+    return data
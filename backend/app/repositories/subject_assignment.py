@@ -1,6 +1,90 @@
+from sqlalchemy import select
+
 from .base import BaseRepository
 from ..models.subject_assignment import SubjectAssignment
+from ..models.professor_workload import ProfessorWorkload
+from ..models.professor_contract import ProfessorContract
 
 
 class SubjectAssignmentRepository(BaseRepository):
     model = SubjectAssignment
+
+    @staticmethod
+    def professor_user_id_of(subject_assignment_id):
+        """
+        Scalar subquery resolving the professor (user) ID of a subject assignment.
+
+        Follows subject_assignment -> workload -> contract.professor_profile_id.
+        Accepts either a literal ID or a column (e.g. Lesson.subject_assignment_id),
+        so the same expression serves single lookups and correlated bulk updates.
+
+        Args:
+            subject_assignment_id: Assignment ID value or column expression.
+
+        Returns:
+            ScalarSelect: Professor user ID, NULL if the chain is incomplete.
+        """
+        return (
+            select(ProfessorContract.professor_profile_id)
+            .join(
+                ProfessorWorkload, ProfessorWorkload.contract_id == ProfessorContract.id
+            )
+            .join(
+                SubjectAssignment, SubjectAssignment.workload_id == ProfessorWorkload.id
+            )
+            .where(SubjectAssignment.id == subject_assignment_id)
+            .scalar_subquery()
+        )
+
+    def professor_user_id(self, subject_assignment_id: int | None) -> int | None:
+        """
+        Resolve the professor (user) ID of a single subject assignment.
+
+        Args:
+            subject_assignment_id (int | None): Assignment ID.
+
+        Returns:
+            int | None: Professor user ID, or None when unresolvable.
+        """
+        if subject_assignment_id is None:
+            return None
+        return self.db.scalar(select(self.professor_user_id_of(subject_assignment_id)))
+
+    def ids_for_workloads(self, workload_ids) -> list[int]:
+        """
+        IDs of subject assignments belonging to the given workloads.
+
+        Args:
+            workload_ids (Iterable[int]): Workload IDs.
+
+        Returns:
+            list[int]: Matching assignment IDs.
+        """
+        return list(
+            self.db.execute(
+                select(SubjectAssignment.id).where(
+                    SubjectAssignment.workload_id.in_(list(workload_ids))
+                )
+            ).scalars()
+        )
+
+    def ids_for_contracts(self, contract_ids) -> list[int]:
+        """
+        IDs of subject assignments belonging to workloads of the given contracts.
+
+        Args:
+            contract_ids (Iterable[int]): Contract IDs.
+
+        Returns:
+            list[int]: Matching assignment IDs.
+        """
+        return list(
+            self.db.execute(
+                select(SubjectAssignment.id)
+                .join(
+                    ProfessorWorkload,
+                    SubjectAssignment.workload_id == ProfessorWorkload.id,
+                )
+                .where(ProfessorWorkload.contract_id.in_(list(contract_ids)))
+            ).scalars()
+        )
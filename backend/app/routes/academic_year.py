@@ -10,6 +10,7 @@ from ..schemas.academic_year import (
     AcademicYearQueryParams,
 )
 from ..services import AcademicYearService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 from typing import Annotated
 
@@ -30,9 +31,10 @@ async def get_academic_years(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[AcademicYearQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve a paginated list of academic years."""
-    return AcademicYearService(db).get_paginated(query_params)
+    return AcademicYearService(db).get_paginated(query_params, conditional)
 
 
 @academic_year_router.get(
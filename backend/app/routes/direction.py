@@ -11,6 +11,7 @@ from ..schemas.direction import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import DirectionService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Academic directions/programs CRUD and listing
@@ -29,8 +30,9 @@ async def get_directions(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[DirectionQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return DirectionService(db).get_paginated(query_params)
+    return DirectionService(db).get_paginated(query_params, conditional)
 
 
 @direction_router.get(
@@ -10,6 +10,7 @@ from ..schemas.faculty import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import FacultyService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 from typing import Annotated
@@ -27,9 +28,12 @@ admin_coordinator_only = RoleChecker([UserRoleEnum.admin, UserRoleEnum.coordinat
     description="Return a paginated list of faculties. Supports pagination, sorting, and free-text search via query params.",
 )
 async def get_faculties(
-    *, db: Session = Depends(get_db), params: Annotated[FacultyQueryParams, Query()]
+    *,
+    db: Session = Depends(get_db),
+    params: Annotated[FacultyQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return FacultyService(db).get_paginated(params)
+    return FacultyService(db).get_paginated(params, conditional)
 
 
 @faculty_router.get(
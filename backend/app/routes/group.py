@@ -11,6 +11,7 @@ from ..schemas.group import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import GroupService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Student groups CRUD and listing
@@ -29,8 +30,9 @@ async def get_groups(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[GroupQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return GroupService(db).get_paginated(query_params)
+    return GroupService(db).get_paginated(query_params, conditional)
 
 
 @group_router.get(
@@ -8,15 +8,26 @@ from ..schemas.lesson import (
     LessonIn,
     LessonOut,
     LessonUpdate,
-    LessonQueryParams,
+    CalendarCacheStatsOut,
     CalendarLessonsResponse,
+    CalendarQueryParams,
+    CompactCalendarLessonsResponse,
+    LessonChangesOut,
+    LessonChangesParams,
 )
 from ..schemas.shared import PaginatedResponse
 from ..schemas.lesson_conflict import (
     ConflictQueryParams,
     ConflictsSummaryOut,
+    ConflictCheckParams,
+    ConflictCheckOut,
+    ConflictCacheStatsOut,
+    ConflictCountsOut,
+    ConflictPageParams,
+    ConflictPageOut,
 )
 from ..services import LessonService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Lesson sessions CRUD, calendar listing, and conflict summary
@@ -27,26 +38,54 @@ admin_coordinator_only = RoleChecker([UserRoleEnum.admin, UserRoleEnum.coordinat
 
 @lesson_router.get(
     "/calendar",
-    response_model=CalendarLessonsResponse,
+    response_model=CalendarLessonsResponse | CompactCalendarLessonsResponse,
     summary="List calendar lessons (no pagination)",
-    description="Return lessons for calendar view filtered by date range and schedule, without pagination.",
+    description="Return lessons for calendar view filtered by date range and schedule, without pagination. With format=compact, lessons are returned as parallel arrays referencing subjects, groups, rooms, professors, workloads and schedules by ID, each entity included once. Bounded windows are served per schedule week from an in-process cache that lesson writes and edits of the shown entities invalidate week by week.",
 )
 async def get_calendar_lessons(
     *,
     db: Session = Depends(get_db),
-    query_params: Annotated[LessonQueryParams, Query()],
+    query_params: Annotated[CalendarQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Get lessons for the calendar with date filtering and no pagination."""
-    return LessonService(db).get_calendar_lessons(query_params)
+    return LessonService(db).get_calendar_lessons(query_params, conditional)
 
 
+@lesson_router.get(
+    "/calendar/cache-stats",
+    response_model=CalendarCacheStatsOut,
+    summary="Get calendar cache statistics",
+    description="Return the backend, hit/miss/eviction counters and memory use of the in-process calendar week cache. Admin/coordinator only.",
+    dependencies=[Depends(admin_coordinator_only)],
+)
+async def get_calendar_cache_stats(db: Session = Depends(get_db)):
+    return LessonService(db).get_calendar_cache_stats()
+
+
+@lesson_router.get(
+    "/changes",
+    response_model=LessonChangesOut,
+    summary="List lesson changes since a cursor",
+    description="Return lessons created or updated since the given cursor in full, and the IDs of lessons deleted (or moved to another schedule) since then, from the lesson change log. Clients keep a local copy of a schedule and pass the returned cursor as since on the next sync; since=0 returns every stored lesson. Occurrences of virtual recurring templates are not included.",
+)
+async def get_lesson_changes(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[LessonChangesParams, Query()],
+):
+    return LessonService(db).get_changes(query_params)
+
+
+# Conflict routes are plain functions: FastAPI runs them in its threadpool, so a
+# scan (serial, vectorized or waiting on the process pool) never blocks the event loop
 @lesson_router.get(
     "/conflicts/summary",
     response_model=ConflictsSummaryOut,
     summary="Get lesson conflicts summary",
-    description="Detect and summarize scheduling conflicts by scope (single/shared) and type (room/professor/group). Lessons are collected across all schedules; optional schedule_id is applied only during grouping.",
+    description="Detect and summarize scheduling conflicts by scope (single/shared) and type (room/professor/group). Served from the persisted conflict index by default (strategy=scan recomputes from all lessons); optional schedule_id is applied only during grouping. Results are cached in memory until a lesson on a date inside the requested window changes.",
 )
-async def get_lesson_conflicts_summary(
+def get_lesson_conflicts_summary(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[ConflictQueryParams, Query()],
@@ -54,6 +93,72 @@ async def get_lesson_conflicts_summary(
     return LessonService(db).get_conflicts_summary(query_params)
 
 
+@lesson_router.get(
+    "/conflicts/counts",
+    response_model=ConflictCountsOut,
+    summary="Get lesson conflict counts",
+    description="Count conflicts per scope (single/shared) and type (room/professor/group) from the persisted conflict index without serializing any lessons. Intended for badges; accepts the same filters as the summary (strategy is ignored).",
+)
+def get_lesson_conflicts_counts(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[ConflictQueryParams, Query()],
+):
+    return LessonService(db).get_conflicts_counts(query_params)
+
+
+@lesson_router.get(
+    "/conflicts/page",
+    response_model=ConflictPageOut,
+    summary="Get a page of lesson conflicts",
+    description="Return conflicts of one scope and type in (date, start time) order, one page at a time. Pass next_cursor of a page as cursor to get the next one; concatenated pages equal the matching summary group.",
+)
+def get_lesson_conflicts_page(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[ConflictPageParams, Query()],
+):
+    return LessonService(db).get_conflicts_page(query_params)
+
+
+@lesson_router.get(
+    "/conflicts/stream",
+    summary="Stream lesson conflicts summary (NDJSON)",
+    description="Stream conflicts from the persisted conflict index as newline-delimited JSON: partial conflict groups (same shape as summary groups, count is per line) in (date, start time) order, followed by a final line with per-type counts and totals.",
+)
+def stream_lesson_conflicts_summary(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[ConflictQueryParams, Query()],
+):
+    return LessonService(db).stream_conflicts_summary(query_params)
+
+
+@lesson_router.get(
+    "/conflicts/check",
+    response_model=ConflictCheckOut,
+    summary="Pre-check a candidate lesson for conflicts",
+    description="Return existing lessons that would clash with a candidate lesson (room, professor, group) without writing anything. Uses indexed per-resource range probes on the candidate's date; exclude_lesson_id skips the lesson being edited.",
+)
+def check_lesson_conflicts(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[ConflictCheckParams, Query()],
+):
+    return LessonService(db).check_conflicts(query_params)
+
+
+@lesson_router.get(
+    "/conflicts/cache-stats",
+    response_model=ConflictCacheStatsOut,
+    summary="Get conflicts summary cache statistics",
+    description="Return hit/miss/eviction counters and memory use of the in-process conflicts summary cache, plus the current lesson-table version. Admin/coordinator only.",
+    dependencies=[Depends(admin_coordinator_only)],
+)
+async def get_conflicts_cache_stats(db: Session = Depends(get_db)):
+    return LessonService(db).get_conflicts_cache_stats()
+
+
 @lesson_router.get(
     "/groups",
     summary="List groups present in a schedule",
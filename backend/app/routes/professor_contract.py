@@ -11,6 +11,7 @@ from ..schemas.professor_contract import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import ProfessorContractService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Professor contracts CRUD and listing
@@ -31,8 +32,9 @@ async def get_professor_contracts(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[ProfessorContractQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return ProfessorContractService(db).get_paginated(query_params)
+    return ProfessorContractService(db).get_paginated(query_params, conditional)
 
 
 @professor_contract_router.get(
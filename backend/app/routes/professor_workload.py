@@ -13,6 +13,7 @@ from ..schemas.professor_workload import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import ProfessorWorkloadService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Professor workloads CRUD, listing, and local warnings
@@ -36,9 +37,10 @@ async def get_professor_workloads(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[ProfessorWorkloadQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve professor workloads with pagination and filtering."""
-    return ProfessorWorkloadService(db).get_paginated(query_params)
+    return ProfessorWorkloadService(db).get_paginated(query_params, conditional)
 
 
 @professor_workload_router.get(
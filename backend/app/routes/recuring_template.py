@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
-from typing import Annotated
+from datetime import date
+from typing import Annotated, List
 
 from ..dependencies import get_db, RoleChecker
 from ..schemas.recurring_template import (
@@ -8,9 +9,17 @@ from ..schemas.recurring_template import (
     RecurringLessonTemplateOut,
     RecurringLessonTemplateUpdate,
     RecurringLessonTemplateQueryParams,
+    RecurringLessonTemplateConflictParams,
+    RecurringLessonTemplateConflictCheckOut,
+    RecurringLessonTemplateImportIn,
+    RecurringLessonTemplateImportJobOut,
+    RecurringLessonTemplatePreviewOut,
+    RecurringLessonExceptionIn,
+    RecurringLessonExceptionOut,
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import RecurringLessonTemplateService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Professor workloads CRUD, listing, and local warnings
@@ -34,9 +43,163 @@ async def get_recurring_templates(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[RecurringLessonTemplateQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve professor workloads with pagination and filtering."""
-    return RecurringLessonTemplateService(db).get_paginated(query_params)
+    return RecurringLessonTemplateService(db).get_paginated(query_params, conditional)
+
+
+@recurring_template_router.get(
+    "/conflicts/check",
+    response_model=RecurringLessonTemplateConflictCheckOut,
+    summary="Pre-check a candidate template for conflicts",
+    description=(
+        "Check a recurring template before it is created or changed, without generating lessons. "
+        "Clashes with other templates are derived from the patterns (weekdays, date ranges, time windows, "
+        "holidays); standalone lessons are probed over the template's date range. "
+        "exclude_template_id skips the template being edited and its lessons."
+    ),
+)
+async def check_recurring_template_conflicts(
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[RecurringLessonTemplateConflictParams, Query()],
+):
+    return RecurringLessonTemplateService(db).check_conflicts(query_params)
+
+
+@recurring_template_router.post(
+    "/preview",
+    response_model=RecurringLessonTemplatePreviewOut,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Preview a new recurring template",
+    description=(
+        "Dry run of template creation: return the lesson dates, the hours consumed against the subject "
+        "assignment's hours_per_subject, and clashes with existing lessons. Nothing is written. "
+        "Only Admin/Coordinator roles are allowed."
+    ),
+)
+async def preview_recurring_template(
+    template: RecurringLessonTemplateIn, db: Session = Depends(get_db)
+):
+    return RecurringLessonTemplateService(db).preview_create(template)
+
+
+@recurring_template_router.post(
+    "/import",
+    response_model=RecurringLessonTemplateImportJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Import a batch of recurring templates",
+    description=(
+        "Queue an import of many templates, e.g. a whole direction's semester timetable, and return the "
+        "job to poll. The batch is validated together and checked for conflicts within itself and with "
+        "existing templates and standalone lessons; then all templates and their lessons are written in "
+        "one transaction, or nothing is written. Only Admin/Coordinator roles are allowed."
+    ),
+)
+async def import_recurring_templates(
+    data: RecurringLessonTemplateImportIn, db: Session = Depends(get_db)
+):
+    return RecurringLessonTemplateService(db).start_import(data)
+
+
+@recurring_template_router.get(
+    "/import/{job_id}",
+    response_model=RecurringLessonTemplateImportJobOut,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Poll a recurring template import",
+    description=(
+        "Return the status and progress of an import job and, once it has succeeded or failed, its result: "
+        "validation errors, conflicts, and the created templates. Only Admin/Coordinator roles are allowed."
+    ),
+)
+async def get_recurring_template_import(job_id: str, db: Session = Depends(get_db)):
+    return RecurringLessonTemplateService(db).get_import_job(job_id)
+
+
+@recurring_template_router.post(
+    "/{recurring_template_id}/preview",
+    response_model=RecurringLessonTemplatePreviewOut,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Preview an update of a recurring template",
+    description=(
+        "Dry run of a template update: same result as the create preview, computed for the template with "
+        "the given changes applied. Future lessons of the template, which the update would regenerate, are "
+        "left out of hours and conflicts. Nothing is written. Only Admin/Coordinator roles are allowed."
+    ),
+)
+async def preview_recurring_template_update(
+    recurring_template_id: int,
+    template: RecurringLessonTemplateUpdate,
+    db: Session = Depends(get_db),
+):
+    return RecurringLessonTemplateService(db).preview_update(
+        recurring_template_id, template
+    )
+
+
+@recurring_template_router.get(
+    "/{recurring_template_id}/conflicts",
+    response_model=RecurringLessonTemplateConflictCheckOut,
+    summary="Check an existing template for conflicts",
+    description="Check a stored recurring template against all other templates and standalone lessons, from the recurrence patterns.",
+)
+async def get_recurring_template_conflicts(
+    *, recurring_template_id: int, db: Session = Depends(get_db)
+):
+    return RecurringLessonTemplateService(db).check_template_conflicts(
+        recurring_template_id
+    )
+
+
+@recurring_template_router.get(
+    "/{recurring_template_id}/exceptions",
+    response_model=List[RecurringLessonExceptionOut],
+    summary="List exceptions of a virtual template",
+    description="Return the cancelled, moved and overridden occurrences of a virtual recurring template.",
+)
+async def get_recurring_template_exceptions(
+    *, recurring_template_id: int, db: Session = Depends(get_db)
+):
+    return RecurringLessonTemplateService(db).get_exceptions(recurring_template_id)
+
+
+@recurring_template_router.put(
+    "/{recurring_template_id}/exceptions/{occurrence_date}",
+    response_model=RecurringLessonExceptionOut,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Cancel, move or override an occurrence of a virtual template",
+    description=(
+        "Store the exception of one occurrence (identified by its date in the template's pattern), "
+        "replacing the previous one. Null fields keep the template's values. "
+        "Only Admin/Coordinator roles are allowed."
+    ),
+)
+async def put_recurring_template_exception(
+    recurring_template_id: int,
+    occurrence_date: date,
+    exception: RecurringLessonExceptionIn,
+    db: Session = Depends(get_db),
+):
+    return RecurringLessonTemplateService(db).set_exception(
+        recurring_template_id, occurrence_date, exception
+    )
+
+
+@recurring_template_router.delete(
+    "/{recurring_template_id}/exceptions/{occurrence_date}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_coordinator_only)],
+    summary="Restore an occurrence of a virtual template",
+    description="Delete the exception of one occurrence, so it follows the template again. Only Admin/Coordinator roles are allowed.",
+)
+async def delete_recurring_template_exception(
+    recurring_template_id: int, occurrence_date: date, db: Session = Depends(get_db)
+):
+    return RecurringLessonTemplateService(db).delete_exception(
+        recurring_template_id, occurrence_date
+    )
 
 
 @recurring_template_router.get(
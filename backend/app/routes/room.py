@@ -11,6 +11,7 @@ from ..schemas.room import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import RoomService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Room resources and availability checks
@@ -30,9 +31,12 @@ admin_coordinator_only = RoleChecker([UserRoleEnum.admin, UserRoleEnum.coordinat
     ),
 )
 async def get_rooms(
-    *, db: Session = Depends(get_db), query_params: Annotated[RoomQueryParams, Query()]
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[RoomQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return RoomService(db).get_paginated(query_params)
+    return RoomService(db).get_paginated(query_params, conditional)
 
 
 @room_router.get(
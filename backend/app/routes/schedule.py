@@ -12,6 +12,7 @@ from ..schemas.schedule import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import ScheduleService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Schedules (timetables) CRUD and export
@@ -30,9 +31,10 @@ async def get_schedule(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[ScheduleQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve a paginated list of schedules."""
-    return ScheduleService(db).get_paginated(query_params)
+    return ScheduleService(db).get_paginated(query_params, conditional)
 
 
 @schedule_router.get(
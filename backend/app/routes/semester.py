@@ -10,6 +10,7 @@ from ..schemas.semester import (
     SemesterQueryParams,
 )
 from ..services import SemesterService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 from typing import Annotated
 
@@ -29,8 +30,9 @@ async def get_semesters(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[SemesterQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return SemesterService(db).get_paginated(query_params)
+    return SemesterService(db).get_paginated(query_params, conditional)
 
 
 @semester_router.get(
@@ -11,6 +11,7 @@ from ..schemas.study_form import (
 )
 from ..schemas.shared import PaginatedResponse
 from ..services import StudyFormService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Study forms (e.g., FULL_TIME, PART_TIME) CRUD and listing
@@ -32,9 +33,10 @@ async def get_study_forms(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[StudyFormQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve paginated study forms."""
-    return StudyFormService(db).get_paginated(query_params)
+    return StudyFormService(db).get_paginated(query_params, conditional)
 
 
 @study_form_router.get(
@@ -5,6 +5,7 @@ from ..dependencies import get_db, RoleChecker
 from ..schemas.shared import PaginatedResponse
 from ..schemas.subject import SubjectIn, SubjectUpdate, SubjectOut, SubjectQueryParams
 from ..services import SubjectService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 from typing import Annotated
 
@@ -24,8 +25,9 @@ async def get_subjects(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[SubjectQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return SubjectService(db).get_paginated(query_params)
+    return SubjectService(db).get_paginated(query_params, conditional)
 
 
 @subject_router.get(
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.dependencies import get_db, RoleChecker
 from app.services.subject_assignment import SubjectAssignmentService
+from app.utils.conditional import ConditionalRequest
 from app.schemas.subject_assignment import (
     SubjectAssignmentOut,
     SubjectAssignmentIn,
@@ -35,9 +36,10 @@ async def get_subject_assignments(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[SubjectAssignmentQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
     """Retrieve subject assignments with pagination and filtering."""
-    return SubjectAssignmentService(db).get_paginated(query_params)
+    return SubjectAssignmentService(db).get_paginated(query_params, conditional)
 
 
 @subject_assignment_router.post(
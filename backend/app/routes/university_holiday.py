@@ -9,7 +9,8 @@ from ..schemas.university_holiday import (
     UniversityHolidayOut,
     UniversityHolidayQueryParams,
 )
-from ..services import UniversityHolidayService
+from ..services import RecurringLessonTemplateService, UniversityHolidayService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 from typing import Annotated
 
@@ -31,8 +32,9 @@ async def get_university_holidays(
     *,
     db: Session = Depends(get_db),
     query_params: Annotated[UniversityHolidayQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return UniversityHolidayService(db).get_paginated(query_params)
+    return UniversityHolidayService(db).get_paginated(query_params, conditional)
 
 
 @university_holiday_router.get(
@@ -53,12 +55,12 @@ async def get_university_holiday_by_id(
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(admin_coordinator_only)],
     summary="Create a university_holiday",
-    description="Create a new university_holiday under a specific direction and semester. Only Admin/Coordinator roles are allowed.",
+    description="Create a new university_holiday under a specific direction and semester. Generated lessons of recurring templates on its dates are removed. Only Admin/Coordinator roles are allowed.",
 )
 async def create_university_holiday(
     university_holiday: UniversityHolidayIn, db: Session = Depends(get_db)
 ):
-    return UniversityHolidayService(db).create(university_holiday)
+    return RecurringLessonTemplateService(db).create_holiday(university_holiday)
 
 
 @university_holiday_router.put(
@@ -66,14 +68,14 @@ async def create_university_holiday(
     response_model=UniversityHolidayOut,
     dependencies=[Depends(admin_coordinator_only)],
     summary="Replace a university_holiday",
-    description="Replace all fields of an existing university_holiday by ID. Only Admin/Coordinator roles are allowed.",
+    description="Replace all fields of an existing university_holiday by ID. Lessons of recurring templates are moved off the new dates and regenerated on the old ones. Only Admin/Coordinator roles are allowed.",
 )
 async def update_university_holiday(
     university_holiday_id: int,
     university_holiday: UniversityHolidayIn,
     db: Session = Depends(get_db),
 ):
-    return UniversityHolidayService(db).update(
+    return RecurringLessonTemplateService(db).update_holiday(
         university_holiday_id, university_holiday
     )
 
@@ -83,14 +85,14 @@ async def update_university_holiday(
     response_model=UniversityHolidayOut,
     dependencies=[Depends(admin_coordinator_only)],
     summary="Partially update a university_holiday",
-    description="Apply a partial update to an existing university_holiday by ID. Only Admin/Coordinator roles are allowed.",
+    description="Apply a partial update to an existing university_holiday by ID. Lessons of recurring templates follow its dates as on replace. Only Admin/Coordinator roles are allowed.",
 )
 async def patch_university_holiday(
     university_holiday_id: int,
     university_holiday: UniversityHolidayUpdate,
     db: Session = Depends(get_db),
 ):
-    return UniversityHolidayService(db).update(
+    return RecurringLessonTemplateService(db).update_holiday(
         university_holiday_id, university_holiday
     )
 
@@ -100,9 +102,9 @@ async def patch_university_holiday(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(admin_coordinator_only)],
     summary="Delete a university_holiday",
-    description="Delete a university_holiday by ID. Only Admin/Coordinator roles are allowed. Returns 204 No Content on success.",
+    description="Delete a university_holiday by ID. Lessons of recurring templates are regenerated on its dates. Only Admin/Coordinator roles are allowed. Returns 204 No Content on success.",
 )
 async def delete_university_holiday(
     university_holiday_id: int, db: Session = Depends(get_db)
 ):
-    return UniversityHolidayService(db).delete(university_holiday_id)
+    RecurringLessonTemplateService(db).delete_holiday(university_holiday_id)
@@ -12,6 +12,7 @@ from ..schemas.user import (
     UserQueryParams,
 )
 from ..services import UserService
+from ..utils.conditional import ConditionalRequest
 from ..utils.enums import UserRoleEnum
 
 # Router: Users CRUD, authentication helpers, and profile access
@@ -27,9 +28,12 @@ admin_only = RoleChecker([UserRoleEnum.admin])
     description="Return a paginated list of users. Supports pagination, sorting, and filters (user_roles, user_types, q).",
 )
 async def get_users(
-    *, db: Session = Depends(get_db), query_params: Annotated[UserQueryParams, Query()]
+    *,
+    db: Session = Depends(get_db),
+    query_params: Annotated[UserQueryParams, Query()],
+    conditional: Annotated[ConditionalRequest, Depends()],
 ):
-    return UserService(db).get_paginated(query_params)
+    return UserService(db).get_paginated(query_params, conditional)
 
 
 @user_router.get(
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import date as pdate, time
-from typing import Optional, List
+from typing import Dict, Optional, List
 from .shared import BaseQueryParams, BaseFilterParams
 from .minis import (
     GroupMiniOut,
@@ -11,7 +11,7 @@ from .minis import (
     ProfessorWorkloadMiniOut,
 )
 
-from ..utils.enums import LessonTypeEnum
+from ..utils.enums import CalendarFormatEnum, LessonTypeEnum
 
 
 class LessonBase(BaseModel):
@@ -265,6 +265,16 @@ class LessonQueryParams(LessonFilterParams):
     pass
 
 
+class CalendarQueryParams(LessonQueryParams):
+    """Query parameters of the calendar view."""
+
+    format: CalendarFormatEnum = Field(
+        default=CalendarFormatEnum.full,
+        description='Payload format: "full" nests related entities in every lesson, "compact" returns lesson columns referencing entities by ID plus one dictionary per entity type.',
+        examples=["compact"],
+    )
+
+
 class CalendarLessonsResponse(BaseModel):
     """
     Response schema for calendar view containing lessons within a date range.
@@ -292,3 +302,218 @@ class CalendarLessonsResponse(BaseModel):
         description="Inclusive end date of the requested period (YYYY-MM-DD).",
         examples=["2024-10-31"],
     )
+
+
+class CalendarLessonColumnsOut(BaseModel):
+    """
+    Lessons of the compact calendar as parallel arrays: the i-th element of every
+    array belongs to the i-th lesson. Related entities are referenced by ID and
+    resolved through CalendarEntitiesOut.
+    """
+
+    id: List[int] = Field(
+        default_factory=list,
+        description="Lesson identifiers (negative for occurrences of virtual templates).",
+        examples=[[123, 124]],
+    )
+    date: List[pdate] = Field(
+        default_factory=list,
+        description="Calendar dates (YYYY-MM-DD).",
+        examples=[["2024-10-15", "2024-10-15"]],
+    )
+    start_time: List[time] = Field(
+        default_factory=list,
+        description="Start times (HH:MM:SS).",
+        examples=[["10:00:00", "12:00:00"]],
+    )
+    end_time: List[time] = Field(
+        default_factory=list,
+        description="End times (HH:MM:SS).",
+        examples=[["11:30:00", "13:30:00"]],
+    )
+    lesson_type: List[str] = Field(
+        default_factory=list,
+        description="Lesson types.",
+        examples=[["LECTURE", "LAB"]],
+    )
+    is_online: List[bool] = Field(
+        default_factory=list,
+        description="Whether each lesson is conducted online.",
+        examples=[[False, True]],
+    )
+    subject_assignment_id: List[int] = Field(
+        default_factory=list,
+        description="Subject assignment identifiers.",
+        examples=[[42, 43]],
+    )
+    subject_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.subjects.",
+        examples=[[7, 8]],
+    )
+    group_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.groups.",
+        examples=[[10, 10]],
+    )
+    room_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.rooms; null for online or TBA.",
+        examples=[[101, None]],
+    )
+    professor_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.professors.",
+        examples=[[55, 56]],
+    )
+    workload_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.workloads.",
+        examples=[[9, 11]],
+    )
+    schedule_id: List[Optional[int]] = Field(
+        default_factory=list,
+        description="Keys into entities.schedules.",
+        examples=[[5, 5]],
+    )
+
+
+class CalendarEntitiesOut(BaseModel):
+    """Entities referenced by the compact calendar, each included once, keyed by ID."""
+
+    subjects: Dict[int, SubjectMiniOut] = Field(
+        default_factory=dict,
+        description="Subjects by ID.",
+    )
+    groups: Dict[int, GroupMiniOut] = Field(
+        default_factory=dict,
+        description="Groups by ID.",
+    )
+    rooms: Dict[int, RoomMiniOut] = Field(
+        default_factory=dict,
+        description="Rooms by ID.",
+    )
+    professors: Dict[int, ProfessorMiniOut] = Field(
+        default_factory=dict,
+        description="Professors (users) by ID.",
+    )
+    workloads: Dict[int, ProfessorWorkloadMiniOut] = Field(
+        default_factory=dict,
+        description="Professor workloads by ID.",
+    )
+    schedules: Dict[int, ScheduleMiniOut] = Field(
+        default_factory=dict,
+        description="Schedules by ID.",
+    )
+
+
+class CompactCalendarLessonsResponse(BaseModel):
+    """
+    Compact calendar payload (format=compact): the same lessons as
+    CalendarLessonsResponse, without repeating related entities in every lesson.
+    """
+
+    lessons: CalendarLessonColumnsOut = Field(
+        default_factory=CalendarLessonColumnsOut,
+        description="Lessons in the requested period as parallel arrays.",
+    )
+    entities: CalendarEntitiesOut = Field(
+        default_factory=CalendarEntitiesOut,
+        description="Related entities referenced by the lesson arrays.",
+    )
+    count: int = Field(
+        ...,
+        description="Total number of lessons returned.",
+        examples=[25],
+    )
+    date_from: Optional[pdate] = Field(
+        default=None,
+        description="Inclusive start date of the requested period (YYYY-MM-DD).",
+        examples=["2024-10-01"],
+    )
+    date_to: Optional[pdate] = Field(
+        default=None,
+        description="Inclusive end date of the requested period (YYYY-MM-DD).",
+        examples=["2024-10-31"],
+    )
+
+
+class CalendarCacheStatsOut(BaseModel):
+    """
+    Counters of the in-process calendar week cache.
+    """
+
+    backend: str = Field(
+        ..., description='Cache backend ("memory" or "none").', examples=["memory"]
+    )
+    hits: int = Field(
+        ..., description="Schedule weeks served from the cache.", examples=[950]
+    )
+    misses: int = Field(
+        ..., description="Schedule weeks that had to be loaded.", examples=[12]
+    )
+    evictions: int = Field(
+        ...,
+        description="Entries evicted to stay within the memory budget.",
+        examples=[0],
+    )
+    entries: int = Field(
+        ..., description="Schedule weeks currently cached.", examples=[12]
+    )
+    bytes: int = Field(
+        ..., description="Approximate size of cached weeks.", examples=[1843200]
+    )
+    max_bytes: int = Field(
+        ..., description="Memory budget of the cache.", examples=[67108864]
+    )
+
+
+class LessonChangesParams(BaseModel):
+    """Query parameters of the lesson change feed."""
+
+    since: int = Field(
+        default=0,
+        ge=0,
+        description="Cursor returned by the previous sync; 0 returns every stored lesson.",
+        examples=[1532],
+    )
+    schedule_id: Optional[int] = Field(
+        default=None,
+        description="Schedule to sync (all schedules when omitted).",
+        examples=[1],
+    )
+    limit: int = Field(
+        default=500,
+        ge=1,
+        le=5000,
+        description="Maximum number of change log entries per response.",
+        examples=[500],
+    )
+
+
+class LessonChangesOut(BaseModel):
+    """
+    Lessons changed since a cursor: current versions of created or updated lessons
+    and IDs of deleted ones.
+    """
+
+    items: List[LessonOut] = Field(
+        default_factory=list,
+        description="Created or updated lessons, ordered by ID.",
+        examples=[[{"id": 1, "lesson_type": "LECTURE"}]],
+    )
+    deleted_ids: List[int] = Field(
+        default_factory=list,
+        description="Lessons deleted (or moved to another schedule) since the cursor.",
+        examples=[[17, 18]],
+    )
+    cursor: int = Field(
+        ...,
+        description="Cursor to pass as since on the next sync.",
+        examples=[1570],
+    )
+    has_more: bool = Field(
+        ...,
+        description="More changes are pending; sync again right away with the new cursor.",
+        examples=[False],
+    )
@@ -1,8 +1,14 @@
-from pydantic import BaseModel, Field
-from datetime import date as date_type
+from pydantic import BaseModel, Field, model_validator
+from datetime import date as date_type, time
 from typing import Optional, List, Dict
+from typing_extensions import Self
 from .shared import BasePaginationParams
 from .lesson import LessonOut
+from ..utils.enums import (
+    ConflictScopeEnum,
+    ConflictStrategyEnum,
+    ConflictTypeEnum,
+)
 
 
 class ConflictOut(BaseModel):
@@ -158,6 +164,11 @@ class ConflictFilterParams(BaseModel):
         description='Filter by severity. One of: "error", "warning".',
         examples=["error"],
     )
+    strategy: ConflictStrategyEnum = Field(
+        default=ConflictStrategyEnum.index,
+        description='How conflicts are obtained: "index" reads the persisted conflict index, "scan" recomputes from all lessons, "sql" finds overlapping lessons with window functions and hydrates only those.',
+        examples=["index"],
+    )
 
 
 class ConflictQueryParams(ConflictFilterParams):
@@ -166,3 +177,214 @@ class ConflictQueryParams(ConflictFilterParams):
     """
 
     pass
+
+
+class ConflictCheckParams(BaseModel):
+    """
+    Candidate lesson to check for conflicts before it is written.
+    Mirrors the placement fields of LessonIn.
+    """
+
+    date: date_type = Field(
+        ...,
+        description="Calendar date of the candidate lesson (YYYY-MM-DD).",
+        examples=["2024-10-15"],
+    )
+    start_time: time = Field(
+        ...,
+        description="Start time (HH:MM:SS).",
+        examples=["10:00:00"],
+    )
+    end_time: time = Field(
+        ...,
+        description="End time (HH:MM:SS).",
+        examples=["11:30:00"],
+    )
+    room_id: Optional[int] = Field(
+        default=None,
+        description="Room of the candidate lesson; null for online or TBA.",
+        examples=[101],
+    )
+    group_id: int = Field(
+        ...,
+        description="Attending group of the candidate lesson.",
+        examples=[10],
+    )
+    subject_assignment_id: int = Field(
+        ...,
+        description="Subject assignment (resolves the professor).",
+        examples=[42],
+    )
+    is_online: bool = Field(
+        default=False,
+        description="Whether the candidate lesson is online.",
+        examples=[False],
+    )
+    exclude_lesson_id: Optional[int] = Field(
+        default=None,
+        description="Existing lesson to ignore, e.g. the lesson being edited.",
+        examples=[123],
+    )
+
+    @model_validator(mode="after")
+    def check_time_range(self) -> Self:
+        """Ensure the candidate ends after it starts."""
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be later than start_time")
+        return self
+
+
+class ConflictCheckOut(BaseModel):
+    """
+    Result of a write-time conflict pre-check.
+    Each conflict lists the existing lessons that clash with the candidate.
+    """
+
+    has_conflicts: bool = Field(
+        ...,
+        description="True if the candidate clashes with at least one existing lesson.",
+        examples=[True],
+    )
+    conflicts: List[ConflictOut] = Field(
+        default_factory=list,
+        description="Detected room/professor/group conflicts (candidate itself is not listed).",
+    )
+    count: int = Field(
+        default=0,
+        description="Number of detected conflicts.",
+        examples=[1],
+    )
+
+
+class ConflictCacheStatsOut(BaseModel):
+    """
+    Counters of the in-process conflicts summary cache.
+    """
+
+    hits: int = Field(
+        ..., description="Summaries served from the cache.", examples=[42]
+    )
+    misses: int = Field(
+        ..., description="Summaries that had to be computed.", examples=[7]
+    )
+    evictions: int = Field(
+        ...,
+        description="Entries evicted to stay within the memory budget.",
+        examples=[0],
+    )
+    entries: int = Field(..., description="Summaries currently cached.", examples=[5])
+    bytes: int = Field(
+        ..., description="Approximate size of cached summaries.", examples=[183400]
+    )
+    max_bytes: int = Field(
+        ..., description="Memory budget of the cache.", examples=[33554432]
+    )
+    version: int = Field(
+        ...,
+        description="Current lesson-table version; bumped by every lesson write.",
+        examples=[118],
+    )
+
+
+class ConflictCountsOut(BaseModel):
+    """
+    Conflict counters by scope and type, without the conflicts themselves.
+    Cheap to compute (one aggregate over the conflict index); intended for badges.
+    """
+
+    single: Dict[str, int] = Field(
+        default_factory=dict,
+        description='Number of "single" conflicts per type.',
+        examples=[{"room": 2, "professor": 0, "group": 1}],
+    )
+    shared: Dict[str, int] = Field(
+        default_factory=dict,
+        description='Number of "shared" conflicts per type.',
+        examples=[{"room": 0, "professor": 1, "group": 0}],
+    )
+    total_single: int = Field(
+        default=0,
+        description="Total number of single-scope conflicts.",
+        examples=[3],
+    )
+    total_shared: int = Field(
+        default=0,
+        description="Total number of shared-scope conflicts.",
+        examples=[1],
+    )
+    total_conflicts: int = Field(
+        default=0,
+        description="Total number of conflicts across all scopes.",
+        examples=[4],
+    )
+
+
+class ConflictPageParams(BaseModel):
+    """
+    Query parameters for one page of conflicts of a single scope and type.
+    Pages are read from the persisted conflict index in (date, start time) order.
+    """
+
+    conflict_scope: ConflictScopeEnum = Field(
+        ...,
+        description='Scope to page through. One of: "single" or "shared".',
+        examples=["single"],
+    )
+    type: ConflictTypeEnum = Field(
+        ...,
+        description='Conflict type to page through. One of: "room", "professor", "group".',
+        examples=["room"],
+    )
+    schedule_id: Optional[int] = Field(
+        default=None,
+        description="Only include conflicts that touch this schedule.",
+        examples=[5],
+    )
+    date_from: Optional[date_type] = Field(
+        default=None,
+        description="Inclusive start date (YYYY-MM-DD).",
+        examples=["2024-10-01"],
+    )
+    date_to: Optional[date_type] = Field(
+        default=None,
+        description="Inclusive end date (YYYY-MM-DD).",
+        examples=["2024-10-31"],
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from the previous page's next_cursor; omit for the first page.",
+        examples=["WyIyMDI0LTEwLTAxIiwiMTA6MDA6MDAiLDQyXQ"],
+    )
+    limit: int = Field(
+        default=50,
+        ge=1,
+        le=500,
+        description="Maximum number of conflicts per page.",
+        examples=[50],
+    )
+
+
+class ConflictPageOut(BaseModel):
+    """
+    One page of conflicts of a single scope and type.
+    """
+
+    conflict_scope: str = Field(
+        ...,
+        description='Scope of the conflicts. One of: "single" or "shared".',
+        examples=["single"],
+    )
+    type: str = Field(
+        ...,
+        description='Conflict type. One of: "room", "professor", "group".',
+        examples=["room"],
+    )
+    conflicts: List[ConflictOut] = Field(
+        default_factory=list,
+        description="Conflicts of this page, ordered by date and start time.",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page; null when this is the last page.",
+        examples=["WyIyMDI0LTEwLTAzIiwiMDg6MzA6MDAiLDk3XQ"],
+    )
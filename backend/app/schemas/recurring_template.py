@@ -10,7 +10,10 @@ from .minis import (
     ScheduleMiniOut,
 )
 
-from ..utils.enums import LessonTypeEnum
+from .lesson_conflict import ConflictOut
+
+from ..utils.enums import JobStatusEnum, LessonTypeEnum, WeekParityEnum
+from ..utils.recurrence import parse_dates
 
 
 class RecurringLessonTemplateBase(BaseModel):
@@ -60,6 +63,28 @@ class RecurringLessonTemplateBase(BaseModel):
         description="List of weekday numbers (0=Monday, 6=Sunday) when lessons occur.",
         examples=[[1, 3, 5]],
     )
+    week_interval: int = Field(
+        1,
+        ge=1,
+        le=52,
+        description="Lessons take place every N-th week, counted from the week of start_date (1 = every week).",
+        examples=[2],
+    )
+    week_parity: Optional[WeekParityEnum] = Field(
+        None,
+        description="Only odd or even academic weeks (week 1 is the first week of the semester); null for every week.",
+        examples=["odd"],
+    )
+    include_dates: List[pdate] = Field(
+        default_factory=list,
+        description="Extra lesson dates outside the weekly pattern, within the template's date range.",
+        examples=[["2025-10-04"]],
+    )
+    exclude_dates: List[pdate] = Field(
+        default_factory=list,
+        description="Dates of the pattern skipped without a lesson.",
+        examples=[["2025-11-03"]],
+    )
     start_time: time = Field(
         description="Start time for each lesson occurrence (HH:MM:SS).",
         examples=["08:00:00"],
@@ -79,6 +104,23 @@ class RecurringLessonTemplateBase(BaseModel):
         examples=["2026-01-31"],
     )
 
+    is_virtual: bool = Field(
+        False,
+        description=(
+            "Store only the template and its exceptions instead of one lesson per occurrence; "
+            "occurrences are expanded when lessons are read. Cannot be changed after creation."
+        ),
+        examples=[False],
+    )
+
+    @field_validator("include_dates", "exclude_dates", mode="before")
+    @classmethod
+    def parse_date_list(cls, value):
+        """Read date lists stored as JSON arrays of ISO dates"""
+        if value is None or isinstance(value, str):
+            return sorted(parse_dates(value))
+        return value
+
 
 class RecurringLessonTemplateIn(RecurringLessonTemplateBase):
     """Input schema for creating a RecurringLessonTemplate."""
@@ -113,6 +155,24 @@ class RecurringLessonTemplateUpdate(BaseModel):
         None,
         description="List of weekday numbers.",
     )
+    week_interval: Optional[int] = Field(
+        None,
+        ge=1,
+        le=52,
+        description="Lessons every N-th week.",
+    )
+    week_parity: Optional[WeekParityEnum] = Field(
+        None,
+        description="Only odd or even academic weeks (null for every week).",
+    )
+    include_dates: Optional[List[pdate]] = Field(
+        None,
+        description="Extra lesson dates outside the weekly pattern.",
+    )
+    exclude_dates: Optional[List[pdate]] = Field(
+        None,
+        description="Dates of the pattern skipped without a lesson.",
+    )
     start_time: Optional[time] = Field(
         None,
         description="Start time for lessons.",
@@ -153,6 +213,68 @@ class RecurringLessonTemplateOut(RecurringLessonTemplateBase):
     )
 
 
+class RecurringLessonExceptionIn(BaseModel):
+    """
+    Deviation of one occurrence of a virtual template from its pattern.
+    Fields left null keep the template's values.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    is_cancelled: bool = Field(
+        False,
+        description="Whether the occurrence is cancelled.",
+        examples=[False],
+    )
+    date: Optional[pdate] = Field(
+        None,
+        description="Date the occurrence is moved to (YYYY-MM-DD).",
+        examples=["2025-09-04"],
+    )
+    start_time: Optional[time] = Field(
+        None,
+        description="Overridden start time (HH:MM:SS).",
+        examples=["10:00:00"],
+    )
+    end_time: Optional[time] = Field(
+        None,
+        description="Overridden end time (HH:MM:SS).",
+        examples=["11:30:00"],
+    )
+    room_id: Optional[int] = Field(
+        None,
+        description="Overridden room identifier.",
+        examples=[101],
+    )
+    is_online: Optional[bool] = Field(
+        None,
+        description="Overridden online flag.",
+        examples=[True],
+    )
+    lesson_type: Optional[LessonTypeEnum] = Field(
+        None,
+        description="Overridden lesson type.",
+        examples=["practice"],
+    )
+
+
+class RecurringLessonExceptionOut(RecurringLessonExceptionIn):
+    """Stored exception of a virtual template occurrence."""
+
+    id: int = Field(
+        description="Unique identifier of the exception.",
+        examples=[7],
+    )
+    template_id: int = Field(
+        description="Identifier of the virtual template.",
+        examples=[123],
+    )
+    occurrence_date: pdate = Field(
+        description="Date of the occurrence in the template's pattern (YYYY-MM-DD).",
+        examples=["2025-09-03"],
+    )
+
+
 class RecurringLessonTemplateFilterParams(BaseModel):
     """Advanced filtering parameters for recurring lesson templates."""
 
@@ -179,3 +301,286 @@ class RecurringLessonTemplateQueryParams(
     """Query parameters for filtering recurring lesson templates."""
 
     pass
+
+
+class RecurringLessonTemplateConflictParams(RecurringLessonTemplateBase):
+    """
+    Candidate template to check for conflicts before it is created or changed.
+    Mirrors RecurringLessonTemplateIn.
+    """
+
+    exclude_template_id: Optional[int] = Field(
+        None,
+        description="Existing template to ignore (with its lessons), e.g. the template being edited.",
+        examples=[123],
+    )
+
+
+class TemplateConflictOut(BaseModel):
+    """
+    Clash between the checked template and another recurring template, found from
+    both patterns without generating any lessons.
+    """
+
+    type: str = Field(
+        description='Conflict type. One of: "room", "professor", "group".',
+        examples=["room"],
+    )
+    message: str = Field(
+        description="Human-readable description of the conflict.",
+        examples=[
+            "Room 'B-201' is also booked by template 'Algebra - CS-101' on Mon, Wed at 10:00-11:30"
+        ],
+    )
+    severity: str = Field(
+        description='Severity level of the conflict. One of: "error", "warning".',
+        examples=["error"],
+    )
+    template_id: Optional[int] = Field(
+        None,
+        description="Identifier of the other template; null for a template of the same import batch.",
+        examples=[87],
+    )
+    batch_index: Optional[int] = Field(
+        None,
+        description="Position of the other template in the import batch, for clashes within a batch.",
+        examples=[None],
+    )
+    template_name: Optional[str] = Field(
+        None,
+        description="Name of the other template.",
+        examples=["Algebra - CS-101"],
+    )
+    days_of_week: List[int] = Field(
+        description="Weekdays (0=Monday) on which both templates occur.",
+        examples=[[0, 2]],
+    )
+    first_date: pdate = Field(
+        description="First date on which both templates occur (holidays skipped).",
+        examples=["2025-09-01"],
+    )
+    occurrences: int = Field(
+        description="Number of dates on which both templates occur.",
+        examples=[14],
+    )
+
+
+class RecurringLessonTemplateConflictCheckOut(BaseModel):
+    """
+    Result of a template-level conflict check.
+    Template conflicts come from the recurrence patterns; lesson conflicts list
+    standalone lessons (not generated from a template) that clash with an occurrence.
+    """
+
+    has_conflicts: bool = Field(
+        description="True if the template clashes with another template or lesson.",
+        examples=[True],
+    )
+    template_conflicts: List[TemplateConflictOut] = Field(
+        default_factory=list,
+        description="Clashes with other recurring templates.",
+    )
+    lesson_conflicts: List[ConflictOut] = Field(
+        default_factory=list,
+        description="Clashes with standalone lessons, one entry per occurrence date and conflict.",
+    )
+    count: int = Field(
+        0,
+        description="Total number of template and lesson conflicts.",
+        examples=[2],
+    )
+
+
+class RecurringLessonTemplatePreviewOut(BaseModel):
+    """
+    Dry run of lesson generation for a template being created or updated.
+    Nothing is written; hours and conflicts reflect the schedule as it would be
+    after the write.
+    """
+
+    dates: List[pdate] = Field(
+        default_factory=list,
+        description="Dates lessons would be generated on (holidays and professor unavailable days skipped).",
+        examples=[["2025-09-01", "2025-09-03"]],
+    )
+    lessons_count: int = Field(
+        0,
+        description="Number of lessons that would be generated.",
+        examples=[32],
+    )
+    lesson_hours: float = Field(
+        0,
+        description="Hours of the generated lessons.",
+        examples=[48.0],
+    )
+    scheduled_hours: float = Field(
+        0,
+        description="Hours of the subject assignment in this schedule after the write, generated lessons included.",
+        examples=[60.0],
+    )
+    allowed_hours: float = Field(
+        0,
+        description="Hours allocated to the subject assignment (hours_per_subject).",
+        examples=[54.0],
+    )
+    excess_hours: float = Field(
+        0,
+        description="Scheduled hours above the allocation; 0 if within it.",
+        examples=[6.0],
+    )
+    conflicts: List[ConflictOut] = Field(
+        default_factory=list,
+        description="Clashes of generated lessons with existing lessons, one entry per occurrence date and conflict.",
+    )
+    count: int = Field(
+        0,
+        description="Number of conflicts.",
+        examples=[1],
+    )
+
+
+class RecurringLessonTemplateImportIn(BaseModel):
+    """
+    Batch of templates imported together, e.g. a whole direction's semester timetable.
+    Either all templates (with their lessons) are written or none.
+    """
+
+    templates: List[RecurringLessonTemplateIn] = Field(
+        min_length=1,
+        description="Templates to create.",
+    )
+    allow_conflicts: bool = Field(
+        False,
+        description=(
+            "Write the batch even if its templates clash with each other, other templates or "
+            "standalone lessons. Otherwise a batch with conflicts is rejected."
+        ),
+        examples=[False],
+    )
+
+
+class TemplateImportErrorOut(BaseModel):
+    """Validation error of one template of an import batch."""
+
+    index: int = Field(
+        description="Position of the template in the batch.",
+        examples=[3],
+    )
+    detail: str = Field(
+        description="What is wrong with the template.",
+        examples=["Room with id 999 not found"],
+    )
+
+
+class TemplateImportConflictOut(RecurringLessonTemplateConflictCheckOut):
+    """Conflicts of one template of an import batch."""
+
+    index: int = Field(
+        description="Position of the template in the batch.",
+        examples=[3],
+    )
+
+
+class RecurringLessonTemplateImportResultOut(BaseModel):
+    """Outcome of a batch import."""
+
+    imported: bool = Field(
+        description="Whether the batch was written (false if it is invalid or has blocking conflicts).",
+        examples=[True],
+    )
+    errors: List[TemplateImportErrorOut] = Field(
+        default_factory=list,
+        description="Validation errors, one entry per invalid template.",
+    )
+    conflicts: List[TemplateImportConflictOut] = Field(
+        default_factory=list,
+        description="Templates with conflicts, within the batch or with existing templates and lessons.",
+    )
+    template_ids: List[int] = Field(
+        default_factory=list,
+        description="Identifiers of the created templates, in batch order.",
+        examples=[[124, 125]],
+    )
+    lessons_count: int = Field(
+        0,
+        description="Number of lessons generated for the created templates.",
+        examples=[512],
+    )
+
+
+class RecurringLessonTemplateImportJobOut(BaseModel):
+    """
+    Background job of a batch import, polled until it succeeds or fails.
+    Progress counts the templates through the current stage (status).
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str = Field(
+        description="Job identifier.",
+        examples=["3f2b9c0e8a7d4e61b5c2a9d0e4f7b312"],
+    )
+    status: JobStatusEnum = Field(
+        description="pending, validating, checking, writing, succeeded or failed.",
+        examples=["checking"],
+    )
+    total: int = Field(
+        description="Number of templates in the batch.",
+        examples=[240],
+    )
+    processed: int = Field(
+        description="Templates processed in the current stage.",
+        examples=[120],
+    )
+    created_at: datetime = Field(
+        description="When the job was queued.",
+    )
+    finished_at: Optional[datetime] = Field(
+        None,
+        description="When the job succeeded or failed.",
+    )
+    error: Optional[str] = Field(
+        None,
+        description="Why the job failed.",
+        examples=["2 templates have conflicts"],
+    )
+    result: Optional[RecurringLessonTemplateImportResultOut] = Field(
+        None,
+        description="Outcome of the import, once the job is finished.",
+    )
+
+
+class LessonPropagationOut(BaseModel):
+    """
+    Changes made to template lessons after a holiday or a professor's unavailable
+    days changed. Only future occurrences on the affected dates are touched.
+    """
+
+    template_ids: List[int] = Field(
+        default_factory=list,
+        description="Templates with occurrences on the affected dates (virtual ones included).",
+        examples=[[12, 15]],
+    )
+    dates: List[pdate] = Field(
+        default_factory=list,
+        description="Affected dates on which at least one template has an occurrence.",
+        examples=[["2025-11-04"]],
+    )
+    deleted: int = Field(
+        0,
+        description="Generated lessons deleted from dates their template no longer covers.",
+        examples=[6],
+    )
+    inserted: int = Field(
+        0,
+        description="Lessons generated on dates their template covers again.",
+        examples=[0],
+    )
+    flagged_lesson_ids: List[int] = Field(
+        default_factory=list,
+        description=(
+            "Lessons edited by hand that are left on dates their template no longer "
+            "covers; review them manually."
+        ),
+        examples=[[3051]],
+    )
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from pydantic.generics import GenericModel
 from typing import Generic, TypeVar, List, Optional, Literal
 
+from ..utils.enums import PaginationModeEnum
+
 
 class BasePaginationParams(BaseModel):
     """
@@ -26,6 +28,21 @@ class BasePaginationParams(BaseModel):
         description="If true, ignore pagination and return all matching items.",
         examples=[False],
     )
+    pagination: PaginationModeEnum = Field(
+        default=PaginationModeEnum.offset,
+        description='"offset" returns the given page; "cursor" returns the items after `cursor` in (sort column, id) order, which stays fast on deep pages of large tables.',
+        examples=["cursor"],
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from the previous page's next_cursor (cursor pagination only); omit for the first page.",
+        examples=["WyJuYW1lIixmYWxzZSwiQS0xMDEiLDQyXQ"],
+    )
+    withTotal: bool | None = Field(
+        default=None,
+        description="Include the total number of matching items. Defaults to true for offset and false for cursor pagination; counts are cached until a listed table changes.",
+        examples=[False],
+    )
 
 
 class BaseSortParams(BaseModel):
@@ -87,12 +104,17 @@ class PaginatedResponse(GenericModel, Generic[T]):
         description="Configured number of items per page.",
         examples=[10],
     )
-    total: int = Field(
-        ...,
-        description="Total number of items matching the query (across all pages).",
+    total: Optional[int] = Field(
+        default=None,
+        description="Total number of items matching the query (across all pages); null unless requested (see withTotal).",
         examples=[123],
     )
     items: List[T] = Field(
         ...,
         description="List of items on the current page.",
     )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page with cursor pagination; null when this is the last page.",
+        examples=["WyJuYW1lIixmYWxzZSwiQi0yMDQiLDU3XQ"],
+    )
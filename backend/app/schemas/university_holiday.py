@@ -2,6 +2,7 @@ from pydantic import BaseModel, ConfigDict, Field, computed_field
 from datetime import date as Date
 from typing import Optional
 from .shared import BaseQueryParams
+from .recurring_template import LessonPropagationOut
 
 
 class UniversityHolidayBase(BaseModel):
@@ -51,6 +52,10 @@ class UniversityHolidayOut(UniversityHolidayBase):
         description="Unique identifier of the holiday",
         examples=[1, 42],
     )
+    propagation: Optional[LessonPropagationOut] = Field(
+        None,
+        description="Changes made to template lessons by the write (create, replace and patch responses).",
+    )
 
     # @computed_field
     # @property
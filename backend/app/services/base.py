@@ -1,12 +1,26 @@
-from typing import Generic, TypeVar, Type, Any
+import base64
+import enum
+import json
+from datetime import date, time
+from typing import Generic, Optional, TypeVar, Type, Any
+from sqlalchemy import and_, literal, or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from pydantic import BaseModel
+from ..config import setting
 from ..schemas.shared import BaseQueryParams, PaginatedResponse
+from ..utils.cache import LRUCache
+from ..utils.conditional import ConditionalRequest
+from ..utils.enums import PaginationModeEnum
+from ..utils.resource_versions import ALL_ROWS, related_tables, resource_etag
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
 
+# Process-wide: list totals per (model, filters), stored for the resource versions of
+# the tables the list reads, so any committed write to them invalidates the count.
+count_cache = LRUCache(max_bytes=setting.LIST_COUNT_CACHE_MAX_BYTES)
+
 
 class BaseService(Generic[ModelType, CreateSchemaType]):
     """
@@ -50,37 +64,58 @@ class BaseService(Generic[ModelType, CreateSchemaType]):
     def get_paginated(
         self,
         params: BaseQueryParams,
+        conditional: Optional[ConditionalRequest] = None,
     ) -> PaginatedResponse[ModelType]:
         """
         Retrieve a paginated list of records with optional filtering and sorting.
 
         The method:
+        - answers 304 Not Modified before any query if the client's copy is current
         - builds a base query via repo.query()
         - applies service-level filters and sorting hooks
-        - counts total items
-        - applies pagination unless loadAll is true (then returns all)
+        - counts total items if requested (see count_filtered)
+        - returns all items (loadAll), one page by offset, or the page after a cursor
+
+        Cursor pagination seeks on (sort column, id) instead of skipping rows with
+        OFFSET, so every page costs the same however deep it is.
 
         Args:
             params (BaseQueryParams): Pagination/sorting params (and extended filters in subclasses).
+            conditional (Optional[ConditionalRequest]): Conditional GET of the request, if any.
 
         Returns:
-            PaginatedResponse[ModelType]: Envelope with page, page_size, total, and items.
+            PaginatedResponse[ModelType]: Envelope with page, page_size, total (if requested),
+                items and, for cursor pagination, the cursor of the next page.
+
+        Raises:
+            HTTPException: 304 if If-None-Match matches the list's ETag.
+            HTTPException: 400 if the cursor is invalid or was issued for another sort order.
         """
+        if conditional is not None:
+            conditional.check(self.get_paginated_etag(params))
+
         query = self.repo.query()
 
         query = self.apply_filters(query, params)
-        query = self.apply_sorting(query, params)
 
-        total = query.count()
+        cursor_mode = params.pagination == PaginationModeEnum.cursor
+        with_total = (
+            params.withTotal if params.withTotal is not None else not cursor_mode
+        )
+        total = self.count_filtered(query, params) if with_total else None
+        next_cursor = None
 
         # loadAll overrides pagination and returns the full result set
         if params.loadAll:
-            params.pageSize = total if total > 0 else 1
+            items = self.apply_sorting(query, params).all()
+            params.pageSize = len(items) or 1
             params.page = 1
-            items = query.all()
+        elif cursor_mode:
+            items, next_cursor = self._get_cursor_page(query, params)
         else:
             items = (
-                query.offset((params.page - 1) * params.pageSize)
+                self.apply_sorting(query, params)
+                .offset((params.page - 1) * params.pageSize)
                 .limit(params.pageSize)
                 .all()
             )
@@ -90,6 +125,51 @@ class BaseService(Generic[ModelType, CreateSchemaType]):
             page_size=params.pageSize,
             total=total,
             items=items,
+            next_cursor=next_cursor,
+        )
+
+    def count_filtered(self, query, params: BaseQueryParams) -> int:
+        """
+        Count the items of a filtered list, cached until a table the list reads changes.
+
+        The cache is keyed by the model and the filter values (pagination and sorting
+        excluded) and versioned by the same resource versions as the list's ETag, so
+        joined filters are counted once per change instead of on every page.
+
+        Args:
+            query: Filtered, unsorted SQLAlchemy query.
+            params (BaseQueryParams): Params of the list.
+
+        Returns:
+            int: Number of matching items.
+        """
+        filters = params.model_dump_json(exclude=set(BaseQueryParams.model_fields))
+        key = (self.repo.model.__name__, filters)
+        version = resource_etag(
+            self.db,
+            [(table, ALL_ROWS) for table in related_tables(self.repo.model)],
+        )
+        total = count_cache.get(key, version)
+        if total is None:
+            total = query.count()
+            count_cache.put(key, version, total, len(filters) + 64)
+        return total
+
+    def get_paginated_etag(self, params: BaseQueryParams) -> str:
+        """
+        ETag of a paginated list, from the versions of the model's table and of every
+        table its relationships reach (filters and nested output may read them).
+
+        Args:
+            params (BaseQueryParams): Pagination/sorting/filter params of the list.
+
+        Returns:
+            str: Quoted ETag value.
+        """
+        return resource_etag(
+            self.db,
+            [(table, ALL_ROWS) for table in related_tables(self.repo.model)],
+            params.model_dump_json(),
         )
 
     def apply_filters(self, query, params):
@@ -119,14 +199,132 @@ class BaseService(Generic[ModelType, CreateSchemaType]):
         Returns:
             Any: The query with ordering applied if possible.
         """
-        if params.sort_by:
-            column = getattr(self.repo.model, params.sort_by, None)
-            if column is not None:
-                if params.desc:
-                    column = column.desc()
-                query = query.order_by(column)
+        query, column = self.sort_key(query, params)
+        if column is not None:
+            if params.desc:
+                column = column.desc()
+            query = query.order_by(column)
         return query
 
+    def sort_key(self, query, params):
+        """
+        Hook resolving the column to sort by for params.sort_by.
+
+        Override this in subclasses to sort by expressions that are not columns of
+        the model (joining what they need); both offset and cursor pagination use it.
+
+        Args:
+            query: SQLAlchemy query to be sorted.
+            params (BaseQueryParams): Parameters providing sort_by.
+
+        Returns:
+            tuple: The (possibly joined) query and the sort column, or None if
+                sort_by is empty or unknown.
+        """
+        if params.sort_by:
+            return query, getattr(self.repo.model, params.sort_by, None)
+        return query, None
+
+    def _get_cursor_page(self, query, params: BaseQueryParams):
+        """
+        Fetch the page after params.cursor in (sort column, id) order.
+
+        NULL sort values come first in ascending order (last in descending order) on
+        every database, so the seek condition matches the ordering.
+
+        Args:
+            query: Filtered SQLAlchemy query.
+            params (BaseQueryParams): Params with sort_by, desc, cursor and pageSize.
+
+        Returns:
+            tuple: Items of the page and the cursor of the next page (None on the last page).
+
+        Raises:
+            HTTPException: 400 if the cursor is invalid or was issued for another sort order.
+        """
+        query, column = self.sort_key(query, params)
+        id_column = self.repo.model.id
+
+        if params.cursor:
+            value, last_id = self._decode_cursor(params.cursor, params, column)
+            after_id = id_column < last_id if params.desc else id_column > last_id
+            if column is None:
+                query = query.filter(after_id)
+            elif value is None:
+                query = query.filter(
+                    and_(column.is_(None), after_id)
+                    if params.desc
+                    else or_(column.is_not(None), and_(column.is_(None), after_id))
+                )
+            else:
+                # Bound with the column's type (plain booleans cannot be compared)
+                value = literal(value, column.type)
+                query = query.filter(
+                    or_(
+                        column < value,
+                        and_(column == value, after_id),
+                        column.is_(None),
+                    )
+                    if params.desc
+                    else or_(column > value, and_(column == value, after_id))
+                )
+
+        if column is None:
+            query = query.order_by(id_column.desc() if params.desc else id_column)
+            items = query.limit(params.pageSize + 1).all()
+            values = [None] * len(items)
+        else:
+            query = query.add_columns(column).order_by(
+                column.desc().nulls_last() if params.desc else column.nulls_first(),
+                id_column.desc() if params.desc else id_column,
+            )
+            rows = query.limit(params.pageSize + 1).all()
+            items = [row[0] for row in rows]
+            values = [row[1] for row in rows]
+
+        if len(items) <= params.pageSize:
+            return items, None
+        last = params.pageSize - 1
+        return items[: params.pageSize], self._encode_cursor(
+            params, values[last], items[last].id
+        )
+
+    @staticmethod
+    def _encode_cursor(params: BaseQueryParams, value: Any, last_id: int) -> str:
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, (date, time)):
+            value = value.isoformat()
+        raw = json.dumps([params.sort_by, params.desc, value, last_id])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, params: BaseQueryParams, column) -> tuple:
+        try:
+            python_type = column.type.python_type if column is not None else None
+        except NotImplementedError:
+            python_type = None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_by, desc, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            # Restore values that JSON carries as strings
+            if value is not None and python_type is not None:
+                if issubclass(python_type, (date, time)):
+                    value = python_type.fromisoformat(value)
+                elif issubclass(python_type, enum.Enum):
+                    value = python_type(value)
+            last_id = int(last_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        if sort_by != params.sort_by or desc != params.desc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor was issued for another sort order",
+            )
+        return value, last_id
+
     def get_by_id(self, obj_id: int) -> ModelType:
         """
         Retrieve a single record by its identifier.
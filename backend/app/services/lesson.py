@@ -1,29 +1,106 @@
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session, selectinload
-from datetime import date
-
-from app.repositories.lesson import LessonRepository
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Dict, Set
+from types import SimpleNamespace
+from functools import partial
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+
+from app.repositories.lesson import LessonRepository, LessonRow
+from app.repositories.lesson_change import LessonChangeRepository
+from app.repositories.subject_assignment import SubjectAssignmentRepository
+from app.repositories.recurring_template import RecurringLessonTemplateRepository
 from app.models import (
     Lesson,
     Group,
-    SubjectAssignment,
-    ProfessorWorkload,
-    ProfessorContract,
-    ProfessorProfile,
+    Room,
+    User,
+    RecurringLessonTemplate,
+    UniversityHoliday,
 )
 from ..schemas.lesson import (
     LessonIn,
     LessonOut,
-    LessonQueryParams,
+    CalendarCacheStatsOut,
+    CalendarEntitiesOut,
+    CalendarLessonColumnsOut,
     CalendarLessonsResponse,
+    CalendarQueryParams,
+    CompactCalendarLessonsResponse,
+    LessonChangesOut,
+    LessonChangesParams,
+)
+from ..schemas.minis import (
+    GroupMiniOut,
+    ProfessorMiniOut,
+    ProfessorWorkloadMiniOut,
+    RoomMiniOut,
+    ScheduleMiniOut,
+    SubjectMiniOut,
 )
 from ..schemas.lesson_conflict import (
     ConflictOut,
     ConflictQueryParams,
     ConflictsSummaryOut,
     ConflictGroupOut,
+    ConflictCheckParams,
+    ConflictCheckOut,
+    ConflictCacheStatsOut,
+    ConflictCountsOut,
+    ConflictPageOut,
+    ConflictPageParams,
+)
+from ..utils.intervals import sweep_overlap_clusters
+from ..utils import conflict_kernel
+from ..utils.conflict_detection import (
+    detect_day_conflicts,
+    get_executor,
+    is_professor_conflict,
+    is_room_conflict,
+    resolve_workers,
+    to_lesson_tuple,
+)
+from ..config import setting
+from ..database import SessionLocal
+from ..utils.cache import NullCache, RowKey, RowVersionClock, create_cache
+from ..utils.enums import CalendarFormatEnum, ConflictStrategyEnum
+from ..utils.conditional import ConditionalRequest
+from ..utils.resource_versions import (
+    ALL_ROWS,
+    UNKNOWN_SCOPE,
+    loaded_rows,
+    related_tables,
+    resource_etag,
+    track_row_versions,
 )
 from .base import BaseService
+from .lesson_conflict import LessonConflictService, lesson_versions, summary_cache
+from .virtual_lesson import VirtualLesson, VirtualLessonService, sort_lessons
+
+# Process-wide: calendars are cached per (schedule, ISO week). An entry is stored for
+# the lesson_versions of its week (bumped by every lesson write on those dates) and
+# is stale once a row it shows (room, subject, professor, ...) changes in row_versions.
+row_versions = RowVersionClock()
+track_row_versions(SessionLocal, row_versions)
+calendar_cache = create_cache(
+    setting.CALENDAR_CACHE_BACKEND, setting.CALENDAR_CACHE_MAX_BYTES
+)
+
+
+class CalendarWeek(NamedTuple):
+    """Cached lessons of one schedule week."""
+
+    items: List[LessonOut]  # Sorted, all professors
+    rows: Set[RowKey]  # Rows shown by the items
+    stamp: int  # row_versions.current when loading started
+
+
+class CachedConflictsSummary(NamedTuple):
+    """Cached conflicts summary of one query."""
+
+    summary: ConflictsSummaryOut
+    rows: Set[RowKey]  # Rows shown by the conflicting lessons
+    stamp: int  # row_versions.current when building started
 
 
 class LessonService(BaseService[Lesson, LessonIn]):
@@ -33,7 +110,10 @@ class LessonService(BaseService[Lesson, LessonIn]):
     Responsibilities:
     - List/filter lessons (by schedule and date range).
     - Provide calendar-oriented listing without pagination with eager loading.
+    - Merge occurrences of virtual recurring templates into calendar and conflict reads.
+    - Serve the lesson change feed for delta-syncing clients.
     - Detect and summarize scheduling conflicts (room, professor, group).
+    - Keep the persisted conflict index in sync with lesson writes.
     - Offer utility helpers for conflict analysis and transformations.
     """
 
@@ -45,6 +125,124 @@ class LessonService(BaseService[Lesson, LessonIn]):
             db (Session): Active SQLAlchemy session.
         """
         super().__init__(db, Lesson, LessonRepository(db))
+        self.virtual = VirtualLessonService(db)
+        self.conflict_index = LessonConflictService(db, self)
+
+    def create(self, obj_in: Any) -> Lesson:
+        """
+        Create a lesson and recheck conflicts of its room, professor and group on that date.
+
+        The lesson and the refreshed conflicts are committed together.
+
+        Args:
+            obj_in (Any): LessonIn payload or plain dict.
+
+        Returns:
+            Lesson: The newly created lesson.
+        """
+        obj_data = obj_in.model_dump() if isinstance(obj_in, BaseModel) else obj_in
+
+        lesson = self.repo.add(obj_data)
+        self.conflict_index.refresh(self.conflict_index.conflict_keys([lesson]))
+        self.db.commit()
+        self.db.refresh(lesson)
+        return lesson
+
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Create many lessons in one transaction and recheck their conflicts.
+
+        The rows are inserted with one executemany statement; the conflict index is
+        refreshed for all of their (date, resource) keys before the single commit.
+
+        Args:
+            rows (List[Dict[str, Any]]): Column values per lesson (LessonIn fields).
+
+        Returns:
+            List[int]: IDs of the created lessons.
+        """
+        lesson_ids = self.repo.bulk_create(rows)
+        if lesson_ids:
+            self.conflict_index.refresh(
+                self.conflict_index.conflict_keys(
+                    self.repo.get_rows(Lesson.id.in_(lesson_ids))
+                )
+            )
+        self.db.commit()
+        return lesson_ids
+
+    def update(self, obj_id: int, obj_in: Any) -> Lesson:
+        """
+        Update a lesson and recheck conflicts for both its previous and new placement.
+
+        The lesson and the refreshed conflicts are committed together.
+
+        Args:
+            obj_id (int): Identifier of the lesson to update.
+            obj_in (Any): LessonIn/LessonUpdate payload or plain dict.
+
+        Returns:
+            Lesson: The updated lesson.
+
+        Raises:
+            HTTPException: 404 if the lesson does not exist.
+        """
+        obj_data = obj_in.model_dump() if isinstance(obj_in, BaseModel) else obj_in
+
+        lesson = self.get_by_id(obj_id)
+        keys = self.conflict_index.conflict_keys([lesson])
+        self.repo.assign(lesson, obj_data)
+        keys |= self.conflict_index.conflict_keys([lesson])
+        self.conflict_index.refresh(keys)
+        self.db.commit()
+        self.db.refresh(lesson)
+        return lesson
+
+    def delete(self, obj_id: int):
+        """
+        Delete a lesson and recheck conflicts it was part of.
+
+        The deletion and the refreshed conflicts are committed together.
+
+        Args:
+            obj_id (int): Identifier of the lesson to delete.
+
+        Raises:
+            HTTPException: 404 if the lesson does not exist.
+        """
+        lesson = self.get_by_id(obj_id)
+        keys = self.conflict_index.conflict_keys([lesson])
+        self.db.delete(lesson)
+        self.db.flush()
+        self.conflict_index.refresh(keys)
+        self.db.commit()
+
+    def sync_professor_assignments(self, subject_assignment_ids) -> None:
+        """
+        Propagate a professor change of subject assignments to lessons and templates.
+
+        Called after an assignment, workload or contract is moved to another professor:
+        re-resolves the denormalized professor_user_id and rechecks conflicts of the
+        affected lessons for both the previous and the new professor, in one transaction.
+
+        Args:
+            subject_assignment_ids (Iterable[int]): Assignments whose professor may have changed.
+        """
+        subject_assignment_ids = list(subject_assignment_ids)
+        if not subject_assignment_ids:
+            return
+
+        affected = Lesson.subject_assignment_id.in_(subject_assignment_ids)
+        keys = self.conflict_index.conflict_keys(self.repo.get_rows(affected))
+
+        self.repo.sync_professor_user_ids(subject_assignment_ids)
+        RecurringLessonTemplateRepository(self.db).sync_professor_user_ids(
+            subject_assignment_ids
+        )
+
+        keys |= self.conflict_index.conflict_keys(self.repo.get_rows(affected))
+        self.conflict_index.refresh(keys)
+        self.db.commit()
 
     def apply_filters(self, query, params):
         """
@@ -52,6 +250,7 @@ class LessonService(BaseService[Lesson, LessonIn]):
 
         Supported:
         - schedule_id: filter by owning schedule.
+        - professor_id: filter by the denormalized professor (user) ID.
         - date_from/date_to: inclusive date window.
 
         Args:
@@ -63,6 +262,8 @@ class LessonService(BaseService[Lesson, LessonIn]):
         """
         if params.schedule_id:
             query = query.filter(Lesson.schedule_id == params.schedule_id)
+        if getattr(params, "professor_id", None):
+            query = query.filter(Lesson.professor_user_id == params.professor_id)
 
         # Apply inclusive date range filters when provided
         if hasattr(params, "date_from") and params.date_from:
@@ -73,47 +274,332 @@ class LessonService(BaseService[Lesson, LessonIn]):
         return super().apply_filters(query, params)
 
     def get_calendar_lessons(
-        self, params: LessonQueryParams
-    ) -> CalendarLessonsResponse:
+        self,
+        params: CalendarQueryParams,
+        conditional: Optional[ConditionalRequest] = None,
+    ) -> CalendarLessonsResponse | CompactCalendarLessonsResponse:
         """
         Get lessons for the calendar view without pagination, filtered by dates.
 
         Eager-loads related entities for efficient serialization in the calendar UI.
+        Occurrences of virtual recurring templates are expanded for the window and
+        merged in (with negative synthetic IDs). Unchanged calendars are answered with
+        304 Not Modified before anything is loaded. Bounded windows are assembled from
+        the calendar week cache (see _cached_calendar_items).
 
         Args:
-            params (LessonQueryParams): Filtering parameters including schedule_id and optional date range.
+            params (CalendarQueryParams): Filtering parameters including schedule_id, optional
+                professor_id, date range and payload format.
+            conditional (Optional[ConditionalRequest]): Conditional GET of the request, if any.
 
         Returns:
-            CalendarLessonsResponse: Items, count, and the requested date bounds.
+            CalendarLessonsResponse | CompactCalendarLessonsResponse: Lessons (nested, or as
+                columns with deduplicated entities for format=compact), count, and the
+                requested date bounds.
+
+        Raises:
+            HTTPException: 304 if If-None-Match matches the calendar's ETag.
         """
-        query = (
-            self.db.query(Lesson)
-            .options(
-                selectinload(Lesson.group).selectinload(Group.semester),
-                selectinload(Lesson.room),
-                selectinload(Lesson.schedule),
-                selectinload(Lesson.subject_assignment).selectinload(
-                    SubjectAssignment.subject
-                ),
-                selectinload(Lesson.subject_assignment)
-                .selectinload(SubjectAssignment.workload)
-                .selectinload(ProfessorWorkload.contract)
-                .selectinload(ProfessorContract.professor_profile)
-                .selectinload(ProfessorProfile.user),
+        if conditional is not None:
+            conditional.check(self.get_calendar_etag(params))
+
+        if (
+            params.date_from
+            and params.date_to
+            and not isinstance(calendar_cache, NullCache)
+        ):
+            lessons = self._cached_calendar_items(params)
+        else:
+            lessons = self._load_calendar(
+                params.schedule_id,
+                params.date_from,
+                params.date_to,
+                params.professor_id,
             )
-            .filter(Lesson.schedule_id == params.schedule_id)
+
+        if params.format == CalendarFormatEnum.compact:
+            return self._compact_calendar(lessons, params)
+
+        return CalendarLessonsResponse(
+            items=[LessonOut.model_validate(lesson) for lesson in lessons],
+            count=len(lessons),
+            date_from=params.date_from,
+            date_to=params.date_to,
         )
 
+    def get_calendar_cache_stats(self) -> CalendarCacheStatsOut:
+        """
+        Report hit/miss counters and memory use of the calendar week cache.
+
+        Returns:
+            CalendarCacheStatsOut: Cache counters and the configured backend.
+        """
+        return CalendarCacheStatsOut(
+            **calendar_cache.stats(), backend=setting.CALENDAR_CACHE_BACKEND
+        )
+
+    def get_changes(self, params: LessonChangesParams) -> LessonChangesOut:
+        """
+        Get the lessons changed since a cursor of the lesson change log.
+
+        Entries are read oldest first; a lesson with several entries in the batch
+        (e.g. moved between schedules) is reported by its latest one. Updated lessons
+        are returned in full, deleted ones as tombstone IDs. Occurrences of virtual
+        recurring templates are not stored lessons and are not part of the feed.
+
+        Args:
+            params (LessonChangesParams): Cursor, optional schedule and batch size.
+
+        Returns:
+            LessonChangesOut: Changed lessons, deleted IDs, the next cursor and whether
+                more changes are pending.
+        """
+        changes = LessonChangeRepository(self.db).get_since(
+            params.since, params.schedule_id, params.limit + 1
+        )
+        has_more = len(changes) > params.limit
+        changes = changes[: params.limit]
+
+        # Latest entry per lesson: is it a tombstone?
+        latest: Dict[int, bool] = {}
+        for change in changes:
+            latest[change.lesson_id] = change.is_deleted
+
+        updated_ids = [lesson_id for lesson_id, gone in latest.items() if not gone]
+        items = []
+        if updated_ids:
+            query = self.repo.query_with_relations().filter(Lesson.id.in_(updated_ids))
+            if params.schedule_id is not None:
+                # Lessons moved away since the entry was read get a tombstone later
+                query = query.filter(Lesson.schedule_id == params.schedule_id)
+            items = query.order_by(Lesson.id).all()
+
+        return LessonChangesOut(
+            items=[LessonOut.model_validate(lesson) for lesson in items],
+            deleted_ids=sorted(lesson_id for lesson_id, gone in latest.items() if gone),
+            cursor=changes[-1].seq if changes else params.since,
+            has_more=has_more,
+        )
+
+    def _shown_rows(self, lessons: Iterable) -> Set[RowKey]:
+        """
+        Rows a response serialized from lessons can show, for row-version checks.
+
+        Args:
+            lessons (Iterable[Lesson | VirtualLesson]): Lessons loaded with their relations.
+
+        Returns:
+            Set[RowKey]: Keys of the lessons (templates for virtual occurrences) and of
+                the rows reachable from them.
+        """
+        roots = []
+        for lesson in lessons:
+            if isinstance(lesson, VirtualLesson):
+                roots += [lesson.template, lesson.room]
+            else:
+                roots.append(lesson)
+        return loaded_rows(root for root in roots if root)
+
+    def _load_calendar(
+        self,
+        schedule_id: int,
+        date_from: Optional[date],
+        date_to: Optional[date],
+        professor_id: Optional[int] = None,
+    ) -> list:
+        """
+        Load the lessons and virtual occurrences of a schedule in a date window.
+
+        Args:
+            schedule_id (int): Schedule to load.
+            date_from (Optional[date]): First date (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date (inclusive); None for unbounded.
+            professor_id (Optional[int]): Professor (user) to restrict to, if any.
+
+        Returns:
+            list: Lessons and occurrences with relations loaded, sorted by date and time.
+        """
+        query = self.repo.query_with_relations().filter(
+            Lesson.schedule_id == schedule_id
+        )
+        template_criteria = [RecurringLessonTemplate.schedule_id == schedule_id]
+        if professor_id:
+            query = query.filter(Lesson.professor_user_id == professor_id)
+            template_criteria.append(
+                RecurringLessonTemplate.professor_user_id == professor_id
+            )
+
         # Apply date filters if provided
-        if params.date_from:
-            query = query.filter(Lesson.date >= params.date_from)
-        if params.date_to:
-            query = query.filter(Lesson.date <= params.date_to)
+        if date_from:
+            query = query.filter(Lesson.date >= date_from)
+        if date_to:
+            query = query.filter(Lesson.date <= date_to)
+
+        return sort_lessons(
+            query.order_by(Lesson.date, Lesson.start_time).all()
+            + self.virtual.expand(date_from, date_to, *template_criteria)
+        )
 
-        lessons = query.order_by(Lesson.date, Lesson.start_time).all()
+    def _cached_calendar_items(self, params: CalendarQueryParams) -> List[LessonOut]:
+        """
+        Serialized lessons of a bounded calendar window, served per schedule week.
 
-        return CalendarLessonsResponse(
-            items=[LessonOut.model_validate(lesson) for lesson in lessons],
+        The window is split into ISO weeks; each (schedule, week) is looked up in the
+        calendar cache, and consecutive missing weeks are loaded with one query and
+        cached whole (all professors). Lesson writes invalidate the weeks of the dates
+        they touch (lesson_versions); edits of a row shown by a week, such as a room
+        number or a subject color, invalidate only the weeks showing it (row_versions).
+        The professor filter and the exact date bounds are applied to the cached weeks.
+
+        Args:
+            params (CalendarQueryParams): Calendar request parameters with both date bounds.
+
+        Returns:
+            List[LessonOut]: Lessons of the window sorted by date and time.
+        """
+        mondays = []
+        monday = params.date_from - timedelta(days=params.date_from.weekday())
+        while monday <= params.date_to:
+            mondays.append(monday)
+            monday += timedelta(weeks=1)
+
+        weeks: Dict[date, List[LessonOut]] = {}
+        missing = []
+        for monday in mondays:
+            version = lesson_versions.version(monday, monday + timedelta(days=6))
+            cached = calendar_cache.get(
+                (params.schedule_id, monday),
+                version,
+                valid=lambda week: row_versions.version(week.rows) <= week.stamp,
+            )
+            if cached is not None:
+                weeks[monday] = cached.items
+            else:
+                missing.append((monday, version))
+
+        # Load runs of consecutive missing weeks with one query each
+        runs = []
+        for monday, version in missing:
+            if runs and runs[-1][-1][0] + timedelta(weeks=1) == monday:
+                runs[-1].append((monday, version))
+            else:
+                runs.append([(monday, version)])
+
+        for run in runs:
+            stamp = row_versions.current
+            loaded: Dict[date, list] = {monday: [] for monday, _ in run}
+            for lesson in self._load_calendar(
+                params.schedule_id, run[0][0], run[-1][0] + timedelta(days=6)
+            ):
+                loaded[lesson.date - timedelta(days=lesson.date.weekday())].append(
+                    lesson
+                )
+
+            for monday, version in run:
+                lessons = loaded[monday]
+                items = [LessonOut.model_validate(lesson) for lesson in lessons]
+                calendar_cache.put(
+                    (params.schedule_id, monday),
+                    version,
+                    CalendarWeek(items, self._shown_rows(lessons), stamp),
+                    sum(len(item.model_dump_json()) for item in items),
+                )
+                weeks[monday] = items
+
+        return [
+            item
+            for monday in mondays
+            for item in weeks[monday]
+            if params.date_from <= item.date <= params.date_to
+            and (
+                not params.professor_id
+                or (item.professor and item.professor.id == params.professor_id)
+            )
+        ]
+
+    def get_calendar_etag(self, params: CalendarQueryParams) -> str:
+        """
+        ETag of a calendar, from the lesson version of its schedule and the versions of
+        the tables its lessons and virtual occurrences are built from.
+
+        Lesson writes elsewhere leave it unchanged, except set-based writes whose
+        schedules are unknown (see resource_versions.UNKNOWN_SCOPE).
+
+        Args:
+            params (CalendarQueryParams): Calendar request parameters.
+
+        Returns:
+            str: Quoted ETag value.
+        """
+        tables = (
+            related_tables(Lesson)
+            | related_tables(RecurringLessonTemplate)
+            | {UniversityHoliday.__tablename__}
+        ) - {Lesson.__tablename__}
+        resources = [(table, ALL_ROWS) for table in tables]
+        resources += [
+            (Lesson.__tablename__, params.schedule_id),
+            (Lesson.__tablename__, UNKNOWN_SCOPE),
+        ]
+        return resource_etag(self.db, resources, params.model_dump_json())
+
+    def _compact_calendar(
+        self, lessons: List[Lesson], params: CalendarQueryParams
+    ) -> CompactCalendarLessonsResponse:
+        """
+        Build the compact calendar payload: lesson columns plus deduplicated entities.
+
+        Every related entity is converted to its mini schema once, however many
+        lessons reference it; lessons only carry its ID.
+
+        Args:
+            lessons (List[Lesson]): Sorted lessons and virtual occurrences with relations
+                loaded, or their LessonOut from the calendar week cache.
+            params (CalendarQueryParams): Request parameters (date bounds are echoed).
+
+        Returns:
+            CompactCalendarLessonsResponse: Columns, entities, count and date bounds.
+        """
+        entities = CalendarEntitiesOut()
+
+        def reference(entity, registry: Dict[int, Any], schema) -> Optional[int]:
+            if entity is None:
+                return None
+            if entity.id not in registry:
+                registry[entity.id] = schema.model_validate(entity)
+            return entity.id
+
+        columns = {field: [] for field in CalendarLessonColumnsOut.model_fields}
+        for lesson in lessons:
+            columns["id"].append(lesson.id)
+            columns["date"].append(lesson.date)
+            columns["start_time"].append(lesson.start_time)
+            columns["end_time"].append(lesson.end_time)
+            columns["lesson_type"].append(lesson.lesson_type)
+            columns["is_online"].append(lesson.is_online)
+            columns["subject_assignment_id"].append(lesson.subject_assignment_id)
+            columns["subject_id"].append(
+                reference(lesson.subject, entities.subjects, SubjectMiniOut)
+            )
+            columns["group_id"].append(
+                reference(lesson.group, entities.groups, GroupMiniOut)
+            )
+            columns["room_id"].append(
+                reference(lesson.room, entities.rooms, RoomMiniOut)
+            )
+            columns["professor_id"].append(
+                reference(lesson.professor, entities.professors, ProfessorMiniOut)
+            )
+            columns["workload_id"].append(
+                reference(lesson.workload, entities.workloads, ProfessorWorkloadMiniOut)
+            )
+            columns["schedule_id"].append(
+                reference(lesson.schedule, entities.schedules, ScheduleMiniOut)
+            )
+
+        return CompactCalendarLessonsResponse(
+            lessons=CalendarLessonColumnsOut(**columns),
+            entities=entities,
             count=len(lessons),
             date_from=params.date_from,
             date_to=params.date_to,
@@ -123,51 +609,377 @@ class LessonService(BaseService[Lesson, LessonIn]):
         """
         Compute a summary of all detected conflicts.
 
+        By default the summary is read from the persisted conflict index, which lesson
+        writes keep up to date. strategy="scan" recomputes everything from the lesson table;
+        strategy="sql" recomputes it too, but lets the database find overlapping lessons first.
+
+        Results are cached per (date window, conflict types, schedule, strategy) and the
+        lesson version of the window, so repeated loads without edits in between are
+        served from memory; any lesson write on a date inside the window invalidates them,
+        and so does an edit of a row shown by the conflicting lessons, such as a room
+        number or a professor name (row_versions).
+
+        Args:
+            params (ConflictQueryParams): Filtering parameters (date range, optional conflict types, optional schedule filter for grouping, strategy).
+
+        Returns:
+            ConflictsSummaryOut: Groups of conflicts by scope (single/shared) and type with totals.
+        """
+        key = (
+            params.date_from,
+            params.date_to,
+            tuple(sorted(params.conflict_types)) if params.conflict_types else None,
+            params.schedule_id,
+            params.strategy,
+        )
+        version = lesson_versions.version(params.date_from, params.date_to)
+
+        cached = summary_cache.get(
+            key,
+            version,
+            valid=lambda entry: row_versions.version(entry.rows) <= entry.stamp,
+        )
+        if cached is not None:
+            return cached.summary
+
+        stamp = row_versions.current
+        shown_rows: Set[RowKey] = set()
+        if params.strategy == ConflictStrategyEnum.scan:
+            summary = self._scan_conflicts_summary(params, shown_rows)
+        elif params.strategy == ConflictStrategyEnum.sql:
+            summary = self._sql_conflicts_summary(params, shown_rows)
+        else:
+            summary = self.conflict_index.get_summary(params, shown_rows)
+
+        summary_cache.put(
+            key,
+            version,
+            CachedConflictsSummary(summary, shown_rows, stamp),
+            len(summary.model_dump_json()),
+        )
+        return summary
+
+    def get_conflicts_counts(self, params: ConflictQueryParams) -> ConflictCountsOut:
+        """
+        Count conflicts by scope and type from the persisted conflict index.
+
+        No lessons are loaded or serialized, so this is cheap enough for UI badges.
+
+        Args:
+            params (ConflictQueryParams): Date range, optional conflict types and schedule filter (strategy is ignored).
+
+        Returns:
+            ConflictCountsOut: Per-type counters of both scopes and totals.
+        """
+        return self.conflict_index.get_counts(params)
+
+    def get_conflicts_page(self, params: ConflictPageParams) -> ConflictPageOut:
+        """
+        Return one cursor page of conflicts of a single scope and type.
+
+        Args:
+            params (ConflictPageParams): Scope, type, filters, cursor and page size.
+
+        Returns:
+            ConflictPageOut: Conflicts of the page and the cursor of the next one.
+        """
+        return self.conflict_index.get_page(params)
+
+    def stream_conflicts_summary(
+        self, params: ConflictQueryParams
+    ) -> StreamingResponse:
+        """
+        Stream the conflicts summary as NDJSON from the persisted conflict index.
+
+        Lines are ConflictGroupOut chunks (merge them by scope and type on the client)
+        followed by one ConflictCountsOut line with the totals.
+
+        Args:
+            params (ConflictQueryParams): Date range, optional conflict types and schedule filter (strategy is ignored).
+
+        Returns:
+            StreamingResponse: application/x-ndjson response.
+        """
+        return StreamingResponse(
+            self.conflict_index.stream_summary(params),
+            media_type="application/x-ndjson",
+        )
+
+    def get_conflicts_cache_stats(self) -> ConflictCacheStatsOut:
+        """
+        Report hit/miss counters and memory use of the conflicts summary cache.
+
+        Returns:
+            ConflictCacheStatsOut: Cache counters and the current lesson version.
+        """
+        return ConflictCacheStatsOut(
+            **summary_cache.stats(), version=lesson_versions.current
+        )
+
+    def _scan_conflicts_summary(
+        self, params: ConflictQueryParams, shown_rows: Optional[Set[RowKey]] = None
+    ) -> ConflictsSummaryOut:
+        """
+        Compute the conflicts summary by scanning every lesson in the date window.
+
         Notes:
-        - Does NOT filter by schedule_id when collecting lessons to detect shared conflicts
-          between different schedules; schedule_id is applied later when grouping.
-        - Applies only date range filters (if provided) prior to conflict detection.
+        - Does NOT filter lessons by schedule_id, so shared conflicts between different
+          schedules are detected; schedule_id is applied later when grouping.
+        - Occurrences of virtual recurring templates in the window are expanded and
+          scanned together with the lesson rows.
+        - With schedule_id, only lessons sharing a room, group or professor on the same
+          date with the schedule are loaded (its footprint), so the cost scales with the
+          schedule rather than with all schedules. Conflicts touching the schedule are
+          identical to those of an unscoped scan.
 
         Args:
             params (ConflictQueryParams): Filtering parameters (date range, optional conflict types, optional schedule filter for grouping).
+            shown_rows (Optional[Set[RowKey]]): If given, filled with the rows the summary
+                shows (see _group_conflicts_by_scope_and_type).
 
         Returns:
             ConflictsSummaryOut: Groups of conflicts by scope (single/shared) and type with totals.
         """
-        # Load all lessons with necessary relationships to analyze conflicts
-        query = self.db.query(Lesson).options(
-            selectinload(Lesson.group).selectinload(Group.semester),
-            selectinload(Lesson.room),
-            selectinload(Lesson.schedule),
-            selectinload(Lesson.subject_assignment).selectinload(
-                SubjectAssignment.subject
-            ),
-            selectinload(Lesson.subject_assignment)
-            .selectinload(SubjectAssignment.workload)
-            .selectinload(ProfessorWorkload.contract)
-            .selectinload(ProfessorContract.professor_profile)
-            .selectinload(ProfessorProfile.user),
-        )
+        # Load lightweight projections; full lessons are hydrated only for reported conflicts
+        criteria = []
 
         # Apply date-only filters (no schedule_id filter here by design)
         if hasattr(params, "date_from") and params.date_from:
-            query = query.filter(Lesson.date >= params.date_from)
+            criteria.append(Lesson.date >= params.date_from)
         if hasattr(params, "date_to") and params.date_to:
-            query = query.filter(Lesson.date <= params.date_to)
+            criteria.append(Lesson.date <= params.date_to)
+        virtual = self.virtual.expand(params.date_from, params.date_to)
+        # The footprint only follows lesson rows; with virtual occurrences in the
+        # window, the whole window is scanned
+        if params.schedule_id and not virtual:
+            criteria.append(Lesson.id.in_(self._schedule_footprint_ids(params)))
 
         # Получаем ВСЕ уроки для анализа конфликтов
-        all_lessons = query.order_by(Lesson.date, Lesson.start_time).all()
+        all_lessons = sort_lessons(self.repo.get_rows(*criteria) + virtual)
 
         # Находим все конфликты без ограничений
         all_conflicts = self._find_all_conflicts(all_lessons, params.conflict_types)
 
         # Группируем конфликты с фильтрацией по schedule_id
         result = self._group_conflicts_by_scope_and_type(
-            all_conflicts, params.schedule_id
+            all_conflicts, params.schedule_id, shown_rows
         )
 
         return result
 
+    def check_conflicts(self, params: ConflictCheckParams) -> ConflictCheckOut:
+        """
+        Check a candidate lesson against existing lessons before writing it.
+
+        Only the candidate's room, group and professor are probed on its date, each
+        with an indexed range query, and the same rules as the conflicts summary are
+        applied (multi-group exemptions included).
+
+        Args:
+            params (ConflictCheckParams): Candidate placement and optional lesson to exclude.
+
+        Returns:
+            ConflictCheckOut: Conflicts listing the existing lessons that clash with the candidate.
+        """
+        candidate = self._build_candidate(params)
+
+        room_id = self._get_room_key(candidate)
+        professor_id = self._get_professor_id(candidate)
+        group_id = self._get_group_key(candidate)
+
+        existing = self.repo.find_overlapping(
+            params.date,
+            params.start_time,
+            params.end_time,
+            room_id=room_id,
+            group_id=group_id,
+            professor_user_id=professor_id,
+            exclude_lesson_id=params.exclude_lesson_id,
+        )
+        existing += [
+            lesson
+            for lesson in self.virtual.expand_touching(
+                params.date,
+                params.date,
+                {
+                    "room": {room_id} if room_id else set(),
+                    "group": {group_id} if group_id else set(),
+                    "professor": {professor_id} if professor_id else set(),
+                },
+            )
+            if lesson.id != params.exclude_lesson_id
+            and lesson.start_time < params.end_time
+            and lesson.end_time > params.start_time
+        ]
+
+        conflicts = self.candidate_conflicts(candidate, existing)
+
+        return ConflictCheckOut(
+            has_conflicts=bool(conflicts), conflicts=conflicts, count=len(conflicts)
+        )
+
+    def candidate_conflicts(
+        self, candidate, existing: List[Lesson]
+    ) -> List[ConflictOut]:
+        """
+        Apply the conflict rules to an unsaved candidate and existing lessons of its date.
+
+        Only conflicts of the candidate's own room, professor and group that include
+        the candidate are returned, listing the existing lessons only.
+
+        Args:
+            candidate (SimpleNamespace): Lesson-like candidate (see _build_candidate).
+            existing (List[Lesson]): Existing lessons on the candidate's date that overlap it.
+
+        Returns:
+            List[ConflictOut]: Conflicts involving the candidate.
+        """
+        if not existing:
+            return []
+
+        keys = {
+            "room": self._only_resource(
+                self._get_room_key, self._get_room_key(candidate)
+            ),
+            "professor": self._only_resource(
+                self._get_professor_id, self._get_professor_id(candidate)
+            ),
+            "group": self._only_resource(
+                self._get_group_key, self._get_group_key(candidate)
+            ),
+        }
+
+        conflicts = []
+        for conflict in self.find_conflicts_in_day([candidate, *existing], keys):
+            if not any(lesson is candidate for lesson in conflict["lessons"]):
+                continue
+
+            conflicts.append(
+                self._conflict_to_schema(
+                    {
+                        **conflict,
+                        "lessons": [
+                            lesson
+                            for lesson in conflict["lessons"]
+                            if lesson is not candidate
+                        ],
+                    }
+                )
+            )
+
+        return conflicts
+
+    def _build_candidate(self, params: ConflictCheckParams) -> SimpleNamespace:
+        """
+        Build an unsaved, lesson-like object for conflict rules.
+
+        A plain namespace is used instead of a transient Lesson so that the candidate
+        can never be cascaded into the session.
+
+        Args:
+            params (ConflictCheckParams): Candidate placement.
+
+        Returns:
+            SimpleNamespace: Object exposing the Lesson attributes used by conflict detection.
+        """
+        return SimpleNamespace(
+            id=None,
+            schedule_id=None,
+            date=params.date,
+            start_time=params.start_time,
+            end_time=params.end_time,
+            room_id=params.room_id,
+            group_id=params.group_id,
+            subject_assignment_id=params.subject_assignment_id,
+            is_online=params.is_online,
+            professor_user_id=SubjectAssignmentRepository(self.db).professor_user_id(
+                params.subject_assignment_id
+            ),
+        )
+
+    def _only_resource(
+        self, key_func: Callable[[Lesson], Optional[int]], resource_id: Optional[int]
+    ) -> Callable[[Lesson], Optional[int]]:
+        """
+        Wrap a resource key function so it only reports one resource.
+
+        Args:
+            key_func (Callable): Resource key function (room/professor/group).
+            resource_id (Optional[int]): The only resource to keep; None disables the bucket.
+
+        Returns:
+            Callable: Key function returning None for every other resource.
+        """
+
+        def key(lesson):
+            value = key_func(lesson)
+            return value if value is not None and value == resource_id else None
+
+        return key
+
+    def _sql_conflicts_summary(
+        self, params: ConflictQueryParams, shown_rows: Optional[Set[RowKey]] = None
+    ) -> ConflictsSummaryOut:
+        """
+        Compute the conflicts summary with database-side overlap detection.
+
+        Window-function queries partitioned by (room, date), (group, date) and
+        (professor, date) return only the IDs of lessons that overlap another lesson;
+        only those lessons are loaded (as projections) and passed through the regular
+        conflict rules.
+        Memory use scales with the number of conflicting lessons, not the window size.
+        With schedule_id, the window functions only run over the schedule's footprint
+        (see _scan_conflicts_summary). Windows with occurrences of virtual recurring
+        templates fall back to the scan.
+
+        Args:
+            params (ConflictQueryParams): Filtering parameters (date range, optional conflict types, optional schedule filter for grouping).
+            shown_rows (Optional[Set[RowKey]]): If given, filled with the rows the summary
+                shows (see _group_conflicts_by_scope_and_type).
+
+        Returns:
+            ConflictsSummaryOut: Same result as the full-scan summary.
+        """
+        # The window functions only see lesson rows
+        if self.virtual.expand(params.date_from, params.date_to):
+            return self._scan_conflicts_summary(params, shown_rows)
+
+        candidate_ids = self.repo.find_conflict_candidate_ids(
+            params.date_from,
+            params.date_to,
+            params.conflict_types,
+            within=(
+                self._schedule_footprint_ids(params) if params.schedule_id else None
+            ),
+        )
+
+        lessons = []
+        if candidate_ids:
+            lessons = self.repo.get_rows(Lesson.id.in_(candidate_ids))
+
+        all_conflicts = self._find_all_conflicts(lessons, params.conflict_types)
+
+        return self._group_conflicts_by_scope_and_type(
+            all_conflicts, params.schedule_id, shown_rows
+        )
+
+    def _schedule_footprint_ids(self, params: ConflictQueryParams):
+        """
+        Select IDs of lessons that can take part in a conflict touching params.schedule_id.
+
+        Args:
+            params (ConflictQueryParams): Schedule, date window and optional conflict types.
+
+        Returns:
+            CompoundSelect: Lesson ID select from LessonRepository.schedule_footprint_ids.
+        """
+        return self.repo.schedule_footprint_ids(
+            params.schedule_id,
+            params.date_from,
+            params.date_to,
+            params.conflict_types,
+        )
+
     def _find_all_conflicts(
         self, lessons: List[Lesson], conflict_types: Optional[List[str]] = None
     ) -> List[Dict]:
@@ -176,7 +988,13 @@ class LessonService(BaseService[Lesson, LessonIn]):
 
         Strategy:
         - Bucket lessons by date to reduce comparisons.
-        - For each date, detect room/professor/group conflicts based on time overlaps.
+        - For each date, run one sweep-line pass that builds overlap clusters per room,
+          professor and group, then turn clusters into room/professor/group conflicts.
+        - With NumPy installed (and CONFLICT_SCAN_VECTORIZED on), the whole window is
+          detected with array operations instead; see _find_all_conflicts_vectorized.
+          This takes precedence over the process pool.
+        - Otherwise, large scans (CONFLICT_SCAN_PARALLEL_THRESHOLD lessons or more over
+          several dates) are detected per day in a process pool; see _find_all_conflicts_parallel.
 
         Args:
             lessons (List[Lesson]): Collection of lessons to analyze.
@@ -186,6 +1004,9 @@ class LessonService(BaseService[Lesson, LessonIn]):
         Returns:
             List[Dict]: Raw conflict dicts used downstream for grouping and serialization.
         """
+        if setting.CONFLICT_SCAN_VECTORIZED and conflict_kernel.is_available():
+            return self._find_all_conflicts_vectorized(lessons, conflict_types)
+
         conflicts = []
 
         # Группируем уроки по дням для оптимизации
@@ -195,28 +1016,186 @@ class LessonService(BaseService[Lesson, LessonIn]):
                 lessons_by_date[lesson.date] = []
             lessons_by_date[lesson.date].append(lesson)
 
+        workers = resolve_workers(setting.CONFLICT_SCAN_WORKERS)
+        if (
+            workers > 1
+            and len(lessons_by_date) > 1
+            and len(lessons) >= setting.CONFLICT_SCAN_PARALLEL_THRESHOLD
+        ):
+            return self._find_all_conflicts_parallel(
+                lessons_by_date, conflict_types, workers
+            )
+
+        keys = self._conflict_key_funcs(conflict_types)
+
         # Находим конфликты по дням
         for date_lessons in lessons_by_date.values():
-            if not conflict_types or "room" in conflict_types:
-                conflicts.extend(self._find_room_conflicts_in_day(date_lessons))
-            if not conflict_types or "professor" in conflict_types:
-                conflicts.extend(self._find_professor_conflicts_in_day(date_lessons))
-            if not conflict_types or "group" in conflict_types:
-                conflicts.extend(self._find_group_conflicts_in_day(date_lessons))
+            conflicts.extend(self.find_conflicts_in_day(date_lessons, keys))
+
+        return conflicts
+
+    def _find_all_conflicts_vectorized(
+        self, lessons: List[Lesson], conflict_types: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Detect conflicts over the whole window with the NumPy kernel.
+
+        Lessons are loaded into columns once; overlaps, clusters and the multi-group
+        exemptions are computed with sorts and shifted-array comparisons. Only the
+        conflicting clusters come back to Python, where messages are built. The result
+        is identical to the serial path, including order.
+
+        Args:
+            lessons (List[Lesson]): Collection of lessons to analyze.
+            conflict_types (Optional[List[str]]): Subset of types to check; None for all.
+
+        Returns:
+            List[Dict]: Raw conflict dicts, as produced by _find_all_conflicts.
+        """
+        lessons = list(lessons)
+        if not lessons:
+            return []
+
+        found = conflict_kernel.detect_conflicts(
+            conflict_kernel.to_columns(lessons), conflict_types
+        )
+
+        conflicts = []
+        for conflict_type, resource_id, positions in found:
+            conflict = self._build_conflict(
+                conflict_type, resource_id, [lessons[index] for index in positions]
+            )
+            if conflict:
+                conflicts.append(conflict)
 
         return conflicts
 
+    def _find_all_conflicts_parallel(
+        self,
+        lessons_by_date: Dict[date, List[Lesson]],
+        conflict_types: Optional[List[str]],
+        workers: int,
+    ) -> List[Dict]:
+        """
+        Detect conflicts per date in worker processes and merge the results.
+
+        Days are independent, so each one is shipped to the pool as a list of compact
+        LessonTuples; workers return (type, resource, lesson IDs) triples, and messages
+        are built here, where the database session lives. The result is identical to
+        the serial path, including order.
+
+        Args:
+            lessons_by_date (Dict[date, List[Lesson]]): Lessons bucketed by date.
+            conflict_types (Optional[List[str]]): Subset of types to check; None for all.
+            workers (int): Number of worker processes.
+
+        Returns:
+            List[Dict]: Raw conflict dicts, as produced by _find_all_conflicts.
+        """
+        lessons_by_id = {}
+        days = []
+        for date_lessons in lessons_by_date.values():
+            day = []
+            for lesson in date_lessons:
+                lessons_by_id[lesson.id] = lesson
+                day.append(to_lesson_tuple(lesson, self._get_professor_id(lesson)))
+            days.append(day)
+
+        results = get_executor(workers).map(
+            partial(detect_day_conflicts, conflict_types=conflict_types),
+            days,
+            chunksize=max(1, len(days) // (workers * 4)),
+        )
+
+        conflicts = []
+        for day_conflicts in results:
+            for conflict_type, resource_id, lesson_ids in day_conflicts:
+                conflict = self._build_conflict(
+                    conflict_type,
+                    resource_id,
+                    [lessons_by_id[lesson_id] for lesson_id in lesson_ids],
+                )
+                if conflict:
+                    conflicts.append(conflict)
+
+        return conflicts
+
+    def find_conflicts_in_day(
+        self,
+        lessons: List[Lesson],
+        keys: Dict[str, Callable[[Lesson], Optional[int]]],
+    ) -> List[Dict]:
+        """
+        Detect conflicts among lessons of one date for the given resource buckets.
+
+        All buckets are produced by a single sweep-line pass, then each bucket's
+        overlap clusters go through the matching room/professor/group rules.
+
+        Args:
+            lessons (List[Lesson]): Lessons occurring on the same date.
+            keys (Dict[str, Callable]): Conflict type -> resource key function
+                (see _conflict_key_funcs); types missing from the dict are skipped.
+
+        Returns:
+            List[Dict]: Raw conflict dicts (type, resource_id, message, severity, lessons).
+        """
+        overlaps = sweep_overlap_clusters(lessons, keys)
+        conflicts = []
+
+        if "room" in overlaps:
+            conflicts.extend(
+                self._find_room_conflicts_in_day(lessons, overlaps["room"])
+            )
+        if "professor" in overlaps:
+            conflicts.extend(
+                self._find_professor_conflicts_in_day(lessons, overlaps["professor"])
+            )
+        if "group" in overlaps:
+            conflicts.extend(
+                self._find_group_conflicts_in_day(lessons, overlaps["group"])
+            )
+
+        return conflicts
+
+    def _conflict_key_funcs(
+        self, conflict_types: Optional[List[str]] = None
+    ) -> Dict[str, Callable[[Lesson], Optional[int]]]:
+        """
+        Resource key functions for the requested conflict types.
+
+        Args:
+            conflict_types (Optional[List[str]]): Subset of "room", "professor", "group"; None for all.
+
+        Returns:
+            Dict[str, Callable]: Conflict type -> function returning the lesson's resource ID.
+        """
+        keys = {}
+        if not conflict_types or "room" in conflict_types:
+            keys["room"] = self._get_room_key
+        if not conflict_types or "professor" in conflict_types:
+            keys["professor"] = self._get_professor_id
+        if not conflict_types or "group" in conflict_types:
+            keys["group"] = self._get_group_key
+        return keys
+
     def _group_conflicts_by_scope_and_type(
-        self, conflicts: List[Dict], schedule_id: Optional[int]
+        self,
+        conflicts: List[Dict],
+        schedule_id: Optional[int],
+        shown_rows: Optional[Set[RowKey]] = None,
     ) -> ConflictsSummaryOut:
         """
         Group conflicts by scope ("single" for one schedule, "shared" for multiple schedules) and by type.
 
         Optionally filters out conflicts that do not involve the provided schedule_id.
+        Lessons given as LessonRow projections are hydrated in one batch, and only for
+        the conflicts that end up in the summary.
 
         Args:
             conflicts (List[Dict]): Raw conflict records from _find_all_conflicts.
             schedule_id (Optional[int]): If provided, only include conflicts that touch this schedule.
+            shown_rows (Optional[Set[RowKey]]): If given, filled with the rows the
+                serialized lessons show (see _shown_rows), for the summary cache.
 
         Returns:
             ConflictsSummaryOut: Grouped conflicts with counts and totals.
@@ -232,6 +1211,7 @@ class LessonService(BaseService[Lesson, LessonIn]):
             "group": [],
         }
 
+        kept = []
         for conflict in conflicts:
             # Определяем область действия конфликта
             schedule_ids = set()
@@ -245,7 +1225,27 @@ class LessonService(BaseService[Lesson, LessonIn]):
             if schedule_id and schedule_id not in schedule_ids:
                 continue
 
-            conflict_schema = self._conflict_to_schema(conflict)
+            kept.append((conflict, schedule_ids))
+
+        hydrated = self.repo.hydrate(
+            lesson.id
+            for conflict, _ in kept
+            for lesson in conflict["lessons"]
+            if isinstance(lesson, LessonRow)
+        )
+
+        for conflict, schedule_ids in kept:
+            lessons = [
+                (
+                    hydrated.get(lesson.id, lesson)
+                    if isinstance(lesson, LessonRow)
+                    else lesson
+                )
+                for lesson in conflict["lessons"]
+            ]
+            if shown_rows is not None:
+                shown_rows |= self._shown_rows(lessons)
+            conflict_schema = self._conflict_to_schema({**conflict, "lessons": lessons})
 
             # Определяем тип конфликта: single (один schedule) или shared (несколько)
             if len(schedule_ids) == 1:
@@ -297,263 +1297,244 @@ class LessonService(BaseService[Lesson, LessonIn]):
             total_conflicts=total_single + total_shared,
         )
 
-    def _find_room_conflicts_in_day(self, lessons: List[Lesson]) -> List[Dict]:
+    def _find_room_conflicts_in_day(
+        self,
+        lessons: List[Lesson],
+        overlaps: Optional[Dict[int, List[List[Lesson]]]] = None,
+    ) -> List[Dict]:
         """
         Detect room conflicts for a single day.
 
         Logic:
-        - Group lessons by room (excluding online lessons).
-        - For each room, find overlapping time groups.
+        - Group lessons by room (excluding online lessons) and find overlapping time clusters.
         - If overlapping lessons are taught by different professors, it is a conflict;
           if the same professor teaches all overlapping lessons in the same room, treat as multi-group, not a conflict.
 
         Args:
             lessons (List[Lesson]): Lessons occurring on the same date.
+            overlaps (Optional[Dict[int, List[List[Lesson]]]]): Precomputed room clusters from
+                sweep_overlap_clusters; computed from lessons when omitted.
 
         Returns:
             List[Dict]: Room conflict entries.
         """
-        conflicts = []
-        room_lessons: Dict[int, List[Lesson]] = {}
+        if overlaps is None:
+            overlaps = sweep_overlap_clusters(lessons, {"room": self._get_room_key})[
+                "room"
+            ]
 
-        for lesson in lessons:
-            if lesson.room_id and not lesson.is_online:
-                if lesson.room_id not in room_lessons:
-                    room_lessons[lesson.room_id] = []
-                room_lessons[lesson.room_id].append(lesson)
+        conflicts = []
 
-        for room_id, room_lesson_list in room_lessons.items():
-            overlapping_groups = self._find_time_overlaps(room_lesson_list)
+        for room_id, overlapping_groups in overlaps.items():
             for overlap_group in overlapping_groups:
-                if len(overlap_group) > 1:
-                    # Проверяем, ведет ли один преподаватель все уроки в группе
-                    professors = set()
-                    for lesson in overlap_group:
-                        professor_id = self._get_professor_id(lesson)
-                        if professor_id:
-                            professors.add(professor_id)
-
-                    # Если один преподаватель ведет все уроки в одной комнате - это многогрупповое занятие, не конфликт
-                    if len(professors) == 1:
-                        continue
-
-                    # Если разные преподаватели в одной комнате - это конфликт
-                    room_name = (
-                        overlap_group[0].room.number
-                        if overlap_group[0].room
-                        else f"Room {room_id}"
-                    )
-                    conflicts.append(
-                        {
-                            "type": "room",
-                            "message": f"Room '{room_name}' is double-booked by different professors at {overlap_group[0].start_time}-{overlap_group[0].end_time}",
-                            "severity": "error",
-                            "lessons": overlap_group,
-                        }
-                    )
+                # Проверяем, ведет ли один преподаватель все уроки в группе
+                professors = set()
+                for lesson in overlap_group:
+                    professor_id = self._get_professor_id(lesson)
+                    if professor_id:
+                        professors.add(professor_id)
+
+                # Если один преподаватель ведет все уроки в одной комнате - это многогрупповое занятие, не конфликт
+                if not is_room_conflict(professors):
+                    continue
+
+                # Если разные преподаватели в одной комнате - это конфликт
+                conflicts.append(self._build_conflict("room", room_id, overlap_group))
         return conflicts
 
-    def _find_professor_conflicts_in_day(self, lessons: List[Lesson]) -> List[Dict]:
+    def _find_professor_conflicts_in_day(
+        self,
+        lessons: List[Lesson],
+        overlaps: Optional[Dict[int, List[List[Lesson]]]] = None,
+    ) -> List[Dict]:
         """
         Detect professor conflicts for a single day.
 
         Logic:
-        - Group lessons by professor.
-        - For each professor, find overlapping time groups.
+        - Group lessons by professor and find overlapping time clusters.
         - If overlapping lessons occur in multiple rooms (or mix online/rooms), it is a conflict;
           if all overlapping lessons are in the same room or all online, treat as multi-group, not a conflict.
 
         Args:
             lessons (List[Lesson]): Lessons occurring on the same date.
+            overlaps (Optional[Dict[int, List[List[Lesson]]]]): Precomputed professor clusters from
+                sweep_overlap_clusters; computed from lessons when omitted.
 
         Returns:
             List[Dict]: Professor conflict entries.
         """
+        if overlaps is None:
+            overlaps = sweep_overlap_clusters(
+                lessons, {"professor": self._get_professor_id}
+            )["professor"]
+
         conflicts = []
-        professor_lessons: Dict[int, List[Lesson]] = {}
 
-        for lesson in lessons:
-            professor_id = self._get_professor_id(lesson)
-            if professor_id:
-                if professor_id not in professor_lessons:
-                    professor_lessons[professor_id] = []
-                professor_lessons[professor_id].append(lesson)
-
-        for professor_id, prof_lesson_list in professor_lessons.items():
-            overlapping_groups = self._find_time_overlaps(prof_lesson_list)
+        for professor_id, overlapping_groups in overlaps.items():
             for overlap_group in overlapping_groups:
-                if len(overlap_group) > 1:
-                    # Проверяем, в одной ли комнате все уроки преподавателя
-                    rooms = set()
-                    online_lessons = 0
-
-                    for lesson in overlap_group:
-                        if lesson.is_online:
-                            online_lessons += 1
-                        elif lesson.room_id:
-                            rooms.add(lesson.room_id)
-
-                    # Если все уроки в одной комнате ИЛИ все онлайн - это многогрупповое занятие, не конфликт
-                    if len(rooms) <= 1 and (len(rooms) == 0 or online_lessons == 0):
-                        continue
-
-                    # Если преподаватель в разных комнатах одновременно - это конфликт
-                    first_lesson = overlap_group[0]
-                    professor = self._get_professor_object(first_lesson)
-
-                    if professor and professor.user:
-                        professor_name = (
-                            f"{professor.user.name} {professor.user.surname}"
-                        )
-                        conflicts.append(
-                            {
-                                "type": "professor",
-                                "message": f"Professor {professor_name} teaching in multiple locations simultaneously at {overlap_group[0].start_time}-{overlap_group[0].end_time}",
-                                "severity": "error",
-                                "lessons": overlap_group,
-                            }
-                        )
+                # Проверяем, в одной ли комнате все уроки преподавателя
+                rooms = set()
+                online_lessons = 0
+
+                for lesson in overlap_group:
+                    if lesson.is_online:
+                        online_lessons += 1
+                    elif lesson.room_id:
+                        rooms.add(lesson.room_id)
+
+                # Если все уроки в одной комнате ИЛИ все онлайн - это многогрупповое занятие, не конфликт
+                if not is_professor_conflict(rooms, online_lessons):
+                    continue
+
+                # Если преподаватель в разных комнатах одновременно - это конфликт
+                conflict = self._build_conflict(
+                    "professor", professor_id, overlap_group
+                )
+                if conflict:
+                    conflicts.append(conflict)
         return conflicts
 
-    def _find_group_conflicts_in_day(self, lessons: List[Lesson]) -> List[Dict]:
+    def _find_group_conflicts_in_day(
+        self,
+        lessons: List[Lesson],
+        overlaps: Optional[Dict[int, List[List[Lesson]]]] = None,
+    ) -> List[Dict]:
         """
         Detect group conflicts for a single day.
 
         Logic:
-        - Group lessons by group.
-        - For each group, find overlapping time groups and mark conflicts.
+        - Group lessons by group and find overlapping time clusters; every cluster is a conflict.
 
         Args:
             lessons (List[Lesson]): Lessons occurring on the same date.
+            overlaps (Optional[Dict[int, List[List[Lesson]]]]): Precomputed group clusters from
+                sweep_overlap_clusters; computed from lessons when omitted.
 
         Returns:
             List[Dict]: Group conflict entries.
         """
-        conflicts = []
-        group_lessons: Dict[int, List[Lesson]] = {}
+        if overlaps is None:
+            overlaps = sweep_overlap_clusters(lessons, {"group": self._get_group_key})[
+                "group"
+            ]
 
-        for lesson in lessons:
-            if lesson.group_id not in group_lessons:
-                group_lessons[lesson.group_id] = []
-            group_lessons[lesson.group_id].append(lesson)
+        conflicts = []
 
-        for group_id, group_lesson_list in group_lessons.items():
-            overlapping_groups = self._find_time_overlaps(group_lesson_list)
+        for group_id, overlapping_groups in overlaps.items():
             for overlap_group in overlapping_groups:
-                if len(overlap_group) > 1:
-                    group_name = (
-                        overlap_group[0].group.name
-                        if overlap_group[0].group
-                        else f"Group {group_id}"
-                    )
-                    conflicts.append(
-                        {
-                            "type": "group",
-                            "message": f"Group '{group_name}' has multiple lessons at {overlap_group[0].start_time}-{overlap_group[0].end_time}",
-                            "severity": "error",
-                            "lessons": overlap_group,
-                        }
-                    )
+                conflicts.append(self._build_conflict("group", group_id, overlap_group))
         return conflicts
 
-    def _find_time_overlaps(self, lessons: List[Lesson]) -> List[List[Lesson]]:
+    def _build_conflict(
+        self, conflict_type: str, resource_id: int, lessons: List[Lesson]
+    ) -> Optional[Dict]:
         """
-        Identify sets of lessons with overlapping times (on the same date).
-
-        Algorithm:
-        - Iterate each lesson and compare with subsequent lessons.
-        - Two lessons overlap if start_time < other.end_time and end_time > other.start_time.
-        - Build groups of overlapping lessons and return only groups with size > 1.
+        Build the raw conflict dict (with its human-readable message) for an overlap cluster
+        that already failed the room/professor/group rule.
 
         Args:
-            lessons (List[Lesson]): Lessons to check (assumed same date by callers).
+            conflict_type (str): "room", "professor" or "group".
+            resource_id (int): Room ID, professor user ID or group ID.
+            lessons (List[Lesson]): Overlapping lessons ordered by start time.
 
         Returns:
-            List[List[Lesson]]: List of overlapping groups (each group is >= 2 lessons).
+            Optional[Dict]: Conflict dict, or None for a professor without a user record.
         """
-        overlapping_groups = []
-        processed = set()
+        if conflict_type == "room":
+            room = self.db.get(Room, resource_id)
+            resource_name = room.number if room else f"Room {resource_id}"
+        elif conflict_type == "professor":
+            professor = self.db.get(User, resource_id)
+            if not professor:
+                return None
+            resource_name = f"{professor.name} {professor.surname}"
+        else:
+            group = self.db.get(Group, resource_id)
+            resource_name = group.name if group else f"Group {resource_id}"
+
+        return {
+            "type": conflict_type,
+            "resource_id": resource_id,
+            "message": self._conflict_message(
+                conflict_type, resource_name, self._format_time_span(lessons)
+            ),
+            "severity": "error",
+            "lessons": lessons,
+        }
 
-        print(f"Checking time overlaps for {len(lessons)} lessons")
+    @staticmethod
+    def _conflict_message(
+        conflict_type: str, resource_name: str, time_span: str
+    ) -> str:
+        """
+        Human-readable description of a conflict.
 
-        for i, lesson1 in enumerate(lessons):
-            if lesson1.id in processed:
-                continue
+        Args:
+            conflict_type (str): "room", "professor" or "group".
+            resource_name (str): Room number, professor full name or group name.
+            time_span (str): Time span of the overlapping lessons as "start-end".
 
-            overlap_group = [lesson1]
-            processed.add(lesson1.id)
+        Returns:
+            str: Conflict message.
+        """
+        if conflict_type == "room":
+            return f"Room '{resource_name}' is double-booked by different professors at {time_span}"
+        if conflict_type == "professor":
+            return f"Professor {resource_name} teaching in multiple locations simultaneously at {time_span}"
+        return f"Group '{resource_name}' has multiple lessons at {time_span}"
 
-            for j, lesson2 in enumerate(lessons[i + 1 :], i + 1):
-                if lesson2.id in processed:
-                    continue
+    def _get_room_key(self, lesson: Lesson) -> Optional[int]:
+        """
+        Resource key for room conflicts: the room ID of on-site lessons, None otherwise.
 
-                # Проверяем пересечение времени И даты
-                if (
-                    lesson1.date == lesson2.date
-                    and lesson1.start_time < lesson2.end_time
-                    and lesson1.end_time > lesson2.start_time
-                ):
-                    print(
-                        f"Time overlap found: Lesson {lesson1.id} ({lesson1.start_time}-{lesson1.end_time}) overlaps with Lesson {lesson2.id} ({lesson2.start_time}-{lesson2.end_time})"
-                    )
-                    overlap_group.append(lesson2)
-                    processed.add(lesson2.id)
+        Args:
+            lesson (Lesson): Lesson to inspect.
 
-            if len(overlap_group) > 1:
-                print(
-                    f"Overlap group formed: {[lesson.id for lesson in overlap_group]}"
-                )
-                overlapping_groups.append(overlap_group)
+        Returns:
+            Optional[int]: Room ID, or None for online lessons and lessons without a room.
+        """
+        if lesson.room_id and not lesson.is_online:
+            return lesson.room_id
+        return None
 
-        return overlapping_groups
+    def _get_group_key(self, lesson: Lesson) -> Optional[int]:
+        """
+        Resource key for group conflicts: the attending group ID.
 
-    def _get_professor_id(self, lesson: Lesson) -> Optional[int]:
+        Args:
+            lesson (Lesson): Lesson to inspect.
+
+        Returns:
+            Optional[int]: Group ID.
         """
-        Extract the professor (user) ID from a lesson via nested relationships.
+        return lesson.group_id
 
-        Follows: lesson.subject_assignment -> workload -> contract -> professor_profile.user_id
+    def _format_time_span(self, lessons: List[Lesson]) -> str:
+        """
+        Format the time span covered by an overlap cluster as "start-end".
 
         Args:
-            lesson (Lesson): Lesson to inspect.
+            lessons (List[Lesson]): Cluster ordered by start time.
 
         Returns:
-            Optional[int]: Professor user ID if resolvable, otherwise None.
+            str: Earliest start and latest end joined by a dash.
         """
-        try:
-            if (
-                lesson.subject_assignment
-                and lesson.subject_assignment.workload
-                and lesson.subject_assignment.workload.contract
-                and lesson.subject_assignment.workload.contract.professor_profile
-            ):
-                return lesson.subject_assignment.workload.contract.professor_profile.user_id
-        except (AttributeError, TypeError):
-            pass
-        return None
+        return f"{lessons[0].start_time}-{max(lesson.end_time for lesson in lessons)}"
 
-    def _get_professor_object(self, lesson: Lesson):
+    def _get_professor_id(self, lesson: Lesson) -> Optional[int]:
         """
-        Extract the ProfessorProfile object from a lesson via nested relationships.
+        Extract the professor (user) ID from a lesson.
 
-        Follows: lesson.subject_assignment -> workload -> contract -> professor_profile
+        Reads the denormalized professor_user_id column, which repositories keep in
+        sync with lesson.subject_assignment -> workload -> contract -> professor_profile.
 
         Args:
-            lesson (Lesson): Lesson to inspect.
+            lesson (Lesson | LessonRow): Lesson to inspect.
 
         Returns:
-            ProfessorProfile | None: The professor profile if resolvable, otherwise None.
+            Optional[int]: Professor user ID if resolvable, otherwise None.
         """
-        try:
-            if (
-                lesson.subject_assignment
-                and lesson.subject_assignment.workload
-                and lesson.subject_assignment.workload.contract
-                and lesson.subject_assignment.workload.contract.professor_profile
-            ):
-                return lesson.subject_assignment.workload.contract.professor_profile
-        except (AttributeError, TypeError):
-            pass
-        return None
+        return lesson.professor_user_id
 
     def _conflict_to_schema(self, conflict_data: Dict) -> ConflictOut:
         """
@@ -599,12 +1580,14 @@ class LessonService(BaseService[Lesson, LessonIn]):
             {
                 "id": group.id,
                 "name": group.name,
-                "study_form": {
-                    "id": group.study_form.id,
-                    "form": group.study_form.form,
-                }
-                if group.study_form
-                else None,
+                "study_form": (
+                    {
+                        "id": group.study_form.id,
+                        "form": group.study_form.form,
+                    }
+                    if group.study_form
+                    else None
+                ),
             }
             for group in groups_query.all()
         ]
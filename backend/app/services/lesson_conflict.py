@@ -0,0 +1,713 @@
+import base64
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import date, time
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, distinct, func, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..repositories import LessonConflictRepository, LessonRepository
+from ..repositories.lesson import LessonRow
+from ..models import (
+    Group,
+    Lesson,
+    LessonConflict,
+    LessonConflictMember,
+    RecurringLessonTemplate,
+    Room,
+    User,
+)
+from ..schemas.lesson_conflict import (
+    ConflictCountsOut,
+    ConflictOut,
+    ConflictGroupOut,
+    ConflictPageOut,
+    ConflictPageParams,
+    ConflictQueryParams,
+    ConflictsSummaryOut,
+)
+from ..utils.cache import DateVersionClock, LRUCache, RowKey
+from ..utils.recurrence import VIRTUAL_ID_FACTOR
+from ..utils.resource_versions import mark_dates, track_date_versions
+from ..config import setting
+from ..database import SessionLocal
+from .base import BaseService
+from .virtual_lesson import sort_lessons
+
+# (date, conflict type, resource id) - the unit of incremental recheck
+ConflictKey = Tuple[date, str, Optional[int]]
+
+CONFLICT_TYPES = ("room", "professor", "group")
+
+CONFLICT_SCOPES = ("single", "shared")
+
+# Conflicts hydrated and serialized at once by the NDJSON stream
+STREAM_CHUNK_SIZE = 200
+
+# Process-wide: every lesson write goes through refresh()/rebuild(), which bump the
+# versions of the affected dates (once the write commits) and thereby invalidate
+# cached summaries covering them.
+# Entries are also stale once a row they show changes (row_versions in .lesson).
+lesson_versions = DateVersionClock()
+summary_cache = LRUCache(max_bytes=setting.CONFLICT_CACHE_MAX_BYTES)
+track_date_versions(SessionLocal)
+
+
+class LessonConflictService(BaseService[LessonConflict, dict]):
+    """
+    Service layer for the persisted lesson conflict index.
+
+    Responsibilities:
+    - Recheck only the affected room/professor/group on a date after lesson writes.
+    - Rebuild the whole index from the lesson table (startup, bulk imports).
+    - Serve the conflicts summary from stored conflicts, hydrating only conflicting lessons.
+    - Serve counts, cursor pages and an NDJSON stream of stored conflicts, so large
+      results never have to be built in memory as a whole.
+
+    Detection rules are not duplicated here: the owning LessonService is used to turn
+    overlap clusters into conflicts, so the index and a full scan always agree.
+    """
+
+    def __init__(self, db: Session, lesson_service):
+        """
+        Initialize the LessonConflict service.
+
+        Args:
+            db (Session): Active SQLAlchemy session.
+            lesson_service (LessonService): Service providing conflict detection rules.
+        """
+        super().__init__(db, LessonConflict, LessonConflictRepository(db))
+        self.lesson_service = lesson_service
+        self.lesson_repo = LessonRepository(db)
+
+    def conflict_keys(self, lessons: Iterable[Lesson]) -> Set[ConflictKey]:
+        """
+        Collect the (date, type, resource) keys a set of lessons can take part in.
+
+        Args:
+            lessons (Iterable[Lesson]): Lessons that were (or are about to be) written.
+
+        Returns:
+            Set[ConflictKey]: Keys to pass to refresh().
+        """
+        keys: Set[ConflictKey] = set()
+        for lesson in lessons:
+            keys.add((lesson.date, "room", self.lesson_service._get_room_key(lesson)))
+            keys.add(
+                (
+                    lesson.date,
+                    "professor",
+                    self.lesson_service._get_professor_id(lesson),
+                )
+            )
+            keys.add((lesson.date, "group", self.lesson_service._get_group_key(lesson)))
+        return keys
+
+    def refresh(self, keys: Iterable[ConflictKey]) -> None:
+        """
+        Recompute stored conflicts for the given (date, type, resource) keys only.
+
+        For every affected date, lessons touching the affected rooms, professors or
+        groups are loaded, swept, and the stored conflicts of exactly those resources
+        are replaced.
+
+        The transaction is not committed: callers commit the refreshed conflicts
+        together with the lesson write they were computed for. The lesson version of
+        every affected date is bumped once that commit succeeds, which invalidates
+        cached conflict summaries and calendars covering those dates.
+
+        Args:
+            keys (Iterable[ConflictKey]): Keys collected via conflict_keys() before and after a write.
+        """
+        keys = list(keys)
+        mark_dates(
+            self.db, lesson_versions, (lesson_date for lesson_date, _, _ in keys)
+        )
+
+        resources_by_date: Dict[date, Dict[str, Set[int]]] = {}
+        for lesson_date, conflict_type, resource_id in keys:
+            if resource_id is None:
+                continue
+            resources = resources_by_date.setdefault(
+                lesson_date, {conflict_type: set() for conflict_type in CONFLICT_TYPES}
+            )
+            resources[conflict_type].add(resource_id)
+
+        if not resources_by_date:
+            return
+
+        # Occurrences of virtual templates of all affected dates, expanded at once
+        virtual_by_date: Dict[date, List] = {}
+        for lesson in self.lesson_service.virtual.expand_touching(
+            min(resources_by_date),
+            max(resources_by_date),
+            {
+                conflict_type: set().union(
+                    *(
+                        resources[conflict_type]
+                        for resources in resources_by_date.values()
+                    )
+                )
+                for conflict_type in CONFLICT_TYPES
+            },
+        ):
+            virtual_by_date.setdefault(lesson.date, []).append(lesson)
+
+        for lesson_date, resources in resources_by_date.items():
+            self._delete_conflicts(lesson_date, resources)
+
+            day_lessons = self._get_lessons_touching(
+                lesson_date, resources, virtual_by_date.get(lesson_date, [])
+            )
+            conflicts = self.lesson_service.find_conflicts_in_day(
+                day_lessons, self._restricted_keys(resources)
+            )
+            self._persist(conflicts)
+
+    def rebuild(self) -> int:
+        """
+        Drop all stored conflicts and recompute them from every lesson, occurrences
+        of virtual recurring templates included.
+
+        Used at startup and after writes that bypass LessonService (seeding, raw SQL).
+
+        Returns:
+            int: Number of stored conflicts after the rebuild.
+        """
+        self.db.query(LessonConflictMember).delete(synchronize_session=False)
+        self.db.query(LessonConflict).delete(synchronize_session=False)
+
+        lessons = sort_lessons(
+            self.lesson_repo.get_rows() + self.lesson_service.virtual.expand()
+        )
+        conflicts = self.lesson_service._find_all_conflicts(lessons)
+        self._persist(conflicts)
+
+        self.db.commit()
+        lesson_versions.bump_all()
+        return len(conflicts)
+
+    def get_summary(
+        self, params: ConflictQueryParams, shown_rows: Optional[Set[RowKey]] = None
+    ) -> ConflictsSummaryOut:
+        """
+        Build the conflicts summary from the stored index.
+
+        Only lessons that take part in a matching conflict are loaded and serialized.
+
+        Args:
+            params (ConflictQueryParams): Date range, conflict types and optional schedule filter.
+            shown_rows (Optional[Set[RowKey]]): If given, filled with the rows the summary
+                shows (see LessonService._group_conflicts_by_scope_and_type).
+
+        Returns:
+            ConflictsSummaryOut: Same structure as the full-scan summary.
+        """
+        scoped, _ = self._scoped_select(params)
+        stored = list(self.db.scalars(scoped))
+
+        return self.lesson_service._group_conflicts_by_scope_and_type(
+            list(self._to_raw(stored).values()), params.schedule_id, shown_rows
+        )
+
+    def get_counts(self, params: ConflictQueryParams) -> ConflictCountsOut:
+        """
+        Count stored conflicts by scope and type without loading any lessons.
+
+        Args:
+            params (ConflictQueryParams): Date range, conflict types and optional schedule filter.
+
+        Returns:
+            ConflictCountsOut: Per-type counters of both scopes and totals.
+        """
+        scoped, members = self._scoped_select(params)
+        shared = (members.c.schedule_count > 1).label("shared")
+        rows = self.db.execute(
+            scoped.with_only_columns(LessonConflict.type, shared, func.count())
+            .order_by(None)
+            .group_by(LessonConflict.type, shared)
+        ).all()
+
+        counts = {
+            scope: {conflict_type: 0 for conflict_type in CONFLICT_TYPES}
+            for scope in CONFLICT_SCOPES
+        }
+        for conflict_type, is_shared, count in rows:
+            counts["shared" if is_shared else "single"][conflict_type] = count
+
+        total_single = sum(counts["single"].values())
+        total_shared = sum(counts["shared"].values())
+        return ConflictCountsOut(
+            single=counts["single"],
+            shared=counts["shared"],
+            total_single=total_single,
+            total_shared=total_shared,
+            total_conflicts=total_single + total_shared,
+        )
+
+    def get_page(self, params: ConflictPageParams) -> ConflictPageOut:
+        """
+        Return one cursor page of stored conflicts of a single scope and type.
+
+        Pages are keyed on (date, start_time, id), the order of the full summary, so
+        concatenating all pages yields exactly the conflicts of the matching summary group.
+
+        Args:
+            params (ConflictPageParams): Scope, type, filters, cursor and page size.
+
+        Returns:
+            ConflictPageOut: Conflicts of the page and the cursor of the next one.
+        """
+        scoped, _ = self._scoped_select(
+            ConflictQueryParams(
+                date_from=params.date_from,
+                date_to=params.date_to,
+                conflict_types=[params.type.value],
+                schedule_id=params.schedule_id,
+            ),
+            scope=params.conflict_scope.value,
+        )
+        if params.cursor:
+            scoped = scoped.where(
+                tuple_(
+                    LessonConflict.date, LessonConflict.start_time, LessonConflict.id
+                )
+                > self._decode_cursor(params.cursor)
+            )
+
+        stored = list(self.db.scalars(scoped.limit(params.limit + 1)))
+        has_more = len(stored) > params.limit
+        stored = stored[: params.limit]
+
+        return ConflictPageOut(
+            conflict_scope=params.conflict_scope.value,
+            type=params.type.value,
+            conflicts=list(self._to_schemas(stored).values()),
+            next_cursor=self._encode_cursor(stored[-1]) if has_more else None,
+        )
+
+    def stream_summary(self, params: ConflictQueryParams) -> Iterator[str]:
+        """
+        Yield the conflicts summary as NDJSON lines, chunk by chunk.
+
+        Stored conflicts are read in (date, start_time) order in chunks of
+        STREAM_CHUNK_SIZE; every chunk is emitted as one ConflictGroupOut line per
+        scope and type present in it (count is the size of that line). The last line
+        is a ConflictCountsOut with the totals of everything emitted.
+
+        Args:
+            params (ConflictQueryParams): Date range, conflict types and optional schedule filter.
+
+        Yields:
+            str: One JSON document per line.
+        """
+        scoped, members = self._scoped_select(params)
+        scoped = scoped.add_columns(members.c.schedule_count)
+
+        counts = {
+            scope: {conflict_type: 0 for conflict_type in CONFLICT_TYPES}
+            for scope in CONFLICT_SCOPES
+        }
+        cursor = None
+        while True:
+            chunk_query = scoped
+            if cursor is not None:
+                chunk_query = chunk_query.where(
+                    tuple_(
+                        LessonConflict.date,
+                        LessonConflict.start_time,
+                        LessonConflict.id,
+                    )
+                    > cursor
+                )
+            rows = self.db.execute(chunk_query.limit(STREAM_CHUNK_SIZE)).all()
+            if not rows:
+                break
+
+            last = rows[-1][0]
+            cursor = (last.date, last.start_time, last.id)
+
+            schemas = self._to_schemas([conflict for conflict, _ in rows])
+            groups: Dict[Tuple[str, str], list] = {}
+            for conflict, schedule_count in rows:
+                if conflict.id not in schemas:
+                    continue
+                scope = "shared" if schedule_count > 1 else "single"
+                groups.setdefault((scope, conflict.type), []).append(
+                    schemas[conflict.id]
+                )
+
+            for (scope, conflict_type), conflicts in groups.items():
+                counts[scope][conflict_type] += len(conflicts)
+                group = ConflictGroupOut(
+                    type=conflict_type,
+                    conflict_scope=scope,
+                    conflicts=conflicts,
+                    count=len(conflicts),
+                )
+                yield group.model_dump_json() + "\n"
+
+            # Drop hydrated lessons of this chunk before loading the next one
+            self.db.expunge_all()
+
+        total_single = sum(counts["single"].values())
+        total_shared = sum(counts["shared"].values())
+        totals = ConflictCountsOut(
+            single=counts["single"],
+            shared=counts["shared"],
+            total_single=total_single,
+            total_shared=total_shared,
+            total_conflicts=total_single + total_shared,
+        )
+        yield totals.model_dump_json() + "\n"
+
+    def _scoped_select(self, params: ConflictQueryParams, scope: Optional[str] = None):
+        """
+        Select stored conflicts matching the filters, with their schedule statistics.
+
+        Scope and the schedule filter are resolved from member rows in SQL (distinct
+        schedules per conflict), so no lessons are needed to decide them. Only live
+        members count: lesson rows that still exist and occurrences of virtual
+        templates that still exist. Conflicts left with fewer than two of them (their
+        lessons were removed by a write that bypassed the index) are skipped.
+
+        Args:
+            params (ConflictQueryParams): Date range, conflict types and optional schedule filter.
+            scope (Optional[str]): "single" or "shared" to restrict to one scope.
+
+        Returns:
+            tuple: (select of LessonConflict ordered by date, start_time, id; members subquery
+            exposing schedule_count).
+        """
+        member_columns = [
+            LessonConflictMember.conflict_id,
+            func.count(distinct(LessonConflictMember.schedule_id)).label(
+                "schedule_count"
+            ),
+        ]
+        if params.schedule_id:
+            member_columns.append(
+                func.max(
+                    case(
+                        (LessonConflictMember.schedule_id == params.schedule_id, 1),
+                        else_=0,
+                    )
+                ).label("touches_schedule")
+            )
+        virtual_template = RecurringLessonTemplate.id == (
+            -LessonConflictMember.lesson_id // VIRTUAL_ID_FACTOR
+        )
+        members = (
+            select(*member_columns)
+            .outerjoin(Lesson, Lesson.id == LessonConflictMember.lesson_id)
+            .outerjoin(
+                RecurringLessonTemplate,
+                and_(
+                    LessonConflictMember.lesson_id < 0,
+                    virtual_template,
+                    RecurringLessonTemplate.is_virtual,
+                ),
+            )
+            .where(or_(Lesson.id.is_not(None), RecurringLessonTemplate.id.is_not(None)))
+            .group_by(LessonConflictMember.conflict_id)
+            .having(func.count() >= 2)
+            .subquery()
+        )
+
+        query = select(LessonConflict).join(
+            members, members.c.conflict_id == LessonConflict.id
+        )
+        if params.date_from:
+            query = query.where(LessonConflict.date >= params.date_from)
+        if params.date_to:
+            query = query.where(LessonConflict.date <= params.date_to)
+        if params.conflict_types:
+            query = query.where(LessonConflict.type.in_(params.conflict_types))
+        if params.schedule_id:
+            query = query.where(members.c.touches_schedule == 1)
+        if scope == "single":
+            query = query.where(members.c.schedule_count == 1)
+        elif scope == "shared":
+            query = query.where(members.c.schedule_count > 1)
+
+        query = query.order_by(
+            LessonConflict.date, LessonConflict.start_time, LessonConflict.id
+        )
+        return query, members
+
+    def _to_schemas(self, stored: List[LessonConflict]) -> Dict[int, ConflictOut]:
+        """
+        Hydrate the lessons of stored conflicts in one batch and convert them to ConflictOut.
+
+        Args:
+            stored (List[LessonConflict]): Stored conflicts.
+
+        Returns:
+            Dict[int, ConflictOut]: ConflictOut per live conflict ID, in the order of stored.
+        """
+        return {
+            conflict_id: self.lesson_service._conflict_to_schema(conflict)
+            for conflict_id, conflict in self._to_raw(stored).items()
+        }
+
+    def _to_raw(self, stored: List[LessonConflict]) -> Dict[int, Dict]:
+        """
+        Turn stored conflicts into raw conflict dicts with hydrated lessons.
+
+        Messages are built here rather than stored, so renamed rooms, groups and
+        professors show up without recomputing the index. Conflicts of which fewer
+        than two lessons still exist are left out, like in _scoped_select().
+
+        Args:
+            stored (List[LessonConflict]): Stored conflicts.
+
+        Returns:
+            Dict[int, Dict]: Raw conflict dicts as produced by LessonService finders
+                per conflict ID, in the order of stored.
+        """
+        lessons_by_id = self._hydrate(
+            lesson_id for conflict in stored for lesson_id in conflict.lesson_ids
+        )
+        names = self._resource_names(stored)
+
+        raw = {}
+        for conflict in stored:
+            lessons = [
+                lessons_by_id[lesson_id]
+                for lesson_id in conflict.lesson_ids
+                if lesson_id in lessons_by_id
+            ]
+            if len(lessons) < 2:
+                continue
+            raw[conflict.id] = {
+                "type": conflict.type,
+                "message": self.lesson_service._conflict_message(
+                    conflict.type,
+                    names.get(
+                        (conflict.type, conflict.resource_id),
+                        f"{conflict.type.capitalize()} {conflict.resource_id}",
+                    ),
+                    f"{conflict.start_time}-{conflict.end_time}",
+                ),
+                "severity": conflict.severity,
+                "lessons": lessons,
+            }
+        return raw
+
+    def _resource_names(
+        self, stored: List[LessonConflict]
+    ) -> Dict[Tuple[str, int], str]:
+        """
+        Load the current names of the rooms, professors and groups of stored conflicts.
+
+        Args:
+            stored (List[LessonConflict]): Stored conflicts.
+
+        Returns:
+            Dict[Tuple[str, int], str]: (conflict type, resource ID) -> room number,
+                professor full name or group name.
+        """
+        resource_ids: Dict[str, Set[int]] = {
+            conflict_type: set() for conflict_type in CONFLICT_TYPES
+        }
+        for conflict in stored:
+            resource_ids[conflict.type].add(conflict.resource_id)
+
+        names: Dict[Tuple[str, int], str] = {}
+        if resource_ids["room"]:
+            for room_id, number in self.db.execute(
+                select(Room.id, Room.number).where(Room.id.in_(resource_ids["room"]))
+            ):
+                names[("room", room_id)] = number
+        if resource_ids["professor"]:
+            for user_id, name, surname in self.db.execute(
+                select(User.id, User.name, User.surname).where(
+                    User.id.in_(resource_ids["professor"])
+                )
+            ):
+                names[("professor", user_id)] = f"{name} {surname}"
+        if resource_ids["group"]:
+            for group_id, name in self.db.execute(
+                select(Group.id, Group.name).where(Group.id.in_(resource_ids["group"]))
+            ):
+                names[("group", group_id)] = name
+        return names
+
+    @staticmethod
+    def _encode_cursor(conflict: LessonConflict) -> str:
+        raw = json.dumps(
+            [conflict.date.isoformat(), conflict.start_time.isoformat(), conflict.id]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[date, time, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            lesson_date, start_time, conflict_id = json.loads(
+                base64.urlsafe_b64decode(padded)
+            )
+            return (
+                date.fromisoformat(lesson_date),
+                time.fromisoformat(start_time),
+                int(conflict_id),
+            )
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    def _delete_conflicts(self, lesson_date: date, resources: Dict[str, Set[int]]):
+        """
+        Delete stored conflicts of the given resources on one date.
+
+        Args:
+            lesson_date (date): Affected date.
+            resources (Dict[str, Set[int]]): Conflict type -> affected resource IDs.
+        """
+        conditions = [
+            and_(
+                LessonConflict.type == conflict_type,
+                LessonConflict.resource_id.in_(resource_ids),
+            )
+            for conflict_type, resource_ids in resources.items()
+            if resource_ids
+        ]
+
+        stale_ids = list(
+            self.db.execute(
+                select(LessonConflict.id).where(
+                    LessonConflict.date == lesson_date, or_(*conditions)
+                )
+            ).scalars()
+        )
+        if not stale_ids:
+            return
+
+        self.db.query(LessonConflictMember).filter(
+            LessonConflictMember.conflict_id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        self.db.query(LessonConflict).filter(LessonConflict.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+
+    def _hydrate(self, lesson_ids: Iterable[int]) -> Dict[int, Lesson]:
+        """
+        Load full lessons and virtual occurrences for stored member IDs.
+
+        Args:
+            lesson_ids (Iterable[int]): Member lesson IDs (negative for virtual occurrences).
+
+        Returns:
+            Dict[int, Lesson]: Lessons and occurrences keyed by ID.
+        """
+        lesson_ids = set(lesson_ids)
+        return {
+            **self.lesson_repo.hydrate(
+                lesson_id for lesson_id in lesson_ids if lesson_id >= 0
+            ),
+            **self.lesson_service.virtual.hydrate(lesson_ids),
+        }
+
+    def _get_lessons_touching(
+        self,
+        lesson_date: date,
+        resources: Dict[str, Set[int]],
+        virtual: Iterable = (),
+    ) -> List[LessonRow]:
+        """
+        Load lessons on a date that use any of the affected rooms, professors or groups.
+
+        Args:
+            lesson_date (date): Affected date.
+            resources (Dict[str, Set[int]]): Conflict type -> affected resource IDs.
+            virtual (Iterable[VirtualLesson]): Occurrences of virtual recurring templates
+                on the date; ones using none of the resources are ignored by the
+                restricted sweep keys.
+
+        Returns:
+            List[LessonRow]: Column projections of the lessons (no ORM hydration) and
+                the virtual occurrences.
+        """
+        conditions = []
+        if resources["room"]:
+            conditions.append(Lesson.room_id.in_(resources["room"]))
+        if resources["group"]:
+            conditions.append(Lesson.group_id.in_(resources["group"]))
+        if resources["professor"]:
+            conditions.append(Lesson.professor_user_id.in_(resources["professor"]))
+
+        return sort_lessons(
+            self.lesson_repo.get_rows(Lesson.date == lesson_date, or_(*conditions))
+            + list(virtual)
+        )
+
+    def _restricted_keys(
+        self, resources: Dict[str, Set[int]]
+    ) -> Dict[str, Callable[[Lesson], Optional[int]]]:
+        """
+        Build sweep key functions that only report the affected resources.
+
+        Lessons loaded for one resource may touch other resources whose lessons were
+        not loaded; those must not be re-evaluated from partial data.
+
+        Args:
+            resources (Dict[str, Set[int]]): Conflict type -> affected resource IDs.
+
+        Returns:
+            Dict[str, Callable]: Conflict type -> key function returning None for unaffected resources.
+        """
+        key_funcs = {
+            "room": self.lesson_service._get_room_key,
+            "professor": self.lesson_service._get_professor_id,
+            "group": self.lesson_service._get_group_key,
+        }
+
+        def restrict(key_func, allowed):
+            def key(lesson):
+                resource_id = key_func(lesson)
+                return resource_id if resource_id in allowed else None
+
+            return key
+
+        return {
+            conflict_type: restrict(key_funcs[conflict_type], resource_ids)
+            for conflict_type, resource_ids in resources.items()
+            if resource_ids
+        }
+
+    def _persist(self, conflicts: List[Dict]) -> None:
+        """
+        Insert conflict rows and their members (not committed).
+
+        Each conflict is inserted on its own to get its ID back; all members are
+        then written with a single executemany INSERT.
+
+        Args:
+            conflicts (List[Dict]): Raw conflict dicts produced by LessonService finders.
+        """
+        members = []
+        for conflict in conflicts:
+            lessons = conflict["lessons"]
+            conflict_id = self.db.scalar(
+                insert(LessonConflict).returning(LessonConflict.id),
+                {
+                    "type": conflict["type"],
+                    "date": lessons[0].date,
+                    "resource_id": conflict["resource_id"],
+                    "start_time": lessons[0].start_time,
+                    "end_time": max(lesson.end_time for lesson in lessons),
+                    "severity": conflict["severity"],
+                },
+            )
+            members.extend(
+                {
+                    "conflict_id": conflict_id,
+                    "lesson_id": lesson.id,
+                    "schedule_id": lesson.schedule_id,
+                }
+                for lesson in lessons
+            )
+
+        if members:
+            self.db.execute(insert(LessonConflictMember), members)
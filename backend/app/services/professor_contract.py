@@ -1,11 +1,13 @@
+from typing import Any
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from ..repositories import ProfessorContractRepository
+from ..repositories import ProfessorContractRepository, SubjectAssignmentRepository
 from ..models import ProfessorContract, ProfessorProfile, User, Semester
 from ..schemas.professor_contract import ProfessorContractIn
 from ..schemas.minis import ProfessorMiniOut
 from .base import BaseService
+from .lesson import LessonService
 
 
 class ProfessorContractService(BaseService[ProfessorContract, ProfessorContractIn]):
@@ -15,6 +17,7 @@ class ProfessorContractService(BaseService[ProfessorContract, ProfessorContractI
     Responsibilities:
     - List and filter professor contracts by professor identity and semester context.
     - Delegate CRUD operations to ProfessorContractRepository via BaseService.
+    - Re-sync lesson/template professors when a contract changes hands.
     """
 
     def __init__(self, db: Session):
@@ -26,6 +29,28 @@ class ProfessorContractService(BaseService[ProfessorContract, ProfessorContractI
         """
         super().__init__(db, ProfessorContract, ProfessorContractRepository(db))
 
+    def update(self, obj_id: int, obj_in: Any) -> ProfessorContract:
+        """
+        Update a contract; if it is reassigned to another professor, propagate the
+        change to the denormalized professor_user_id of lessons and templates.
+
+        Args:
+            obj_id (int): Identifier of the contract to update.
+            obj_in (Any): ProfessorContractIn/ProfessorContractUpdate payload or plain dict.
+
+        Returns:
+            ProfessorContract: The updated contract.
+        """
+        previous_professor_id = self.get_by_id(obj_id).professor_profile_id
+        updated = super().update(obj_id, obj_in)
+
+        if updated.professor_profile_id != previous_professor_id:
+            LessonService(self.db).sync_professor_assignments(
+                SubjectAssignmentRepository(self.db).ids_for_contracts([updated.id])
+            )
+
+        return updated
+
     def apply_filters(self, query, params):
         """
         Apply filters to the professor contracts query.
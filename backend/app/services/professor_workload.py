@@ -1,12 +1,16 @@
 from fastapi import HTTPException, status
 
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from datetime import datetime, timedelta
 
 from ..models.direction import Direction
 from ..models.study_form import StudyForm
-from ..repositories import ProfessorWorkloadRepository
+from ..repositories import (
+    ProfessorWorkloadRepository,
+    LessonRepository,
+    SubjectAssignmentRepository,
+)
 from ..models import (
     ProfessorWorkload,
     ProfessorContract,
@@ -27,6 +31,7 @@ from ..schemas.professor_workload import (
 )
 from ..schemas.lesson import LessonOut
 from .base import BaseService
+from .lesson import LessonService
 
 
 class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadIn]):
@@ -47,6 +52,7 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
             db (Session): Active SQLAlchemy session.
         """
         super().__init__(db, ProfessorWorkload, ProfessorWorkloadRepository(db))
+        self.lesson_repo = LessonRepository(db)
 
     def check_workload_hours(
         self,
@@ -140,6 +146,9 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
         """
         Update an existing professor workload after validation.
 
+        Moving the workload to another contract may change the professor of its
+        assignments; lessons and templates are then re-synced.
+
         Args:
             workload_id (int): Identifier of the workload to update.
             workload (ProfessorWorkloadIn | ProfessorWorkloadUpdate): New values to apply.
@@ -153,7 +162,15 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
         # Validate assigned hours vs contract capacity for update
         self.check_workload_hours(workload, workload_id)
 
-        return super().update(workload_id, workload)
+        previous_contract_id = self.get_by_id(workload_id).contract_id
+        updated = super().update(workload_id, workload)
+
+        if updated.contract_id != previous_contract_id:
+            LessonService(self.db).sync_professor_assignments(
+                SubjectAssignmentRepository(self.db).ids_for_workloads([updated.id])
+            )
+
+        return updated
 
     def apply_filters(self, query, params):
         """
@@ -211,22 +228,38 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
 
         return super().apply_filters(query, params)
 
-    def get_local_workload_warnings(self, schedule_id: int) -> WorkloadSummaryOut:
+    def get_local_workload_warnings(
+        self, schedule_id: int, rows: list | None = None
+    ) -> WorkloadSummaryOut:
         """
         Analyze a single schedule for subject assignments that exceeded allocated hours.
 
         Strategy:
-        - Load subject assignments that have lessons in the given schedule (with eager loading).
+        - Load the schedule's lessons as column projections (no ORM hydration).
         - For each assignment, compute scheduled hours from lessons of this schedule only.
-        - Produce LocalWorkloadWarningOut entries when scheduled > allowed (hours_per_subject).
+        - Produce LocalWorkloadWarningOut entries when scheduled > allowed (hours_per_subject);
+          full lessons are loaded only for the assignments that get a warning.
 
         Args:
             schedule_id (int): Target schedule ID to analyze.
+            rows (list[LessonRow] | None): Preloaded lesson projections of the schedule.
 
         Returns:
             WorkloadSummaryOut: List of local warnings and total count scoped to the schedule.
         """
-        # Получаем все subject_assignments для данного расписания с уроками
+        if rows is None:
+            rows = self.lesson_repo.get_rows(Lesson.schedule_id == schedule_id)
+
+        # Группируем уроки расписания по subject_assignment
+        rows_by_assignment: dict[int, list] = {}
+        for row in rows:
+            rows_by_assignment.setdefault(row.subject_assignment_id, []).append(row)
+
+        if not rows_by_assignment:
+            return WorkloadSummaryOut(
+                warnings=[], total_warnings=0, schedule_id=schedule_id
+            )
+
         assignments = (
             self.db.query(SubjectAssignment)
             .options(
@@ -235,37 +268,34 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
                 .selectinload(ProfessorWorkload.contract)
                 .selectinload(ProfessorContract.professor_profile)
                 .selectinload(ProfessorProfile.user),
-                selectinload(SubjectAssignment.lessons),
             )
-            .join(Lesson)
-            .filter(Lesson.schedule_id == schedule_id)
-            .distinct()
+            .filter(SubjectAssignment.id.in_(rows_by_assignment))
+            .order_by(SubjectAssignment.id)
             .all()
         )
 
-        warnings = []
-
+        exceeded = []
         for assignment in assignments:
-            # Фильтруем уроки только для данного расписания
-            schedule_lessons = [
-                lesson
-                for lesson in assignment.lessons
-                if lesson.schedule_id == schedule_id
-            ]
-
-            if not schedule_lessons:
-                continue
-
             # Считаем часы
-            scheduled_hours = self._calculate_lesson_hours(schedule_lessons)
+            schedule_rows = rows_by_assignment[assignment.id]
+            scheduled_hours = self._calculate_lesson_hours(schedule_rows)
 
             # Проверяем превышение
             if scheduled_hours > assignment.hours_per_subject:
-                warnings.append(
-                    self._create_local_warning(
-                        assignment, schedule_lessons, scheduled_hours
-                    )
-                )
+                exceeded.append((assignment, schedule_rows, scheduled_hours))
+
+        lessons_by_id = self.lesson_repo.hydrate(
+            row.id for _, schedule_rows, _ in exceeded for row in schedule_rows
+        )
+
+        warnings = [
+            self._create_local_warning(
+                assignment,
+                [lessons_by_id[row.id] for row in schedule_rows],
+                scheduled_hours,
+            )
+            for assignment, schedule_rows, scheduled_hours in exceeded
+        ]
 
         return WorkloadSummaryOut(
             warnings=warnings, total_warnings=len(warnings), schedule_id=schedule_id
@@ -279,7 +309,7 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
         If end time is past midnight relative to start time, adjust by adding a day.
 
         Args:
-            lessons (Iterable[Lesson]): Lessons to include in the calculation.
+            lessons (Iterable[Lesson | LessonRow]): Lessons to include in the calculation.
 
         Returns:
             float: Total hours computed as the sum of durations.
@@ -344,11 +374,14 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
         Returns:
             CombinedWarningsSummaryOut: Combined warnings for professors and subjects.
         """
+        # Both analyses share one projection load of the schedule's lessons
+        rows = self.lesson_repo.get_rows(Lesson.schedule_id == schedule_id)
+
         # Get professor workload warnings
-        professor_summary = self.get_local_workload_warnings(schedule_id)
+        professor_summary = self.get_local_workload_warnings(schedule_id, rows)
 
         # Get subject hours warnings
-        subject_warnings = self._get_subject_hours_warnings(schedule_id)
+        subject_warnings = self._get_subject_hours_warnings(schedule_id, rows)
 
         return CombinedWarningsSummaryOut(
             professor_warnings=professor_summary.warnings,
@@ -359,74 +392,84 @@ class ProfessorWorkloadService(BaseService[ProfessorWorkload, ProfessorWorkloadI
         )
 
     def _get_subject_hours_warnings(
-        self, schedule_id: int
+        self, schedule_id: int, rows: list | None = None
     ) -> list[SubjectHoursWarningOut]:
         """
         Analyze subjects in a schedule for hours exceeding allocated_hours.
 
         Strategy:
-        - Load all subjects that have lessons in the given schedule.
+        - Load the schedule's lessons as column projections and map assignments to subjects.
         - For each subject, compute total scheduled hours across all its assignments/lessons.
-        - Produce SubjectHoursWarningOut entries when scheduled > allocated_hours.
+        - Produce SubjectHoursWarningOut entries when scheduled > allocated_hours;
+          full lessons are loaded only for the subjects that get a warning.
 
         Args:
             schedule_id (int): Target schedule ID to analyze.
+            rows (list[LessonRow] | None): Preloaded lesson projections of the schedule.
 
         Returns:
             list[SubjectHoursWarningOut]: List of subject warnings.
         """
-        # Get all subjects with lessons in this schedule
+        if rows is None:
+            rows = self.lesson_repo.get_rows(Lesson.schedule_id == schedule_id)
+
+        assignment_ids = {row.subject_assignment_id for row in rows}
+        if not assignment_ids:
+            return []
+
+        subject_by_assignment = dict(
+            self.db.execute(
+                select(SubjectAssignment.id, SubjectAssignment.subject_id).where(
+                    SubjectAssignment.id.in_(assignment_ids)
+                )
+            ).all()
+        )
+
+        # Collect all lessons for each subject in this schedule
+        rows_by_subject: dict[int, list] = {}
+        for row in rows:
+            subject_id = subject_by_assignment.get(row.subject_assignment_id)
+            if subject_id is not None:
+                rows_by_subject.setdefault(subject_id, []).append(row)
+
         subjects = (
             self.db.query(Subject)
-            .join(SubjectAssignment)
-            .join(Lesson)
-            .filter(Lesson.schedule_id == schedule_id)
-            .options(
-                selectinload(Subject.subject_assignments).selectinload(
-                    SubjectAssignment.lessons
-                )
-            )
-            .distinct()
+            .filter(Subject.id.in_(rows_by_subject))
+            .order_by(Subject.id)
             .all()
         )
 
-        warnings = []
-
+        exceeded = []
         for subject in subjects:
-            # Collect all lessons for this subject in this schedule
-            all_lessons = []
-            for assignment in subject.subject_assignments:
-                schedule_lessons = [
-                    lesson
-                    for lesson in assignment.lessons
-                    if lesson.schedule_id == schedule_id
-                ]
-                all_lessons.extend(schedule_lessons)
-
-            if not all_lessons:
-                continue
+            subject_rows = rows_by_subject[subject.id]
 
             # Calculate total scheduled hours
-            scheduled_hours = self._calculate_lesson_hours(all_lessons)
+            scheduled_hours = self._calculate_lesson_hours(subject_rows)
 
             # Check if exceeds allocated hours
             if (
                 subject.allocated_hours > 0
                 and scheduled_hours > subject.allocated_hours
             ):
-                warnings.append(
-                    SubjectHoursWarningOut(
-                        type="subject_exceeded",
-                        subject_id=subject.id,
-                        subject_name=subject.name,
-                        subject_code=subject.code,
-                        scheduled_hours=scheduled_hours,
-                        allocated_hours=float(subject.allocated_hours),
-                        excess_hours=scheduled_hours - subject.allocated_hours,
-                        lessons=[
-                            LessonOut.model_validate(lesson) for lesson in all_lessons
-                        ],
-                    )
-                )
+                exceeded.append((subject, subject_rows, scheduled_hours))
+
+        lessons_by_id = self.lesson_repo.hydrate(
+            row.id for _, subject_rows, _ in exceeded for row in subject_rows
+        )
 
-        return warnings
+        return [
+            SubjectHoursWarningOut(
+                type="subject_exceeded",
+                subject_id=subject.id,
+                subject_name=subject.name,
+                subject_code=subject.code,
+                scheduled_hours=scheduled_hours,
+                allocated_hours=float(subject.allocated_hours),
+                excess_hours=scheduled_hours - subject.allocated_hours,
+                lessons=[
+                    LessonOut.model_validate(lessons_by_id[row.id])
+                    for row in subject_rows
+                ],
+            )
+            for subject, subject_rows, scheduled_hours in exceeded
+        ]
@@ -1,16 +1,80 @@
+from fastapi import HTTPException, status
+from sqlalchemy import delete, or_, update
 from sqlalchemy.orm import Session
-from datetime import date, datetime, timedelta
-from typing import List
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Sequence, Set
 
-from ..repositories import RecurringLessonTemplateRepository
-from ..models import RecurringLessonTemplate, Lesson, UniversityHoliday
+from ..repositories import (
+    RecurringLessonExceptionRepository,
+    RecurringLessonTemplateRepository,
+    SubjectAssignmentRepository,
+)
+from ..models import (
+    RecurringLessonException,
+    RecurringLessonTemplate,
+    Lesson,
+    Group,
+    Room,
+    Schedule,
+    SubjectAssignment,
+    UniversityHoliday,
+    User,
+)
 from ..schemas.recurring_template import (
+    RecurringLessonExceptionIn,
     RecurringLessonTemplateIn,
     RecurringLessonTemplateUpdate,
+    RecurringLessonTemplateConflictParams,
+    RecurringLessonTemplateConflictCheckOut,
+    RecurringLessonTemplateImportIn,
+    RecurringLessonTemplateImportResultOut,
+    RecurringLessonTemplatePreviewOut,
+    LessonPropagationOut,
+    TemplateConflictOut,
+    TemplateImportConflictOut,
+    TemplateImportErrorOut,
+)
+from ..schemas.university_holiday import (
+    UniversityHolidayIn,
+    UniversityHolidayOut,
+    UniversityHolidayUpdate,
+)
+from ..config import setting
+from ..database import SessionLocal
+from ..utils.background_jobs import Job, JobRegistry, submit_job
+from ..utils.conflict_detection import is_professor_conflict, is_room_conflict
+from ..utils.enums import JobStatusEnum
+from ..utils.recurrence import (
+    RecurrenceRule,
+    format_weekdays,
+    parse_unavailable_days,
+    shared_occurrences,
+    template_rule,
+    virtual_lesson_id,
+    weekday_mask,
 )
 from .base import BaseService
 from .lesson import LessonService
+from .professor_workload import ProfessorWorkloadService
 from .university_holiday import UniversityHolidayService
+from .virtual_lesson import VirtualLesson
+
+# Process-wide: import jobs queued by start_import() and polled by get_import_job()
+import_jobs = JobRegistry()
+
+# Lesson columns copied from the template to every generated lesson; a lesson whose
+# values differ from its template's was edited by hand and is left alone on updates
+GENERATED_FIELDS = (
+    "schedule_id",
+    "group_id",
+    "subject_assignment_id",
+    "room_id",
+    "lesson_type",
+    "is_online",
+    "start_time",
+    "end_time",
+)
 
 
 class RecurringLessonTemplateService(
@@ -22,6 +86,10 @@ class RecurringLessonTemplateService(
         )
         self.lesson_service = LessonService(db)
         self.holiday_service = UniversityHolidayService(db)
+        self.exception_repo = RecurringLessonExceptionRepository(db)
+        # Unavailable days memoized for the lifetime of the service (one request),
+        # shared by date calculation, previews and conflict checks
+        self._unavailable_days: Dict[int, set[int] | None] = {}
 
     def apply_filters(self, query, params):
         """
@@ -60,121 +128,1373 @@ class RecurringLessonTemplateService(
 
         template = super().create(template_data)
 
-        # Генерируем уроки
-        self._generate_lessons_from_template(template)
+        if template.is_virtual:
+            # Виртуальный шаблон: уроки не создаются, только пересчитываются конфликты
+            self._refresh_virtual_conflicts(template)
+        else:
+            # Генерируем уроки
+            self._generate_lessons_from_template(template)
 
         return template
 
     def update(
         self, id: int, data: RecurringLessonTemplateUpdate
     ) -> RecurringLessonTemplate:
-        """Переопределенный метод обновления - обновляем шаблон и пересоздаем уроки"""
+        """Переопределенный метод обновления - обновляем шаблон и синхронизируем будущие уроки"""
 
-        # Обновляем шаблон
+        template = self.get_by_id(id)
         template_data = data.model_dump(exclude_unset=True)
-        template = super().update(id, template_data)
+        if template_data.get("is_virtual", template.is_virtual) != template.is_virtual:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="is_virtual cannot be changed after the template is created",
+            )
 
-        # Удаляем старые будущие уроки
-        self._delete_future_lessons_by_template(id)
+        if template.is_virtual:
+            # Виртуальный шаблон: уроки не хранятся, переписывать нечего
+            keys = self._virtual_conflict_keys(template)
+            template = super().update(id, template_data)
+            self._refresh_virtual_conflicts(template, keys)
+            return template
 
-        # Генерируем новые уроки
-        self._generate_lessons_from_template(template)
+        old = self._snapshot(template)
+
+        # Обновляем шаблон
+        template = super().update(id, template_data)
+
+        # Обновляем только изменившиеся будущие уроки
+        self._regenerate_lessons(template, old)
 
         return template
 
-    def delete(self, id: int) -> bool:
+    def delete(self, id: int) -> None:
         """Переопределенный метод удаления - удаляем шаблон (уроки удаляются автоматически)"""
-        # Удаляем будущие уроки (на всякий случай)
-        self._delete_future_lessons_by_template(id)
+        template = self.get_by_id(id)
+        if template.is_virtual:
+            # Исключения удаляются вместе с шаблоном
+            keys = self._virtual_conflict_keys(template)
+        else:
+            # Keys of all lessons of the template, removed below
+            keys = self.lesson_service.conflict_index.conflict_keys(
+                self.db.query(Lesson).filter(Lesson.recurring_template_id == id).all()
+            )
+
+            # Удаляем будущие уроки (на всякий случай)
+            self._delete_future_lessons_by_template(id)
+
+        # Удаляем шаблон (остальные уроки удаляются по CASCADE) и пересчитываем
+        # конфликты в той же транзакции
+        self.db.delete(template)
+        self.db.flush()
+        self.lesson_service.conflict_index.refresh(keys)
+        self.db.commit()
+
+    def preview_create(
+        self, data: RecurringLessonTemplateIn
+    ) -> RecurringLessonTemplatePreviewOut:
+        """
+        Preview the lessons a new template would generate, without writing anything.
+
+        Args:
+            data (RecurringLessonTemplateIn): Template as it would be created.
+
+        Returns:
+            RecurringLessonTemplatePreviewOut: Dates, hours and conflicts of the template.
+        """
+        candidate = self._build_candidate(data)
+        return self._preview(
+            candidate,
+            replaced_lesson_ids=set(),
+            lesson_dates=self._calculate_lesson_dates(candidate),
+        )
+
+    def preview_update(
+        self, id: int, data: RecurringLessonTemplateUpdate
+    ) -> RecurringLessonTemplatePreviewOut:
+        """
+        Preview the lessons a template would generate after an update, without writing anything.
+
+        Mirrors update(): the dates are those of the future lessons the template would
+        have afterwards (moved in place or inserted); past and hand-edited lessons of
+        the template are counted as existing lessons.
+
+        Args:
+            id (int): Template to update.
+            data (RecurringLessonTemplateUpdate): Fields to change.
+
+        Returns:
+            RecurringLessonTemplatePreviewOut: Dates, hours and conflicts of the updated template.
+        """
+        template = self.get_by_id(id)
+        old = self._snapshot(template)
+        candidate = self._snapshot(template)
+        for field, value in data.model_dump(exclude_unset=True).items():
+            setattr(candidate, field, value)
+        # Recompile the weekday mask the snapshot carries, as saving would
+        candidate.weekday_mask = weekday_mask(candidate.days_of_week)
+
+        if template.is_virtual:
+            # No lesson rows to replace; the occurrences follow the new pattern
+            return self._preview(
+                candidate,
+                replaced_lesson_ids=set(),
+                lesson_dates=self._calculate_lesson_dates(candidate),
+            )
+
+        kept, deleted, insert_dates = self._plan_regeneration(id, old, candidate)
+        return self._preview(
+            candidate,
+            replaced_lesson_ids={lesson.id for lesson in kept + deleted},
+            lesson_dates=sorted([lesson.date for lesson in kept] + insert_dates),
+        )
+
+    def _preview(
+        self, template, replaced_lesson_ids: set[int], lesson_dates: List[date]
+    ) -> RecurringLessonTemplatePreviewOut:
+        """
+        Compute what writing lessons of a template on the given dates would produce.
+
+        Args:
+            template (SimpleNamespace): Candidate template.
+            replaced_lesson_ids (set[int]): Existing lessons the write would move or delete.
+            lesson_dates (List[date]): Dates the template's written lessons would be on, in order.
+
+        Returns:
+            RecurringLessonTemplatePreviewOut: Dates, hours and conflicts.
+        """
+        occurrences = [
+            self._build_occurrence(template, lesson_date)
+            for lesson_date in lesson_dates
+        ]
+
+        # Hours of the assignment in this schedule once the template is written
+        workload_service = ProfessorWorkloadService(self.db)
+        lesson_hours = workload_service._calculate_lesson_hours(occurrences)
+        existing_rows = [
+            row
+            for row in self.lesson_service.repo.get_rows(
+                Lesson.schedule_id == template.schedule_id,
+                Lesson.subject_assignment_id == template.subject_assignment_id,
+            )
+            if row.id not in replaced_lesson_ids
+        ]
+        scheduled_hours = (
+            workload_service._calculate_lesson_hours(existing_rows) + lesson_hours
+        )
+        allowed_hours = template.subject_assignment.hours_per_subject
+
+        conflicts = []
+        if lesson_dates:
+            lessons_by_date: Dict[date, List[Lesson]] = {}
+            for lesson in self.lesson_service.repo.find_overlapping_between(
+                lesson_dates[0],
+                lesson_dates[-1],
+                template.start_time,
+                template.end_time,
+                room_id=self.lesson_service._get_room_key(template),
+                group_id=self.lesson_service._get_group_key(template),
+                professor_user_id=self.lesson_service._get_professor_id(template),
+            ):
+                if lesson.id not in replaced_lesson_ids:
+                    lessons_by_date.setdefault(lesson.date, []).append(lesson)
 
-        # Удаляем шаблон (остальные уроки удаляются по CASCADE)
-        return super().delete(id)
+            for occurrence in occurrences:
+                lessons = lessons_by_date.get(occurrence.date)
+                if lessons:
+                    conflicts.extend(
+                        self.lesson_service.candidate_conflicts(occurrence, lessons)
+                    )
+
+        return RecurringLessonTemplatePreviewOut(
+            dates=lesson_dates,
+            lessons_count=len(lesson_dates),
+            lesson_hours=lesson_hours,
+            scheduled_hours=scheduled_hours,
+            allowed_hours=allowed_hours,
+            excess_hours=max(scheduled_hours - allowed_hours, 0),
+            conflicts=conflicts,
+            count=len(conflicts),
+        )
+
+    def get_exceptions(self, id: int) -> List[RecurringLessonException]:
+        """
+        List the exceptions of a virtual template.
+
+        Args:
+            id (int): Virtual template.
+
+        Returns:
+            List[RecurringLessonException]: Exceptions ordered by occurrence date.
+        """
+        self._get_virtual(id)
+        return (
+            self.exception_repo.query()
+            .filter(RecurringLessonException.template_id == id)
+            .order_by(RecurringLessonException.occurrence_date)
+            .all()
+        )
+
+    def set_exception(
+        self, id: int, occurrence_date: date, data: RecurringLessonExceptionIn
+    ) -> RecurringLessonException:
+        """
+        Cancel, move or override one occurrence of a virtual template.
+
+        Replaces the occurrence's previous exception, if any, and rechecks conflicts
+        at both its previous and new placement.
+
+        Args:
+            id (int): Virtual template.
+            occurrence_date (date): Date of the occurrence in the template's pattern.
+            data (RecurringLessonExceptionIn): Cancellation flag and overridden values.
+
+        Returns:
+            RecurringLessonException: The stored exception.
+
+        Raises:
+            HTTPException: 400 for non-virtual templates or an empty time window,
+                404 if the pattern has no occurrence on occurrence_date.
+        """
+        template = self._get_virtual(id)
+        self._check_occurrence(template, occurrence_date)
+
+        start_time = data.start_time or template.start_time
+        end_time = data.end_time or template.end_time
+        if start_time >= end_time:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_time must be before end_time",
+            )
+
+        keys = self._occurrence_conflict_keys(id, occurrence_date)
+
+        exception = self.exception_repo.get_for_occurrence(id, occurrence_date)
+        if exception:
+            exception = self.exception_repo.update(exception, data.model_dump())
+        else:
+            exception = self.exception_repo.create(
+                {
+                    **data.model_dump(),
+                    "template_id": id,
+                    "occurrence_date": occurrence_date,
+                }
+            )
+
+        keys |= self._occurrence_conflict_keys(id, occurrence_date)
+        self.lesson_service.conflict_index.refresh(keys)
+        self.db.commit()
+        return exception
+
+    def delete_exception(self, id: int, occurrence_date: date) -> None:
+        """
+        Restore one occurrence of a virtual template to its pattern.
+
+        Args:
+            id (int): Virtual template.
+            occurrence_date (date): Date of the occurrence in the template's pattern.
+
+        Raises:
+            HTTPException: 400 for non-virtual templates, 404 if the occurrence has no exception.
+        """
+        self._get_virtual(id)
+        exception = self.exception_repo.get_for_occurrence(id, occurrence_date)
+        if not exception:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No exception for occurrence {occurrence_date} of template {id}",
+            )
+
+        keys = self._occurrence_conflict_keys(id, occurrence_date)
+        self.exception_repo.delete_instance(exception)
+        keys |= self._occurrence_conflict_keys(id, occurrence_date)
+        self.lesson_service.conflict_index.refresh(keys)
+        self.db.commit()
+
+    def _get_virtual(self, id: int) -> RecurringLessonTemplate:
+        """Получаем виртуальный шаблон (400 для обычных шаблонов)"""
+        template = self.get_by_id(id)
+        if not template.is_virtual:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Template {id} is not virtual; edit its lessons instead",
+            )
+        return template
+
+    def _check_occurrence(
+        self, template: RecurringLessonTemplate, occurrence_date: date
+    ) -> None:
+        """Проверяем, что у шаблона есть занятие в эту дату"""
+        if not self.lesson_service.virtual.occurs_on(template, occurrence_date):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Template {template.id} has no occurrence on {occurrence_date}",
+            )
+
+    def _occurrence_conflict_keys(self, template_id: int, occurrence_date: date):
+        """Ключи конфликтов одного виртуального занятия (в текущем состоянии)"""
+        return self.lesson_service.conflict_index.conflict_keys(
+            self.lesson_service.virtual.hydrate(
+                [virtual_lesson_id(template_id, occurrence_date)]
+            ).values()
+        )
+
+    def _virtual_conflict_keys(self, template: RecurringLessonTemplate):
+        """Ключи конфликтов всех занятий виртуального шаблона"""
+        return self.lesson_service.conflict_index.conflict_keys(
+            self.lesson_service.virtual.expand_templates([template])
+        )
+
+    def _refresh_virtual_conflicts(
+        self, template: RecurringLessonTemplate, keys=frozenset()
+    ) -> None:
+        """
+        Recheck conflicts of a virtual template's occurrences after a write.
+
+        Only the persisted conflict index is touched; no lesson rows are written.
+
+        Args:
+            template (RecurringLessonTemplate): Template after the write.
+            keys (Set[ConflictKey]): Keys of its occurrences before the write.
+        """
+        keys = set(keys) | self._virtual_conflict_keys(template)
+        if keys:
+            self.lesson_service.conflict_index.refresh(keys)
+        self.db.commit()
+
+    def create_holiday(self, data: UniversityHolidayIn) -> UniversityHolidayOut:
+        """
+        Create a holiday and remove template lessons from its dates.
+
+        Args:
+            data (UniversityHolidayIn): Holiday payload.
+
+        Returns:
+            UniversityHolidayOut: The created holiday with the lesson changes.
+        """
+        holiday = self.holiday_service.create(data)
+        return self._holiday_out(
+            holiday, self.propagate_holidays([(holiday.date, holiday.is_annual)])
+        )
+
+    def update_holiday(
+        self, holiday_id: int, data: UniversityHolidayIn | UniversityHolidayUpdate
+    ) -> UniversityHolidayOut:
+        """
+        Update (replace or patch) a holiday and move template lessons with it.
+
+        Lessons are regenerated on the holiday's old dates and removed from its new ones.
+
+        Args:
+            holiday_id (int): Identifier of the holiday.
+            data (UniversityHolidayIn | UniversityHolidayUpdate): Full or partial payload.
+
+        Returns:
+            UniversityHolidayOut: The updated holiday with the lesson changes.
+
+        Raises:
+            HTTPException: 404 if the holiday does not exist.
+        """
+        holiday = self.holiday_service.get_by_id(holiday_id)
+        changed = [(holiday.date, holiday.is_annual)]
+        holiday = self.holiday_service.update(holiday_id, data)
+        changed.append((holiday.date, holiday.is_annual))
+        return self._holiday_out(holiday, self.propagate_holidays(changed))
+
+    def delete_holiday(self, holiday_id: int) -> None:
+        """
+        Delete a holiday and regenerate template lessons on its dates.
+
+        Args:
+            holiday_id (int): Identifier of the holiday.
+
+        Raises:
+            HTTPException: 404 if the holiday does not exist.
+        """
+        holiday = self.holiday_service.get_by_id(holiday_id)
+        changed = [(holiday.date, holiday.is_annual)]
+        self.holiday_service.delete(holiday_id)
+        self.propagate_holidays(changed)
+
+    @staticmethod
+    def _holiday_out(
+        holiday: UniversityHoliday, propagation: LessonPropagationOut
+    ) -> UniversityHolidayOut:
+        """Response of a holiday write, with the changes made to template lessons"""
+        return UniversityHolidayOut.model_validate(holiday).model_copy(
+            update={"propagation": propagation}
+        )
+
+    def propagate_holidays(
+        self, holidays: Iterable[tuple[date, bool]]
+    ) -> LessonPropagationOut:
+        """
+        Bring template lessons in line with the holiday calendar on the given holidays' dates.
+
+        Called after a holiday is created, moved or deleted, with the holiday's
+        (date, is_annual) before and after the write: on every future date they cover,
+        generated lessons of templates are deleted if the date is now a holiday and
+        inserted if it no longer is. Virtual templates' occurrences are rechecked on
+        past dates too. Other dates and templates are not touched.
+
+        Args:
+            holidays (Iterable[tuple[date, bool]]): (date, is_annual) of the changed holidays.
+
+        Returns:
+            LessonPropagationOut: What was changed.
+        """
+        today = date.today()
+        one_time = {day for day, is_annual in holidays if not is_annual}
+        annual = {(day.month, day.day) for day, is_annual in holidays if is_annual}
+        if not one_time and not annual:
+            return LessonPropagationOut()
+
+        # Annual holidays fall on any weekday over the years
+        weekdays = range(7) if annual else {day.weekday() for day in one_time}
+        templates = self.repo.find_recurring_on(
+            None,
+            None if annual else max(one_time),
+            sum(1 << day for day in weekdays),
+            self._propagated_templates(today),
+        )
+
+        occurrences: Dict[int, Dict[date, bool]] = {}
+        for template in templates:
+            rule, start_date, end_date = self._get_pattern(template)
+            if not template.is_virtual:
+                start_date = max(start_date, today)
+            if start_date > end_date:
+                continue
+            dates = {day for day in one_time if start_date <= day <= end_date}
+            for year in range(start_date.year, end_date.year + 1):
+                for month, day in annual:
+                    try:
+                        holiday_date = date(year, month, day)
+                    except ValueError:  # Feb 29 in a non-leap year
+                        continue
+                    if start_date <= holiday_date <= end_date:
+                        dates.add(holiday_date)
+            dates = {day for day in dates if rule.occurs_on(day)}
+            if dates:
+                holiday_dates = self._get_holiday_dates(min(dates), max(dates))
+                occurrences[template.id] = {
+                    day: day not in holiday_dates for day in dates
+                }
+
+        return self._propagate(templates, occurrences)
+
+    def propagate_unavailable_days(
+        self, professor_user_id: int, weekdays: Set[int]
+    ) -> LessonPropagationOut:
+        """
+        Bring a professor's template lessons in line with their changed unavailable days.
+
+        On every future date of the professor's templates falling on one of the given
+        weekdays, generated lessons are deleted if the weekday is now unavailable and
+        inserted if it became available again (holidays still skipped). Virtual
+        templates' occurrences are rechecked on past dates too.
+
+        Args:
+            professor_user_id (int): Professor (user) whose profile changed.
+            weekdays (Set[int]): Weekdays (0=Monday) that were added or removed.
+
+        Returns:
+            LessonPropagationOut: What was changed.
+        """
+        if not weekdays:
+            return LessonPropagationOut()
+
+        today = date.today()
+        templates = self.repo.find_recurring_on(
+            None,
+            None,
+            sum(1 << day for day in weekdays),
+            self._propagated_templates(today),
+            RecurringLessonTemplate.professor_user_id == professor_user_id,
+        )
+
+        occurrences: Dict[int, Dict[date, bool]] = {}
+        for template in templates:
+            unavailable_days = self._load_professor_unavailable_days(template) or set()
+            start_date = template.start_date
+            if not template.is_virtual:
+                start_date = max(start_date, today)
+            end_date = template.end_date or self._get_semester_end_date(template)
+            dates = [
+                day
+                for day in template_rule(template).dates(start_date, end_date)
+                if day.weekday() in weekdays
+            ]
+            if dates:
+                holiday_dates = self._get_holiday_dates(dates[0], dates[-1])
+                occurrences[template.id] = {
+                    day: day.weekday() not in unavailable_days
+                    and day not in holiday_dates
+                    for day in dates
+                }
+
+        return self._propagate(templates, occurrences)
+
+    def _propagated_templates(self, today: date):
+        """
+        Condition on the templates whose lessons a calendar change can move.
+
+        Stored lessons are only rewritten from today on, but virtual occurrences are
+        computed from the calendar, so past ones of virtual templates change as well.
+
+        Args:
+            today (date): First date of rewritten stored lessons.
+
+        Returns:
+            ColumnElement[bool]: Filter expression on RecurringLessonTemplate.
+        """
+        return or_(
+            self.repo.overlaps_window(today, None),
+            RecurringLessonTemplate.is_virtual,
+        )
+
+    def _propagate(
+        self,
+        templates: Sequence[RecurringLessonTemplate],
+        occurrences: Dict[int, Dict[date, bool]],
+    ) -> LessonPropagationOut:
+        """
+        Apply per-date coverage changes to the lessons of templates.
+
+        Generated lessons (still carrying their template's values) on dates no longer
+        covered are deleted with one set-based DELETE; lessons edited by hand are kept
+        and flagged. Covered dates without a lesson of the template are inserted.
+        Virtual templates have no rows; only the conflicts of their occurrences are
+        rechecked. Everything is written in one transaction with the conflict index
+        refresh.
+
+        Args:
+            templates (Sequence[RecurringLessonTemplate]): Templates the dates belong to.
+            occurrences (Dict[int, Dict[date, bool]]): Template ID -> affected date ->
+                whether the template covers it now.
+
+        Returns:
+            LessonPropagationOut: What was changed.
+        """
+        templates = {
+            template.id: template
+            for template in templates
+            if occurrences.get(template.id)
+        }
+        if not templates:
+            return LessonPropagationOut()
+
+        stored = [
+            template for template in templates.values() if not template.is_virtual
+        ]
+        virtual = [template for template in templates.values() if template.is_virtual]
+        all_dates = {day for dates in occurrences.values() for day in dates}
+
+        conflict_index = self.lesson_service.conflict_index
+        keys = set()
+
+        deleted, flagged, existing = [], [], set()
+        if stored:
+            # Served by idx_lesson_template_date; pairs are matched below
+            lessons = self.db.query(Lesson).filter(
+                Lesson.recurring_template_id.in_([template.id for template in stored]),
+                Lesson.date.in_(all_dates),
+            )
+            for lesson in lessons:
+                covered = occurrences[lesson.recurring_template_id].get(lesson.date)
+                if covered is None:
+                    continue
+                existing.add((lesson.recurring_template_id, lesson.date))
+                if covered:
+                    continue
+                template = templates[lesson.recurring_template_id]
+                if all(
+                    getattr(lesson, field) == value
+                    for field, value in self._lesson_values(template).items()
+                ):
+                    deleted.append(lesson)
+                else:
+                    flagged.append(lesson)
+
+        keys |= conflict_index.conflict_keys(deleted)
+        if deleted:
+            self.db.execute(
+                delete(Lesson)
+                .where(Lesson.id.in_([lesson.id for lesson in deleted]))
+                .execution_options(synchronize_session=False)
+            )
+
+        inserted_ids = self.lesson_service.repo.bulk_create(
+            [
+                {
+                    **self._lesson_values(template),
+                    "date": day,
+                    "recurring_template_id": template.id,
+                }
+                for template in stored
+                for day, covered in sorted(occurrences[template.id].items())
+                if covered and (template.id, day) not in existing
+            ]
+        )
+        if inserted_ids:
+            keys |= conflict_index.conflict_keys(
+                self.lesson_service.repo.get_rows(Lesson.id.in_(inserted_ids))
+            )
+
+        if virtual:
+            # Occurrences appear or disappear; their keys are the same either way
+            exceptions = {
+                (exception.template_id, exception.occurrence_date): exception
+                for exception in self.exception_repo.get_for_templates(
+                    [template.id for template in virtual],
+                    min(all_dates),
+                    max(all_dates),
+                )
+            }
+            keys |= conflict_index.conflict_keys(
+                VirtualLesson(template, day, exceptions.get((template.id, day)))
+                for template in virtual
+                for day in occurrences[template.id]
+            )
+
+        if keys:
+            conflict_index.refresh(keys)
+        self.db.commit()
+
+        return LessonPropagationOut(
+            template_ids=sorted(templates),
+            dates=sorted(all_dates),
+            deleted=len(deleted),
+            inserted=len(inserted_ids),
+            flagged_lesson_ids=sorted(lesson.id for lesson in flagged),
+        )
+
+    def start_import(self, data: RecurringLessonTemplateImportIn) -> Job:
+        """
+        Queue a batch import on the background worker.
+
+        Args:
+            data (RecurringLessonTemplateImportIn): Templates to import.
+
+        Returns:
+            Job: The pending import job, to be polled with get_import_job().
+
+        Raises:
+            HTTPException: 400 if the batch is larger than TEMPLATE_IMPORT_MAX_TEMPLATES.
+        """
+        if len(data.templates) > setting.TEMPLATE_IMPORT_MAX_TEMPLATES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {setting.TEMPLATE_IMPORT_MAX_TEMPLATES} templates can be imported at once",
+            )
+
+        job = import_jobs.create(len(data.templates))
+        submit_job(_run_import, job.id, data)
+        return job
+
+    def get_import_job(self, job_id: str) -> Job:
+        """
+        Progress and, once finished, result of an import job.
+
+        Args:
+            job_id (str): Job returned by start_import().
+
+        Returns:
+            Job: Snapshot of the job.
+
+        Raises:
+            HTTPException: 404 if the job is unknown (or finished long ago).
+        """
+        job = import_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Import job {job_id} not found",
+            )
+        return job
+
+    def import_templates(
+        self,
+        data: RecurringLessonTemplateImportIn,
+        progress: Callable[[JobStatusEnum, int], None] = lambda status, processed: None,
+    ) -> RecurringLessonTemplateImportResultOut:
+        """
+        Validate a batch of templates together, check its conflicts and write it at once.
+
+        All referenced rows are loaded with one query per table. Conflicts are checked
+        within the batch (in memory) and against existing templates and standalone
+        lessons. A valid batch without blocking conflicts is written in one
+        transaction: all templates in one flush, all lessons in one bulk insert and
+        one conflict index refresh; nothing is written otherwise.
+
+        Args:
+            data (RecurringLessonTemplateImportIn): Templates to import.
+            progress (Callable[[JobStatusEnum, int], None]): Called with the stage and
+                the number of templates processed in it.
+
+        Returns:
+            RecurringLessonTemplateImportResultOut: Errors, conflicts and the created templates.
+        """
+        progress(JobStatusEnum.validating, 0)
+        candidates, errors = self._validate_batch(data.templates, progress)
+        if errors:
+            return RecurringLessonTemplateImportResultOut(imported=False, errors=errors)
+
+        progress(JobStatusEnum.checking, 0)
+        conflicts = self._check_batch_conflicts(candidates, progress)
+        if conflicts and not data.allow_conflicts:
+            return RecurringLessonTemplateImportResultOut(
+                imported=False, conflicts=conflicts
+            )
+
+        progress(JobStatusEnum.writing, 0)
+        templates = self.repo.bulk_create(
+            [template.model_dump() for template in data.templates]
+        )
+        rows = [
+            {
+                **self._lesson_values(template),
+                "date": lesson_date,
+                "recurring_template_id": template.id,
+            }
+            for template, candidate in zip(templates, candidates)
+            if not template.is_virtual
+            for lesson_date in candidate.lesson_dates
+        ]
+        self.lesson_service.repo.bulk_create(rows)
+
+        conflict_index = self.lesson_service.conflict_index
+        template_ids = [template.id for template in templates]
+        keys = conflict_index.conflict_keys(
+            self.lesson_service.repo.get_rows(
+                Lesson.recurring_template_id.in_(template_ids)
+            )
+        ) | conflict_index.conflict_keys(
+            self.lesson_service.virtual.expand_templates(
+                [template for template in templates if template.is_virtual]
+            )
+        )
+        if keys:
+            conflict_index.refresh(keys)
+        self.db.commit()
+        progress(JobStatusEnum.writing, len(templates))
+
+        return RecurringLessonTemplateImportResultOut(
+            imported=True,
+            conflicts=conflicts,
+            template_ids=template_ids,
+            lessons_count=len(rows),
+        )
+
+    def _validate_batch(
+        self,
+        templates: List[RecurringLessonTemplateIn],
+        progress: Callable[[JobStatusEnum, int], None],
+    ) -> tuple[List[SimpleNamespace], List[TemplateImportErrorOut]]:
+        """
+        Check the references, time window, date range and dates of every template of a batch.
+
+        Args:
+            templates (List[RecurringLessonTemplateIn]): Batch to validate.
+            progress (Callable[[JobStatusEnum, int], None]): Progress callback.
+
+        Returns:
+            tuple: (candidates with their lesson dates, in batch order; validation errors).
+        """
+        references = {
+            model: {
+                row.id: row
+                for row in self.db.query(model).filter(
+                    model.id.in_(
+                        {
+                            getattr(template, field)
+                            for template in templates
+                            if getattr(template, field) is not None
+                        }
+                    )
+                )
+            }
+            for model, field in (
+                (Schedule, "schedule_id"),
+                (Group, "group_id"),
+                (SubjectAssignment, "subject_assignment_id"),
+                (Room, "room_id"),
+            )
+        }
+        assignments = SubjectAssignmentRepository(self.db)
+        professors: Dict[int, int | None] = {}
+
+        candidates = []
+        errors = []
+        for index, template in enumerate(templates):
+            detail = None
+            for model, field in (
+                (Schedule, "schedule_id"),
+                (Group, "group_id"),
+                (SubjectAssignment, "subject_assignment_id"),
+                (Room, "room_id"),
+            ):
+                value = getattr(template, field)
+                if value is not None and value not in references[model]:
+                    detail = f"{model.__name__} with id {value} not found"
+                    break
+            if detail is None and template.start_time >= template.end_time:
+                detail = "start_time must be before end_time"
+            if (
+                detail is None
+                and template.end_date
+                and template.end_date < template.start_date
+            ):
+                detail = "end_date must not be before start_date"
+
+            if detail is None:
+                if template.subject_assignment_id not in professors:
+                    professors[template.subject_assignment_id] = (
+                        assignments.professor_user_id(template.subject_assignment_id)
+                    )
+                candidate = SimpleNamespace(
+                    **template.model_dump(),
+                    id=None,
+                    batch_index=index,
+                    schedule=references[Schedule][template.schedule_id],
+                    subject_assignment=references[SubjectAssignment][
+                        template.subject_assignment_id
+                    ],
+                    professor_user_id=professors[template.subject_assignment_id],
+                )
+                candidate.lesson_dates = self._calculate_lesson_dates(candidate)
+                if not candidate.lesson_dates:
+                    detail = "Template has no lesson dates"
+                candidates.append(candidate)
+
+            if detail is not None:
+                errors.append(TemplateImportErrorOut(index=index, detail=detail))
+            progress(JobStatusEnum.validating, index + 1)
+
+        return candidates, errors
+
+    def _check_batch_conflicts(
+        self,
+        candidates: List[SimpleNamespace],
+        progress: Callable[[JobStatusEnum, int], None],
+    ) -> List[TemplateImportConflictOut]:
+        """
+        Check every template of a valid batch against the rest of the batch and the stored data.
+
+        Candidates are bucketed by room, group and professor, so each one is only
+        compared with the batch templates it shares a resource with.
+
+        Args:
+            candidates (List[SimpleNamespace]): Validated batch, in batch order.
+            progress (Callable[[JobStatusEnum, int], None]): Progress callback.
+
+        Returns:
+            List[TemplateImportConflictOut]: Conflicts of the templates that have any.
+        """
+        buckets: Dict[tuple[str, int], List[SimpleNamespace]] = {}
+        for candidate in candidates:
+            for key in (
+                ("room", candidate.room_id),
+                ("group", candidate.group_id),
+                ("professor", candidate.professor_user_id),
+            ):
+                if key[1] is not None:
+                    buckets.setdefault(key, []).append(candidate)
+
+        conflicts = []
+        for candidate in candidates:
+            sharing = {}
+            for key in (
+                ("room", self.lesson_service._get_room_key(candidate)),
+                ("group", self.lesson_service._get_group_key(candidate)),
+                ("professor", self.lesson_service._get_professor_id(candidate)),
+            ):
+                for other in buckets.get(key, ()):
+                    if other is not candidate:
+                        sharing[other.batch_index] = other
+
+            result = self._check_template_conflicts(
+                candidate, None, [sharing[index] for index in sorted(sharing)]
+            )
+            if result.has_conflicts:
+                conflicts.append(
+                    TemplateImportConflictOut(
+                        **result.model_dump(), index=candidate.batch_index
+                    )
+                )
+            progress(JobStatusEnum.checking, candidate.batch_index + 1)
+
+        return conflicts
+
+    def check_conflicts(
+        self, params: RecurringLessonTemplateConflictParams
+    ) -> RecurringLessonTemplateConflictCheckOut:
+        """
+        Check a candidate template for conflicts before it is created or changed.
+
+        Args:
+            params (RecurringLessonTemplateConflictParams): Candidate template and optional template to exclude.
+
+        Returns:
+            RecurringLessonTemplateConflictCheckOut: Clashes with other templates and standalone lessons.
+        """
+        candidate = self._build_candidate(params)
+        return self._check_template_conflicts(candidate, params.exclude_template_id)
+
+    def check_template_conflicts(
+        self, template_id: int
+    ) -> RecurringLessonTemplateConflictCheckOut:
+        """
+        Check an existing template against all other templates and standalone lessons.
+
+        Args:
+            template_id (int): Template to check; its own lessons are ignored.
+
+        Returns:
+            RecurringLessonTemplateConflictCheckOut: Clashes with other templates and standalone lessons.
+        """
+        template = self.get_by_id(template_id)
+        return self._check_template_conflicts(template, template_id)
+
+    def _check_template_conflicts(
+        self, template, exclude_template_id: int | None, batch: Sequence = ()
+    ) -> RecurringLessonTemplateConflictCheckOut:
+        """
+        Find clashes of a template analytically, without generating lessons.
+
+        Two templates clash when they share a room, group or professor, their time
+        windows overlap, and at least one date lies in both date ranges on which both
+        recurrence rules occur (professor unavailable days removed) and is not a
+        holiday. For plain weekly rules the shared dates are counted from the weekday
+        arithmetic minus the holidays among them; rules with a week interval, parity
+        or explicit dates intersect their generated dates. The multi-group exemptions
+        of the lesson-level rules apply to the pair.
+
+        Standalone lessons (not generated from a template) are probed with indexed
+        range queries over the template's date range and checked per occurrence date
+        with the lesson-level rules. Lessons generated from other templates are covered
+        by the template-vs-template check.
+
+        Unsaved templates of an import batch are checked the same way, in memory.
+
+        Args:
+            template (RecurringLessonTemplate | SimpleNamespace): Template or candidate to check.
+            exclude_template_id (int | None): Template to ignore, together with its lessons.
+            batch (Sequence[SimpleNamespace]): Other candidates of the same import batch.
+
+        Returns:
+            RecurringLessonTemplateConflictCheckOut: Template and lesson conflicts.
+        """
+        rule, start_date, end_date = self._get_pattern(template)
+        holiday_dates = self._get_holiday_dates(start_date, end_date)
+
+        room_id = self.lesson_service._get_room_key(template)
+        group_id = self.lesson_service._get_group_key(template)
+        professor_id = self.lesson_service._get_professor_id(template)
+
+        # Same filter as find_overlapping(), for the unsaved batch candidates
+        batch_overlapping = [
+            other
+            for other in batch
+            if (
+                (room_id is not None and other.room_id == room_id)
+                or (group_id is not None and other.group_id == group_id)
+                or (
+                    professor_id is not None and other.professor_user_id == professor_id
+                )
+            )
+            and other.start_date <= end_date
+            and (other.end_date is None or other.end_date >= start_date)
+            and other.start_time < template.end_time
+            and other.end_time > template.start_time
+        ]
+
+        template_conflicts = []
+        for other in (
+            self.repo.find_overlapping(
+                start_date,
+                end_date,
+                template.start_time,
+                template.end_time,
+                room_id=room_id,
+                group_id=group_id,
+                professor_user_id=professor_id,
+                exclude_template_id=exclude_template_id,
+            )
+            + batch_overlapping
+        ):
+            other_rule, other_start, other_end = self._get_pattern(other)
+            first_date, occurrences, shared_days = shared_occurrences(
+                rule,
+                other_rule,
+                max(start_date, other_start),
+                min(end_date, other_end),
+                holiday_dates,
+            )
+            if first_date is None:
+                continue
+
+            for conflict_type in self._get_template_conflict_types(template, other):
+                template_conflicts.append(
+                    TemplateConflictOut(
+                        type=conflict_type,
+                        message=self._format_template_conflict(
+                            conflict_type, template, other, shared_days
+                        ),
+                        severity="error",
+                        template_id=other.id,
+                        batch_index=getattr(other, "batch_index", None),
+                        template_name=other.name,
+                        days_of_week=sorted(shared_days),
+                        first_date=first_date,
+                        occurrences=occurrences,
+                    )
+                )
+
+        lessons_by_date: Dict[date, List[Lesson]] = {}
+        for lesson in self.lesson_service.repo.find_overlapping_between(
+            start_date,
+            end_date,
+            template.start_time,
+            template.end_time,
+            room_id=room_id,
+            group_id=group_id,
+            professor_user_id=professor_id,
+            standalone_only=True,
+        ):
+            if rule.occurs_on(lesson.date) and lesson.date not in holiday_dates:
+                lessons_by_date.setdefault(lesson.date, []).append(lesson)
+
+        lesson_conflicts = []
+        for lesson_date, lessons in lessons_by_date.items():
+            occurrence = self._build_occurrence(template, lesson_date)
+            lesson_conflicts.extend(
+                self.lesson_service.candidate_conflicts(occurrence, lessons)
+            )
+
+        count = len(template_conflicts) + len(lesson_conflicts)
+        return RecurringLessonTemplateConflictCheckOut(
+            has_conflicts=count > 0,
+            template_conflicts=template_conflicts,
+            lesson_conflicts=lesson_conflicts,
+            count=count,
+        )
+
+    def _build_candidate(
+        self, params: RecurringLessonTemplateIn | RecurringLessonTemplateConflictParams
+    ) -> SimpleNamespace:
+        """
+        Build an unsaved, template-like object from create or check parameters.
+
+        Args:
+            params (RecurringLessonTemplateIn | RecurringLessonTemplateConflictParams): Candidate template.
+
+        Returns:
+            SimpleNamespace: Object exposing the template attributes used by the checks.
+
+        Raises:
+            HTTPException: 404 if the schedule or subject assignment does not exist.
+        """
+        schedule = self.db.get(Schedule, params.schedule_id)
+        subject_assignment = self.db.get(
+            SubjectAssignment, params.subject_assignment_id
+        )
+        if not schedule or not subject_assignment:
+            missing = "Schedule" if not schedule else "SubjectAssignment"
+            missing_id = (
+                params.schedule_id if not schedule else params.subject_assignment_id
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{missing} with id {missing_id} not found",
+            )
+
+        return SimpleNamespace(
+            **params.model_dump(exclude={"exclude_template_id"}),
+            id=None,
+            schedule=schedule,
+            subject_assignment=subject_assignment,
+            professor_user_id=SubjectAssignmentRepository(self.db).professor_user_id(
+                params.subject_assignment_id
+            ),
+        )
+
+    def _build_occurrence(self, template, lesson_date: date) -> SimpleNamespace:
+        """
+        Build the unsaved lesson a template would generate on a date.
+
+        Args:
+            template (RecurringLessonTemplate | SimpleNamespace): Template or candidate.
+            lesson_date (date): Occurrence date.
+
+        Returns:
+            SimpleNamespace: Lesson-like object for the lesson-level conflict rules.
+        """
+        return SimpleNamespace(
+            id=None,
+            schedule_id=template.schedule_id,
+            date=lesson_date,
+            start_time=template.start_time,
+            end_time=template.end_time,
+            room_id=template.room_id,
+            group_id=template.group_id,
+            subject_assignment_id=template.subject_assignment_id,
+            is_online=template.is_online,
+            professor_user_id=template.professor_user_id,
+        )
+
+    def _get_pattern(self, template) -> tuple[RecurrenceRule, date, date]:
+        """
+        Resolve the recurrence rule and date range a template generates lessons on.
+
+        Args:
+            template (RecurringLessonTemplate | SimpleNamespace): Template or candidate.
+
+        Returns:
+            tuple: (rule without the professor's unavailable days, start date, end date).
+        """
+        rule = template_rule(template).without_weekdays(
+            self._get_professor_unavailable_days(template)
+        )
+        end_date = template.end_date or self._get_semester_end_date(template)
+        return rule, template.start_date, end_date
+
+    def _get_template_conflict_types(self, template, other) -> List[str]:
+        """
+        Conflict types two overlapping templates clash on, after multi-group exemptions.
+
+        Args:
+            template (RecurringLessonTemplate | SimpleNamespace): Checked template.
+            other (RecurringLessonTemplate): Overlapping template.
+
+        Returns:
+            List[str]: Subset of "room", "professor", "group", in that order.
+        """
+        pair = (template, other)
+        types = []
+
+        room_id = self.lesson_service._get_room_key(template)
+        if room_id is not None and room_id == self.lesson_service._get_room_key(other):
+            professors = {
+                item.professor_user_id for item in pair if item.professor_user_id
+            }
+            if is_room_conflict(professors):
+                types.append("room")
+
+        professor_id = template.professor_user_id
+        if professor_id is not None and professor_id == other.professor_user_id:
+            rooms = {
+                item.room_id for item in pair if not item.is_online and item.room_id
+            }
+            online = sum(1 for item in pair if item.is_online)
+            if is_professor_conflict(rooms, online):
+                types.append("professor")
+
+        if template.group_id is not None and template.group_id == other.group_id:
+            types.append("group")
+
+        return types
+
+    def _format_template_conflict(
+        self, conflict_type: str, template, other, days: frozenset[int]
+    ) -> str:
+        """
+        Build the human-readable message of a template-vs-template conflict.
+
+        Args:
+            conflict_type (str): "room", "professor" or "group".
+            template (RecurringLessonTemplate | SimpleNamespace): Checked template.
+            other (RecurringLessonTemplate): Overlapping template.
+            days (frozenset[int]): Weekdays both templates occur on.
+
+        Returns:
+            str: Conflict message.
+        """
+        other_name = other.name or (
+            f"#{other.id}" if other.id is not None else f"batch #{other.batch_index}"
+        )
+        start_time = min(template.start_time, other.start_time)
+        end_time = max(template.end_time, other.end_time)
+        when = f"on {format_weekdays(days)} at {start_time}-{end_time}"
+
+        if conflict_type == "room":
+            room = self.db.get(Room, template.room_id)
+            room_name = room.number if room else f"Room {template.room_id}"
+            return (
+                f"Room '{room_name}' is also booked by template '{other_name}' {when}"
+            )
+        if conflict_type == "professor":
+            professor = self.db.get(User, template.professor_user_id)
+            professor_name = (
+                f"{professor.name} {professor.surname}"
+                if professor
+                else f"Professor {template.professor_user_id}"
+            )
+            return f"Professor {professor_name} also teaches template '{other_name}' in another location {when}"
+
+        group = self.db.get(Group, template.group_id)
+        group_name = group.name if group else f"Group {template.group_id}"
+        return f"Group '{group_name}' also attends template '{other_name}' {when}"
 
     def _generate_lessons_from_template(
         self, template: RecurringLessonTemplate
-    ) -> List[Lesson]:
-        """Генерируем уроки по шаблону"""
+    ) -> List[int]:
+        """Генерируем уроки по шаблону (одной вставкой, в одной транзакции)"""
 
         # Вычисляем даты уроков
         lesson_dates = self._calculate_lesson_dates(template)
 
         # Создаем уроки
-        lessons = []
-        for lesson_date in lesson_dates:
-            lesson_data = {
-                "schedule_id": template.schedule_id,
-                "group_id": template.group_id,
-                "subject_assignment_id": template.subject_assignment_id,
-                "room_id": template.room_id,
-                "lesson_type": template.lesson_type,
-                "is_online": template.is_online,
+        rows = [
+            {
+                **self._lesson_values(template),
                 "date": lesson_date,
-                "start_time": template.start_time,
-                "end_time": template.end_time,
                 "recurring_template_id": template.id,
             }
+            for lesson_date in lesson_dates
+        ]
+
+        return self.lesson_service.bulk_create(rows)
 
-            lesson = self.lesson_service.create(lesson_data)
-            lessons.append(lesson)
+    def _regenerate_lessons(self, template: RecurringLessonTemplate, old) -> None:
+        """
+        Bring the template's future lessons in line with the updated template.
 
-        return lessons
+        Generated lessons on dates the template still covers are moved in place with
+        one set-based UPDATE of the changed fields (IDs are kept); those on dates it no
+        longer covers are deleted, and only newly covered dates are inserted. Everything
+        is written in one transaction together with the conflict index refresh.
 
-    def _calculate_lesson_dates(self, template: RecurringLessonTemplate) -> List[date]:
-        """Вычисляем все даты уроков с учетом праздников и недоступных дней профессора"""
+        Args:
+            template (RecurringLessonTemplate): Template after the update.
+            old (SimpleNamespace): Snapshot of the template before the update.
+        """
+        kept, deleted, insert_dates = self._plan_regeneration(
+            template.id, old, template
+        )
 
-        dates = []
-        current_date = template.start_date
-        end_date = template.end_date or self._get_semester_end_date(template)
+        values = self._lesson_values(template)
+        changed = {
+            field: value
+            for field, value in values.items()
+            if getattr(old, field) != value
+        }
+        if "subject_assignment_id" in changed:
+            # Lessons store the assignment's professor denormalized, like bulk_create
+            changed["professor_user_id"] = SubjectAssignmentRepository(
+                self.db
+            ).professor_user_id(changed["subject_assignment_id"])
+        moved = kept if changed else []
 
-        # Получаем праздники для исключения
-        holiday_dates = self._get_holiday_dates(current_date, end_date)
+        conflict_index = self.lesson_service.conflict_index
+        keys = conflict_index.conflict_keys(moved + deleted)
 
-        # Получаем недоступные дни профессора
-        unavailable_days = self._get_professor_unavailable_days(template)
+        if moved:
+            self.db.execute(
+                update(Lesson)
+                .where(Lesson.id.in_([lesson.id for lesson in moved]))
+                .values(**changed)
+                .execution_options(synchronize_session=False)
+            )
+        if deleted:
+            self.db.execute(
+                delete(Lesson)
+                .where(Lesson.id.in_([lesson.id for lesson in deleted]))
+                .execution_options(synchronize_session=False)
+            )
+        inserted_ids = self.lesson_service.repo.bulk_create(
+            [
+                {**values, "date": lesson_date, "recurring_template_id": template.id}
+                for lesson_date in insert_dates
+            ]
+        )
 
-        # Получаем дни недели (работаем со строкой напрямую)
-        days_of_week = template.days_of_week
+        written_ids = [lesson.id for lesson in moved] + inserted_ids
+        if written_ids:
+            keys |= conflict_index.conflict_keys(
+                self.lesson_service.repo.get_rows(Lesson.id.in_(written_ids))
+            )
+        if keys:
+            conflict_index.refresh(keys)
+        self.db.commit()
 
-        # Проходим по всем дням в диапазоне
-        while current_date <= end_date:
-            # Проверяем день недели (0=Понедельник в ISO)
-            day_of_week = current_date.weekday()
+    def _plan_regeneration(
+        self, template_id: int, old, new
+    ) -> tuple[List[Lesson], List[Lesson], List[date]]:
+        """
+        Diff the future occurrences of a template before and after an update.
 
-            # Конвертируем номер дня в строку и проверяем его наличие в JSON строке
-            if str(day_of_week) in days_of_week:
-                # Исключаем праздники
-                if current_date not in holiday_dates:
-                    # Исключаем недоступные дни профессора
-                    if unavailable_days is None or day_of_week not in unavailable_days:
-                        dates.append(current_date)
+        Only future lessons that still carry the old template's values are managed;
+        lessons edited by hand are preserved. Dates the old pattern covered but that
+        have no generated lesson (deleted or moved by hand) are not filled in again.
 
-            current_date += timedelta(days=1)
+        Args:
+            template_id (int): Template being updated.
+            old (SimpleNamespace): Template before the update.
+            new (RecurringLessonTemplate | SimpleNamespace): Template after the update.
 
-        return dates
+        Returns:
+            tuple: (lessons to keep and update in place, lessons to delete, dates to insert).
+        """
+        today = date.today()
+        old_dates = {day for day in self._calculate_lesson_dates(old) if day >= today}
+        new_dates = {day for day in self._calculate_lesson_dates(new) if day >= today}
 
-    def _get_holiday_dates(self, start_date: date, end_date: date) -> set[date]:
-        """Получаем множество праздничных дат в диапазоне"""
+        old_values = self._lesson_values(old)
+        generated = [
+            lesson
+            for lesson in self._future_lessons_query(template_id).order_by(Lesson.date)
+            if all(
+                getattr(lesson, field) == value for field, value in old_values.items()
+            )
+        ]
 
-        holiday_dates = set()
+        kept = [lesson for lesson in generated if lesson.date in new_dates]
+        deleted = [lesson for lesson in generated if lesson.date not in new_dates]
+        insert_dates = sorted(
+            new_dates - old_dates - {lesson.date for lesson in generated}
+        )
+        return kept, deleted, insert_dates
 
-        # Получаем все праздники
-        holidays = self.db.query(UniversityHoliday).all()
+    def _lesson_values(self, template) -> Dict[str, object]:
+        """Значения полей урока, которые копируются из шаблона"""
+        return {field: getattr(template, field) for field in GENERATED_FIELDS}
 
-        for holiday in holidays:
-            holiday_date = holiday.date
+    def _snapshot(self, template: RecurringLessonTemplate) -> SimpleNamespace:
+        """
+        Detached copy of a template's columns and the relations date calculation uses.
 
-            if holiday.is_annual:
-                # Для ежегодных праздников создаем даты для каждого года в диапазоне
-                for year in range(start_date.year, end_date.year + 1):
-                    annual_date = date(year, holiday_date.month, holiday_date.day)
-                    if start_date <= annual_date <= end_date:
-                        holiday_dates.add(annual_date)
-            else:
-                # Для обычных праздников используем указанную дату
-                if start_date <= holiday_date <= end_date:
-                    holiday_dates.add(holiday_date)
+        Args:
+            template (RecurringLessonTemplate): Stored template.
 
-        return holiday_dates
+        Returns:
+            SimpleNamespace: Template-like object unaffected by later changes.
+        """
+        return SimpleNamespace(
+            **{
+                column.key: getattr(template, column.key)
+                for column in RecurringLessonTemplate.__table__.columns
+            },
+            schedule=template.schedule,
+            subject_assignment=template.subject_assignment,
+        )
+
+    def _calculate_lesson_dates(self, template: RecurringLessonTemplate) -> List[date]:
+        """Вычисляем все даты уроков с учетом праздников и недоступных дней профессора"""
+
+        # Правило повторения (без недоступных дней профессора) и диапазон дат
+        rule, start_date, end_date = self._get_pattern(template)
+
+        # Получаем праздники для исключения
+        holiday_dates = self._get_holiday_dates(start_date, end_date)
+
+        # Переходим сразу к подходящим дням (без обхода каждого дня диапазона)
+        return [
+            day for day in rule.dates(start_date, end_date) if day not in holiday_dates
+        ]
+
+    def _get_holiday_dates(self, start_date: date, end_date: date) -> set[date]:
+        """Получаем множество праздничных дат в диапазоне (из общего календаря праздников)"""
+        return self.holiday_service.get_holiday_dates(start_date, end_date)
 
     def _get_semester_end_date(self, template: RecurringLessonTemplate) -> date:
         """Получаем дату окончания семестра"""
@@ -184,8 +1504,17 @@ class RecurringLessonTemplateService(
         self, template: RecurringLessonTemplate
     ) -> set[int] | None:
         """Получаем недоступные дни профессора из subject_assignment"""
-        import json
+        key = template.subject_assignment_id
+        if key not in self._unavailable_days:
+            self._unavailable_days[key] = self._load_professor_unavailable_days(
+                template
+            )
+        return self._unavailable_days[key]
 
+    def _load_professor_unavailable_days(
+        self, template: RecurringLessonTemplate
+    ) -> set[int] | None:
+        """Читаем недоступные дни профессора из профиля (без кэша)"""
         if not template.subject_assignment:
             return None
 
@@ -194,33 +1523,25 @@ class RecurringLessonTemplateService(
             template.subject_assignment.workload.contract.professor_profile
         )
 
-        if not professor_profile or not professor_profile.unavailable_days:
+        if not professor_profile:
             return None
 
-        try:
-            # Парсим JSON строку в список дней
-            unavailable_days_list = json.loads(professor_profile.unavailable_days)
-            return set(unavailable_days_list)
-        except (json.JSONDecodeError, TypeError):
-            return None
+        return parse_unavailable_days(professor_profile.unavailable_days)
 
     def _delete_future_lessons_by_template(self, template_id: int) -> int:
-        """Удаляем только будущие уроки по шаблону"""
+        """Удаляем только будущие уроки по шаблону (без commit)"""
+
+        return self._future_lessons_query(template_id).delete(synchronize_session=False)
 
+    def _future_lessons_query(self, template_id: int):
+        """Запрос будущих уроков шаблона"""
         today = date.today()
 
-        deleted = (
-            self.db.query(Lesson)
-            .filter(
-                Lesson.recurring_template_id == template_id,
-                Lesson.date >= today,  # Только будущие
-            )
-            .delete(synchronize_session=False)
+        return self.db.query(Lesson).filter(
+            Lesson.recurring_template_id == template_id,
+            Lesson.date >= today,  # Только будущие
         )
 
-        self.db.commit()
-        return deleted
-
     def get_lessons_count_by_template(self, template_id: int) -> int:
         """Получаем количество созданных уроков по шаблону"""
         return (
@@ -237,3 +1558,40 @@ class RecurringLessonTemplateService(
             .filter(Lesson.recurring_template_id == template_id, Lesson.date >= today)
             .count()
         )
+
+
+def _run_import(job_id: str, data: RecurringLessonTemplateImportIn) -> None:
+    """
+    Background worker of an import job: runs the import in its own session and
+    records progress and the outcome in the job registry.
+    """
+    db = SessionLocal()
+    try:
+        result = RecurringLessonTemplateService(db).import_templates(
+            data,
+            lambda status, processed: import_jobs.update(
+                job_id, status=status, processed=processed
+            ),
+        )
+    except Exception as exc:
+        db.rollback()
+        import_jobs.update(
+            job_id,
+            status=JobStatusEnum.failed,
+            error=getattr(exc, "detail", None) or str(exc) or type(exc).__name__,
+        )
+        return
+    finally:
+        db.close()
+
+    error = None
+    if result.errors:
+        error = f"{len(result.errors)} templates are invalid"
+    elif not result.imported:
+        error = f"{len(result.conflicts)} templates have conflicts"
+    import_jobs.update(
+        job_id,
+        status=JobStatusEnum.succeeded if result.imported else JobStatusEnum.failed,
+        result=result,
+        error=error,
+    )
@@ -5,9 +5,11 @@ from sqlalchemy import and_
 
 from app.models.schedule import Schedule
 from app.repositories.schedule import ScheduleRepository
+from app.repositories.lesson import LessonRepository, LessonExportRow
 from app.schemas.schedule import ScheduleIn, ScheduleExportParams
 
 from app.services.base import BaseService
+from app.services.virtual_lesson import VirtualLessonService, sort_lessons
 
 import io
 from datetime import datetime, timedelta
@@ -384,7 +386,7 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
             start_date (date): Start date of the range.
             end_date (date): End date of the range.
             time_slots (list[str]): Time slot labels (e.g., "08:00-08:45").
-            lessons (list[Lesson]): Lessons to render.
+            lessons (list[LessonExportRow]): Lessons to render.
 
         Returns:
             tuple[list[list[str]], dict[tuple[int, int], str]]:
@@ -399,12 +401,14 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         header_row = ["Date/Time"] + time_slots + ["GRUPA"]
         table_data.append(header_row)
 
+        lessons_by_date = self._group_lessons_by_date(lessons)
+
         current_date = start_date
         table_row = 1  # Начинаем с 1, так как 0-я строка - заголовок
 
         while current_date <= end_date:
             # Получаем уроки на этот день
-            day_lessons = [lesson for lesson in lessons if lesson.date == current_date]
+            day_lessons = lessons_by_date.get(current_date, [])
 
             if not day_lessons:
                 # Пустая строка для дня без уроков
@@ -416,8 +420,8 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
                 # Определяем уникальные группы для этого дня
                 groups_for_day = {}
                 for lesson in day_lessons:
-                    if lesson.group:
-                        group_name = lesson.group.name
+                    if lesson.group_name is not None:
+                        group_name = lesson.group_name
                         if group_name not in groups_for_day:
                             groups_for_day[group_name] = []
                         groups_for_day[group_name].append(lesson)
@@ -435,9 +439,9 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
                         if lesson_in_slot:
                             cell_text = self._format_lesson_for_pdf(lesson_in_slot)
                             # Сохраняем цвет для этой ячейки
-                            if lesson_in_slot.subject.color:
+                            if lesson_in_slot.subject_color:
                                 cell_colors[(table_row, col_idx + 1)] = (
-                                    lesson_in_slot.subject.color
+                                    lesson_in_slot.subject_color
                                 )
                         else:
                             cell_text = ""
@@ -474,9 +478,9 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
                             if lesson_in_slot:
                                 cell_text = self._format_lesson_for_pdf(lesson_in_slot)
                                 # Сохраняем цвет для этой ячейки
-                                if lesson_in_slot.subject.color:
+                                if lesson_in_slot.subject_color:
                                     cell_colors[(table_row, col_idx + 1)] = (
-                                        lesson_in_slot.subject.color
+                                        lesson_in_slot.subject_color
                                     )
                             else:
                                 cell_text = ""
@@ -522,18 +526,18 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         - Third line: delivery ("ONLINE" or "R:<room>")
 
         Args:
-            lesson (Lesson): Lesson to render.
+            lesson (LessonExportRow): Lesson to render.
 
         Returns:
             str: Compact string for the PDF cell.
         """
         """Форматирование урока для PDF (компактная версия)"""
         # Сокращаем имена для экономии места
-        subject_name = lesson.subject.name
+        subject_name = lesson.subject_name
         if len(subject_name) > 15:
             subject_name = subject_name[:12] + "..."
 
-        professor_name = f"{lesson.professor.name[:1]}. {lesson.professor.surname}"
+        professor_name = f"{lesson.professor_name[:1]}. {lesson.professor_surname}"
         if len(professor_name) > 15:
             professor_name = professor_name[:12] + "..."
 
@@ -541,32 +545,54 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
 
         if lesson.is_online:
             lesson_text += "ONLINE"
-        elif lesson.room:
-            lesson_text += f"R:{lesson.room.number}"
+        elif lesson.room_number is not None:
+            lesson_text += f"R:{lesson.room_number}"
 
         return lesson_text
 
     def _get_lessons_for_schedule(
         self, schedule_id: int, group_ids: Optional[List[int]] = None
-    ) -> List[Lesson]:
+    ) -> List[LessonExportRow]:
         """
         Fetch lessons for a schedule, optionally restricted to specific groups.
 
+        Lessons are loaded as flat projections (subject, professor, room and group
+        display values) with one joined query instead of lazy-loading relations per cell.
+        Occurrences of virtual recurring templates are expanded and merged in.
+
         Args:
             schedule_id (int): Schedule ID.
             group_ids (Optional[List[int]]): List of group IDs to include; None for all.
 
         Returns:
-            List[Lesson]: Lessons ordered by date and start time.
+            List[LessonExportRow]: Lessons ordered by date and start time.
         """
         """Получение уроков для расписания с возможной фильтрацией по группам"""
-        query = self.db.query(Lesson).filter(Lesson.schedule_id == schedule_id)
+        criteria = [Lesson.schedule_id == schedule_id]
 
         # Если указаны конкретные группы, фильтруем по ним
         if group_ids:
-            query = query.filter(Lesson.group_id.in_(group_ids))
+            criteria.append(Lesson.group_id.in_(group_ids))
+
+        return sort_lessons(
+            LessonRepository(self.db).get_export_rows(*criteria)
+            + VirtualLessonService(self.db).get_export_rows(schedule_id, group_ids)
+        )
+
+    def _group_lessons_by_date(self, lessons: List[LessonExportRow]) -> dict:
+        """
+        Bucket lessons by date once, so each rendered day is a dict lookup.
 
-        return query.order_by(Lesson.date, Lesson.start_time).all()
+        Args:
+            lessons (List[LessonExportRow]): Lessons ordered by date and start time.
+
+        Returns:
+            dict[date, list[LessonExportRow]]: Lessons per date, order preserved.
+        """
+        lessons_by_date = {}
+        for lesson in lessons:
+            lessons_by_date.setdefault(lesson.date, []).append(lesson)
+        return lessons_by_date
 
     def _get_groups_for_schedule(
         self, schedule_id: int, group_ids: Optional[List[int]] = None
@@ -645,7 +671,7 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
             end_date (date): End date for rendering.
             time_slots (list[str]): Column headers for time intervals.
             groups (list[Group]): Not used in current implementation (reserved).
-            lessons (list[Lesson]): Lessons to render in the grid.
+            lessons (list[LessonExportRow]): Lessons to render in the grid.
 
         Returns:
             None
@@ -692,12 +718,14 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         group_cell.alignment = Alignment(horizontal="center", vertical="center")
 
         # Заполнение дней и уроков
+        lessons_by_date = self._group_lessons_by_date(lessons)
+
         current_date = start_date
         row = 4
 
         while current_date <= end_date:
             # Получаем уроки на этот день
-            day_lessons = [lesson for lesson in lessons if lesson.date == current_date]
+            day_lessons = lessons_by_date.get(current_date, [])
 
             if not day_lessons:
                 # Если нет уроков, создаем пустую строку
@@ -723,8 +751,8 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
                 # Определяем уникальные группы для этого дня
                 groups_for_day = {}
                 for lesson in day_lessons:
-                    if lesson.group:
-                        group_name = lesson.group.name
+                    if lesson.group_name is not None:
+                        group_name = lesson.group_name
                         if group_name not in groups_for_day:
                             groups_for_day[group_name] = []
                         groups_for_day[group_name].append(lesson)
@@ -848,8 +876,8 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         return weekdays[date_obj.weekday()]
 
     def _find_lesson_in_slot(
-        self, lessons: List[Lesson], time_slot: str
-    ) -> Optional[Lesson]:
+        self, lessons: List[LessonExportRow], time_slot: str
+    ) -> Optional[LessonExportRow]:
         """
         Find a lesson that overlaps a given time slot.
 
@@ -859,11 +887,11 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         - One interval fully contains the other.
 
         Args:
-            lessons (List[Lesson]): Candidate lessons for a specific date.
+            lessons (List[LessonExportRow]): Candidate lessons for a specific date.
             time_slot (str): Slot label "HH:MM-HH:MM".
 
         Returns:
-            Optional[Lesson]: Matching lesson if found, otherwise None.
+            Optional[LessonExportRow]: Matching lesson if found, otherwise None.
         """
         """Поиск урока в временном слоте"""
         slot_start, slot_end = time_slot.split("-")
@@ -884,7 +912,7 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
 
         return None
 
-    def _fill_lesson_cell(self, cell, lesson: Lesson):
+    def _fill_lesson_cell(self, cell, lesson: LessonExportRow):
         """
         Fill an Excel cell with lesson data and apply styling.
 
@@ -899,20 +927,20 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
 
         Args:
             cell (openpyxl.cell.Cell): Target cell to fill.
-            lesson (Lesson): Lesson providing values and color.
+            lesson (LessonExportRow): Lesson providing values and color.
 
         Returns:
             None
         """
         """Заполнение ячейки урока"""
         # Формируем текст урока
-        lesson_text = f"{lesson.subject.name}\n"
-        lesson_text += f"{lesson.professor.name} {lesson.professor.surname}\n"
+        lesson_text = f"{lesson.subject_name}\n"
+        lesson_text += f"{lesson.professor_name} {lesson.professor_surname}\n"
 
         if lesson.is_online:
             lesson_text += "ONLINE"
-        elif lesson.room:
-            lesson_text += f"Room: {lesson.room.number}"
+        elif lesson.room_number is not None:
+            lesson_text += f"Room: {lesson.room_number}"
 
         cell.value = lesson_text
         cell.alignment = Alignment(
@@ -921,9 +949,9 @@ class ScheduleService(BaseService[Schedule, ScheduleIn]):
         cell.font = Font(size=9, color="FFFFFF", bold=True)
 
         # Устанавливаем цвет фона из цвета предмета
-        if lesson.subject.color:
+        if lesson.subject_color:
             # Убираем # из hex цвета
-            color_hex = lesson.subject.color.replace("#", "")
+            color_hex = lesson.subject_color.replace("#", "")
             cell.fill = PatternFill(
                 start_color=color_hex, end_color=color_hex, fill_type="solid"
             )
@@ -25,32 +25,25 @@ class StudyFormService(BaseService[StudyForm, StudyFormIn]):
         """
         super().__init__(db, StudyForm, StudyFormRepository(db))
 
-    def apply_sorting(self, query, params):
+    def sort_key(self, query, params):
         """
-        Apply sorting to the study forms query.
+        Resolve the sort column of the study forms query.
 
         Supports:
         - sort_by == "direction_name": sorts by the related Direction.name
           (joins Direction to access the column).
-        - Otherwise: falls back to BaseService.apply_sorting.
+        - Otherwise: falls back to BaseService.sort_key.
 
         Args:
             query: SQLAlchemy query object for StudyForm.
-            params: Query params providing sort_by and desc flags.
+            params: Query params providing sort_by.
 
         Returns:
-            The SQLAlchemy query with ordering applied.
+            tuple: The (possibly joined) query and the sort column.
         """
         if params.sort_by == "direction_name":
             # Join Direction to enable sorting by direction name
-            query = query.join(StudyForm.direction)
-            # Sort by Direction.name in the requested order
-            if params.desc:
-                query = query.order_by(Direction.name.desc())
-            else:
-                query = query.order_by(Direction.name.asc())
-        else:
-            # Delegate to the base class for all other sort fields
-            query = super().apply_sorting(query, params)
-
-        return query
+            return query.join(StudyForm.direction), Direction.name
+
+        # Delegate to the base class for all other sort fields
+        return super().sort_key(query, params)
@@ -4,6 +4,7 @@ from ..repositories import SubjectAssignmentRepository
 from ..models import SubjectAssignment, ProfessorWorkload
 from ..schemas.subject_assignment import SubjectAssignmentIn, SubjectAssignmentUpdate
 from .base import BaseService
+from .lesson import LessonService
 
 
 class SubjectAssignmentService(BaseService[SubjectAssignment, SubjectAssignmentIn]):
@@ -116,6 +117,9 @@ class SubjectAssignmentService(BaseService[SubjectAssignment, SubjectAssignmentI
         """
         Update an existing subject assignment after validation.
 
+        Moving the assignment to another workload may change its professor; lessons and
+        templates are then re-synced (see LessonService.sync_professor_assignments).
+
         Args:
             subject_assignment_id (int): Identifier of the assignment to update.
             subject_assignment (SubjectAssignmentUpdate): Partial update payload.
@@ -129,7 +133,13 @@ class SubjectAssignmentService(BaseService[SubjectAssignment, SubjectAssignmentI
 
         self.check_assigned_hours(subject_assignment, subject_assignment_id)
 
-        return super().update(subject_assignment_id, subject_assignment)
+        previous_workload_id = self.get_by_id(subject_assignment_id).workload_id
+        updated = super().update(subject_assignment_id, subject_assignment)
+
+        if updated.workload_id != previous_workload_id:
+            LessonService(self.db).sync_professor_assignments([updated.id])
+
+        return updated
 
     def apply_filters(self, query, params):
         """
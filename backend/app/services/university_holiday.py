@@ -1,10 +1,18 @@
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..repositories import UniversityHolidayRepository
 from ..models import UniversityHoliday
 from ..schemas.university_holiday import UniversityHolidayIn
+from ..utils.holiday_calendar import HolidayCalendar
 from .base import BaseService
 
+# Process-wide: loaded on first use, invalidated by every holiday write below
+holiday_calendar = HolidayCalendar()
+
 
 class UniversityHolidayService(BaseService[UniversityHoliday, UniversityHolidayIn]):
     """
@@ -13,6 +21,7 @@ class UniversityHolidayService(BaseService[UniversityHoliday, UniversityHolidayI
     Responsibilities:
     - Provide listing with rich filtering across related entities (semester, academic year, direction, faculty, study form).
     - Delegate CRUD operations to UniversityHolidayRepository via BaseService.
+    - Serve holiday date lookups from the shared holiday calendar and invalidate it on writes.
     """
 
     def __init__(self, db: Session):
@@ -24,104 +33,110 @@ class UniversityHolidayService(BaseService[UniversityHoliday, UniversityHolidayI
         """
         super().__init__(db, UniversityHoliday, UniversityHolidayRepository(db))
 
-    def apply_filters(self, query, params):
+    def create(self, obj_in: Any) -> UniversityHoliday:
         """
-        Apply filters for university holidays including date range filtering.
+        Create a holiday and invalidate the holiday calendar.
 
-        For date_from and date_to parameters:
-        - Non-annual holidays: filter by exact date in range
-        - Annual holidays: include if day/month falls within the date range (any year)
+        Args:
+            obj_in (Any): UniversityHolidayIn payload or plain dict.
+
+        Returns:
+            UniversityHoliday: The newly created holiday.
         """
+        holiday = super().create(obj_in)
+        holiday_calendar.invalidate()
+        return holiday
 
-        # Date range filtering
-        if params.date_from or params.date_to:
-            from sqlalchemy import and_, or_, extract
-
-            if params.date_from and params.date_to:
-                # Both dates provided - range filtering
-                date_from = params.date_from
-                date_to = params.date_to
-
-                # Non-annual holidays: simple date range
-                non_annual_filter = and_(
-                    ~UniversityHoliday.is_annual,
-                    UniversityHoliday.date >= date_from,
-                    UniversityHoliday.date <= date_to,
-                )
+    def update(self, obj_id: int, obj_in: Any) -> UniversityHoliday:
+        """
+        Update a holiday and invalidate the holiday calendar.
 
-                # Annual holidays: check if month/day falls within range
-                annual_filter = and_(
-                    UniversityHoliday.is_annual,
-                    or_(
-                        # Same month and day range
-                        and_(
-                            extract("month", UniversityHoliday.date) == date_from.month,
-                            extract("month", UniversityHoliday.date) == date_to.month,
-                            extract("day", UniversityHoliday.date) >= date_from.day,
-                            extract("day", UniversityHoliday.date) <= date_to.day,
-                        ),
-                        # Different months - include all days in start month after start_day
-                        and_(
-                            extract("month", UniversityHoliday.date) == date_from.month,
-                            extract("month", UniversityHoliday.date) < date_to.month,
-                            extract("day", UniversityHoliday.date) >= date_from.day,
-                        ),
-                        # Different months - include all days in end month before end_day
-                        and_(
-                            extract("month", UniversityHoliday.date) == date_to.month,
-                            extract("month", UniversityHoliday.date) > date_from.month,
-                            extract("day", UniversityHoliday.date) <= date_to.day,
-                        ),
-                        # Months completely between start and end
-                        and_(
-                            extract("month", UniversityHoliday.date) > date_from.month,
-                            extract("month", UniversityHoliday.date) < date_to.month,
-                        ),
-                    ),
-                )
+        Args:
+            obj_id (int): Identifier of the holiday to update.
+            obj_in (Any): UniversityHolidayUpdate payload or plain dict.
 
-                query = query.filter(or_(non_annual_filter, annual_filter))
+        Returns:
+            UniversityHoliday: The updated holiday.
+        """
+        holiday = super().update(obj_id, obj_in)
+        holiday_calendar.invalidate()
+        return holiday
 
-            elif params.date_from:
-                # Only start date - filter from that date onwards
-                date_from = params.date_from
+    def delete(self, obj_id: int):
+        """
+        Delete a holiday and invalidate the holiday calendar.
 
-                non_annual_filter = and_(
-                    ~UniversityHoliday.is_annual, UniversityHoliday.date >= date_from
-                )
+        Args:
+            obj_id (int): Identifier of the holiday to delete.
+        """
+        super().delete(obj_id)
+        holiday_calendar.invalidate()
 
-                annual_filter = and_(
-                    UniversityHoliday.is_annual,
-                    or_(
-                        extract("month", UniversityHoliday.date) > date_from.month,
-                        and_(
-                            extract("month", UniversityHoliday.date) == date_from.month,
-                            extract("day", UniversityHoliday.date) >= date_from.day,
-                        ),
-                    ),
-                )
+    def get_holiday_dates(self, start_date: date, end_date: date) -> set[date]:
+        """
+        Holiday dates in a range, annual holidays expanded, from the shared calendar.
+
+        Args:
+            start_date (date): First date (inclusive).
+            end_date (date): Last date (inclusive).
 
-                query = query.filter(or_(non_annual_filter, annual_filter))
+        Returns:
+            set[date]: Dates that are holidays.
+        """
+        return self._calendar().dates_between(start_date, end_date)
 
-            elif params.date_to:
-                # Only end date - filter up to that date
-                date_to = params.date_to
+    def get_holiday_ids(
+        self, date_from: Optional[date], date_to: Optional[date]
+    ) -> set[int]:
+        """
+        IDs of holidays falling in a date window (see HolidayCalendar.ids_between).
 
-                non_annual_filter = and_(
-                    ~UniversityHoliday.is_annual, UniversityHoliday.date <= date_to
-                )
+        Args:
+            date_from (Optional[date]): First date (inclusive).
+            date_to (Optional[date]): Last date (inclusive).
 
-                annual_filter = and_(
-                    UniversityHoliday.is_annual,
-                    or_(
-                        extract("month", UniversityHoliday.date) < date_to.month,
-                        and_(
-                            extract("month", UniversityHoliday.date) == date_to.month,
-                            extract("day", UniversityHoliday.date) <= date_to.day,
-                        ),
-                    ),
-                )
+        Returns:
+            set[int]: Matching holiday IDs.
+        """
+        return self._calendar().ids_between(date_from, date_to)
+
+    def apply_filters(self, query, params):
+        """
+        Apply filters for university holidays including date range filtering.
 
-                query = query.filter(or_(non_annual_filter, annual_filter))
+        For date_from and date_to parameters:
+        - Non-annual holidays: filter by exact date in range
+        - Annual holidays: include if day/month falls within the date range (any year)
+
+        Matching holidays are resolved from the shared holiday calendar and filtered
+        by primary key.
+        """
+        if params.date_from or params.date_to:
+            query = query.filter(
+                UniversityHoliday.id.in_(
+                    self.get_holiday_ids(params.date_from, params.date_to)
+                )
+            )
 
         return super().apply_filters(query, params)
+
+    def _calendar(self) -> HolidayCalendar:
+        """
+        The shared holiday calendar, loaded from the table if needed.
+
+        Returns:
+            HolidayCalendar: Loaded calendar.
+        """
+        if not holiday_calendar.loaded:
+            generation = holiday_calendar.generation
+            holiday_calendar.load(
+                self.db.execute(
+                    select(
+                        UniversityHoliday.id,
+                        UniversityHoliday.date,
+                        UniversityHoliday.is_annual,
+                    )
+                ).all(),
+                generation,
+            )
+        return holiday_calendar
@@ -10,7 +10,9 @@ from ..schemas.user import UserIn, UserUpdate, UserQueryParams
 from ..utils.enums import UserRoleEnum
 from ..utils import exceptions, security
 from app.utils.exceptions import AlreadyExistsException, LastAdminException
+from ..utils.recurrence import parse_unavailable_days
 from .base import BaseService
+from .recurring_template import RecurringLessonTemplateService
 
 
 class UserService(BaseService[User, UserIn]):
@@ -158,7 +160,8 @@ class UserService(BaseService[User, UserIn]):
     def update(self, user_id: int, user: UserIn | UserUpdate) -> User:
         """
         Update an existing user. Password is re-hashed if provided.
-        Updates profile data based on user type.
+        Updates profile data based on user type; a change of a professor's
+        unavailable days is propagated to the lessons of their recurring templates.
 
         Args:
             user_id (int): Identifier of the user to update.
@@ -179,6 +182,7 @@ class UserService(BaseService[User, UserIn]):
         updated_user = super().update(user_id, user_data)
 
         # Update profile based on user type using relationship
+        changed_days = set()
         if updated_user.user_type == "student" and user.student_profile:
             profile_data = user.student_profile.model_dump(exclude_none=True)
             if profile_data and updated_user.student_profile:
@@ -187,10 +191,26 @@ class UserService(BaseService[User, UserIn]):
         elif updated_user.user_type == "professor" and user.professor_profile:
             profile_data = user.professor_profile.model_dump(exclude_none=True)
             if profile_data and updated_user.professor_profile:
+                previous_days = parse_unavailable_days(
+                    updated_user.professor_profile.unavailable_days
+                )
                 for key, value in profile_data.items():
                     setattr(updated_user.professor_profile, key, value)
+                changed_days = (previous_days or set()) ^ (
+                    parse_unavailable_days(
+                        updated_user.professor_profile.unavailable_days
+                    )
+                    or set()
+                )
 
         self.db.commit()
+
+        # Lessons of the professor's templates follow the new unavailable days
+        if changed_days:
+            RecurringLessonTemplateService(self.db).propagate_unavailable_days(
+                updated_user.id, changed_days
+            )
+
         self.db.refresh(updated_user)
         return updated_user
 
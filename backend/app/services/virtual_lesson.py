@@ -0,0 +1,420 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..models import RecurringLessonException, RecurringLessonTemplate
+from ..repositories import (
+    RecurringLessonExceptionRepository,
+    RecurringLessonTemplateRepository,
+)
+from ..repositories.lesson import LessonExportRow
+from ..utils.recurrence import (
+    parse_unavailable_days,
+    parse_virtual_lesson_id,
+    template_rule,
+    virtual_lesson_id,
+)
+from .university_holiday import UniversityHolidayService
+
+
+class VirtualLesson:
+    """
+    Occurrence of a virtual recurring template, expanded at read time.
+
+    Exposes the attributes of a Lesson used by LessonOut, conflict detection and
+    exports, with the template's values overridden by the occurrence's exception.
+    The ID is synthetic and negative (see virtual_lesson_id).
+    """
+
+    __slots__ = (
+        "id",
+        "template",
+        "occurrence_date",
+        "date",
+        "start_time",
+        "end_time",
+        "room_id",
+        "room",
+        "is_online",
+        "lesson_type",
+    )
+
+    def __init__(
+        self,
+        template: RecurringLessonTemplate,
+        occurrence_date: date,
+        exception: Optional[RecurringLessonException] = None,
+    ):
+        self.id = virtual_lesson_id(template.id, occurrence_date)
+        self.template = template
+        self.occurrence_date = occurrence_date
+        self.date = occurrence_date
+        self.start_time = template.start_time
+        self.end_time = template.end_time
+        self.room_id = template.room_id
+        self.room = template.room
+        self.is_online = template.is_online
+        self.lesson_type = template.lesson_type
+
+        if exception is not None:
+            for field in ("date", "start_time", "end_time", "is_online", "lesson_type"):
+                value = getattr(exception, field)
+                if value is not None:
+                    setattr(self, field, value)
+            if exception.room_id is not None:
+                self.room_id = exception.room_id
+                self.room = exception.room
+
+    @property
+    def recurring_template_id(self) -> int:
+        return self.template.id
+
+    @property
+    def schedule_id(self) -> int:
+        return self.template.schedule_id
+
+    @property
+    def schedule(self):
+        return self.template.schedule
+
+    @property
+    def group_id(self) -> int:
+        return self.template.group_id
+
+    @property
+    def group(self):
+        return self.template.group
+
+    @property
+    def subject_assignment_id(self) -> int:
+        return self.template.subject_assignment_id
+
+    @property
+    def subject_assignment(self):
+        return self.template.subject_assignment
+
+    @property
+    def professor_user_id(self) -> Optional[int]:
+        return self.template.professor_user_id
+
+    @property
+    def workload(self):
+        return self.template.subject_assignment.workload
+
+    @property
+    def professor(self):
+        return self.template.subject_assignment.workload.contract.professor_profile.user
+
+    @property
+    def subject(self):
+        return self.template.subject_assignment.subject
+
+
+class VirtualLessonService:
+    """
+    Expansion of virtual recurring templates into lesson occurrences.
+
+    Virtual templates are the source of truth for their lessons: occurrences are
+    computed for the requested window from the pattern (holidays and the professor's
+    unavailable days skipped, as in lesson generation) and their stored exceptions,
+    so editing such a template never rewrites lesson rows.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize the virtual lesson service.
+
+        Args:
+            db (Session): Active SQLAlchemy session.
+        """
+        self.db = db
+        self.template_repo = RecurringLessonTemplateRepository(db)
+        self.exception_repo = RecurringLessonExceptionRepository(db)
+        self.holiday_service = UniversityHolidayService(db)
+        # Unavailable days memoized per subject assignment for the lifetime of the service
+        self._unavailable_days: Dict[int, Optional[set[int]]] = {}
+
+    def expand(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        *criteria,
+        with_relations: bool = True,
+    ) -> List[VirtualLesson]:
+        """
+        Expand the occurrences of virtual templates that fall in a date window.
+
+        Occurrences moved into the window from outside it are included; occurrences
+        moved out of it and cancelled ones are not.
+
+        Args:
+            date_from (Optional[date]): First date (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date (inclusive); None for unbounded.
+            *criteria: Filters on RecurringLessonTemplate (schedule, group, professor...).
+            with_relations (bool): Eager-load what LessonOut needs; conflict detection
+                only reads scalar columns and can skip it.
+
+        Returns:
+            List[VirtualLesson]: Occurrences ordered by date, start time and ID.
+        """
+        templates = self.template_repo.find_virtual(
+            or_(
+                self.template_repo.overlaps_window(date_from, date_to),
+                RecurringLessonTemplate.id.in_(
+                    self.exception_repo.moved_into_template_ids(date_from, date_to)
+                ),
+            ),
+            *criteria,
+            with_relations=with_relations,
+        )
+        return self.expand_templates(templates, date_from, date_to)
+
+    def expand_touching(
+        self, date_from: date, date_to: date, resources: Dict[str, Set[int]]
+    ) -> List[VirtualLesson]:
+        """
+        Expand the occurrences in a date window that may use any of the given resources.
+
+        Templates are matched on their group and professor and on their room or the
+        room of one of their exceptions, so a few occurrences using none of the
+        resources can be returned; callers apply their own resource keys.
+
+        Args:
+            date_from (date): First date (inclusive).
+            date_to (date): Last date (inclusive).
+            resources (Dict[str, Set[int]]): Conflict type -> resource IDs.
+
+        Returns:
+            List[VirtualLesson]: Occurrences ordered by date, start time and ID.
+        """
+        conditions = []
+        if resources["room"]:
+            conditions.append(RecurringLessonTemplate.room_id.in_(resources["room"]))
+            conditions.append(
+                RecurringLessonTemplate.id.in_(
+                    self.exception_repo.query()
+                    .filter(RecurringLessonException.room_id.in_(resources["room"]))
+                    .with_entities(RecurringLessonException.template_id)
+                    .scalar_subquery()
+                )
+            )
+        if resources["group"]:
+            conditions.append(RecurringLessonTemplate.group_id.in_(resources["group"]))
+        if resources["professor"]:
+            conditions.append(
+                RecurringLessonTemplate.professor_user_id.in_(resources["professor"])
+            )
+        if not conditions:
+            return []
+
+        return self.expand(date_from, date_to, or_(*conditions), with_relations=False)
+
+    def expand_templates(
+        self,
+        templates: Iterable[RecurringLessonTemplate],
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[VirtualLesson]:
+        """
+        Expand the occurrences of the given templates that fall in a date window.
+
+        Args:
+            templates (Iterable[RecurringLessonTemplate]): Virtual templates.
+            date_from (Optional[date]): First date (inclusive); None for unbounded.
+            date_to (Optional[date]): Last date (inclusive); None for unbounded.
+
+        Returns:
+            List[VirtualLesson]: Occurrences ordered by date, start time and ID.
+        """
+        templates = {template.id: template for template in templates}
+        exceptions = {
+            (exception.template_id, exception.occurrence_date): exception
+            for exception in self.exception_repo.get_for_templates(
+                templates.keys(), date_from, date_to
+            )
+        }
+
+        def in_window(day: date) -> bool:
+            return (not date_from or day >= date_from) and (
+                not date_to or day <= date_to
+            )
+
+        lessons = []
+        for template in templates.values():
+            for occurrence_date in self.occurrence_dates(template, date_from, date_to):
+                exception = exceptions.pop((template.id, occurrence_date), None)
+                if exception is not None and exception.is_cancelled:
+                    continue
+                lesson = VirtualLesson(template, occurrence_date, exception)
+                if in_window(lesson.date):
+                    lessons.append(lesson)
+
+        # Occurrences outside the window moved into it
+        for (template_id, occurrence_date), exception in exceptions.items():
+            if (
+                exception.is_cancelled
+                or exception.date is None
+                or in_window(occurrence_date)
+                or not in_window(exception.date)
+                or not self.occurs_on(templates[template_id], occurrence_date)
+            ):
+                continue
+            lessons.append(
+                VirtualLesson(templates[template_id], occurrence_date, exception)
+            )
+
+        return sort_lessons(lessons)
+
+    def hydrate(self, lesson_ids: Iterable[int]) -> Dict[int, VirtualLesson]:
+        """
+        Resolve synthetic occurrence IDs back to occurrences.
+
+        IDs of lesson rows and of occurrences that no longer exist (template deleted,
+        pattern changed, occurrence cancelled) are skipped.
+
+        Args:
+            lesson_ids (Iterable[int]): Lesson IDs, possibly mixed with row IDs.
+
+        Returns:
+            Dict[int, VirtualLesson]: Occurrences keyed by ID.
+        """
+        decoded = {}
+        for lesson_id in lesson_ids:
+            parsed = parse_virtual_lesson_id(lesson_id)
+            if parsed is not None:
+                decoded[lesson_id] = parsed
+        if not decoded:
+            return {}
+
+        templates = {
+            template.id: template
+            for template in self.template_repo.find_virtual(
+                RecurringLessonTemplate.id.in_(
+                    {template_id for template_id, _ in decoded.values()}
+                )
+            )
+        }
+        occurrence_dates = [occurrence_date for _, occurrence_date in decoded.values()]
+        exceptions = {
+            (exception.template_id, exception.occurrence_date): exception
+            for exception in self.exception_repo.get_for_templates(
+                templates.keys(), min(occurrence_dates), max(occurrence_dates)
+            )
+        }
+
+        lessons = {}
+        for lesson_id, (template_id, occurrence_date) in decoded.items():
+            template = templates.get(template_id)
+            if template is None or not self.occurs_on(template, occurrence_date):
+                continue
+            exception = exceptions.get((template_id, occurrence_date))
+            if exception is not None and exception.is_cancelled:
+                continue
+            lessons[lesson_id] = VirtualLesson(template, occurrence_date, exception)
+        return lessons
+
+    def get_export_rows(
+        self, schedule_id: int, group_ids: Optional[List[int]] = None
+    ) -> List[LessonExportRow]:
+        """
+        Occurrences of a schedule's virtual templates as export rows.
+
+        Args:
+            schedule_id (int): Schedule ID.
+            group_ids (Optional[List[int]]): Groups to include; None for all.
+
+        Returns:
+            List[LessonExportRow]: Rows ordered by date and start time.
+        """
+        criteria = [RecurringLessonTemplate.schedule_id == schedule_id]
+        if group_ids:
+            criteria.append(RecurringLessonTemplate.group_id.in_(group_ids))
+
+        rows = []
+        for lesson in self.expand(None, None, *criteria):
+            professor = lesson.professor
+            rows.append(
+                LessonExportRow(
+                    lesson.id,
+                    lesson.date,
+                    lesson.start_time,
+                    lesson.end_time,
+                    lesson.is_online,
+                    lesson.group.name if lesson.group else None,
+                    lesson.room.number if lesson.room else None,
+                    lesson.subject.name if lesson.subject else None,
+                    lesson.subject.color if lesson.subject else None,
+                    professor.name if professor else None,
+                    professor.surname if professor else None,
+                )
+            )
+        return rows
+
+    def occurrence_dates(
+        self,
+        template: RecurringLessonTemplate,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[date]:
+        """
+        Dates of a template's pattern in a window, as lesson generation computes them.
+
+        Args:
+            template (RecurringLessonTemplate): Template.
+            date_from (Optional[date]): First date (inclusive); None for the template's start.
+            date_to (Optional[date]): Last date (inclusive); None for the template's end.
+
+        Returns:
+            List[date]: Occurrence dates in order.
+        """
+        start = template.start_date
+        if date_from and date_from > start:
+            start = date_from
+        end = template.end_date or template.schedule.semester.end_date
+        if date_to and date_to < end:
+            end = date_to
+        if end < start:
+            return []
+
+        rule = template_rule(template).without_weekdays(
+            self._get_unavailable_days(template)
+        )
+        holiday_dates = self.holiday_service.get_holiday_dates(start, end)
+        return [day for day in rule.dates(start, end) if day not in holiday_dates]
+
+    def occurs_on(self, template: RecurringLessonTemplate, day: date) -> bool:
+        """
+        Whether a template's pattern has an occurrence on a date.
+        """
+        return bool(self.occurrence_dates(template, day, day))
+
+    def _get_unavailable_days(
+        self, template: RecurringLessonTemplate
+    ) -> Optional[set[int]]:
+        """
+        Weekdays the template's professor is unavailable on (memoized per assignment).
+        """
+        key = template.subject_assignment_id
+        if key not in self._unavailable_days:
+            professor_profile = (
+                template.subject_assignment.workload.contract.professor_profile
+                if template.subject_assignment
+                else None
+            )
+            self._unavailable_days[key] = (
+                parse_unavailable_days(professor_profile.unavailable_days)
+                if professor_profile
+                else None
+            )
+        return self._unavailable_days[key]
+
+
+def sort_lessons(lessons: Iterable) -> list:
+    """
+    Order lessons and occurrences by date, start time and ID, like lesson queries do.
+    """
+    return sorted(
+        lessons, key=lambda lesson: (lesson.date, lesson.start_time, lesson.id)
+    )
@@ -0,0 +1,148 @@
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from .enums import JobStatusEnum
+
+# Finished jobs kept for polling; the oldest are dropped first
+MAX_FINISHED_JOBS = 100
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class Job:
+    """
+    State of a background job, polled by clients until it finishes.
+
+    Fields:
+    - id: opaque job identifier
+    - status: pending, running stage, succeeded or failed
+    - total/processed: progress of the current stage, in items
+    - result: payload set by the job (for failed jobs too, e.g. validation errors)
+    - error: message of a failed job
+    """
+
+    def __init__(self, total: int):
+        self.id = uuid.uuid4().hex
+        self.status = JobStatusEnum.pending
+        self.total = total
+        self.processed = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the job succeeded or failed.
+        """
+        return self.status in (JobStatusEnum.succeeded, JobStatusEnum.failed)
+
+
+class JobRegistry:
+    """
+    In-process registry of background jobs.
+
+    Jobs live in memory of the API process (like the conflict summary cache), so
+    they are lost on restart; only the most recent finished jobs are kept.
+    Mutations go through the registry so pollers never see half-updated jobs.
+    """
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+
+    def create(self, total: int) -> Job:
+        """
+        Register a new pending job.
+
+        Args:
+            total (int): Number of items the job processes.
+
+        Returns:
+            Job: The new job.
+        """
+        job = Job(total)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Snapshot of a job, consistent even while its worker keeps updating it.
+
+        Args:
+            job_id (str): Job to find.
+
+        Returns:
+            Optional[Job]: Copy of the job, or None if it is unknown or was dropped.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.copy(job) if job else None
+
+    def update(self, job_id: str, **values: Any) -> None:
+        """
+        Set fields of a job; finishing it stamps finished_at.
+
+        Args:
+            job_id (str): Job to update.
+            **values: Job fields (status, processed, total, result, error).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            for field, value in values.items():
+                setattr(job, field, value)
+            if job.finished and job.finished_at is None:
+                job.finished_at = datetime.now()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the limit (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+
+def submit_job(fn: Callable[..., Any], *args: Any) -> None:
+    """
+    Run a function on the shared background worker thread, creating it on first use.
+
+    Jobs run one at a time, in submission order, so bulk writes never compete for
+    the database with each other.
+
+    Args:
+        fn (Callable[..., Any]): Job function; it must open its own database session.
+        *args: Arguments of the function.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="background-job"
+            )
+        _executor.submit(fn, *args)
+
+
+def shutdown_jobs() -> None:
+    """
+    Stop the background worker thread if it was started (application shutdown).
+
+    The running job is finished; queued ones are dropped.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
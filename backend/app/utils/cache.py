@@ -0,0 +1,414 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+# (table name, primary key identity) of a row
+RowKey = tuple[str, tuple]
+
+
+class CacheBackend:
+    """
+    Interface of the versioned in-process caches.
+
+    Entries carry the version they were computed for; a lookup with another version
+    is a miss. Backends are selected by name with create_cache().
+    """
+
+    def get(
+        self,
+        key: Hashable,
+        version: Any,
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Any]:
+        """
+        Return the cached value for key if it was stored for this version.
+
+        Args:
+            key (Hashable): Cache key.
+            version (Any): Current version of the data the value depends on.
+            valid (Optional[Callable[[Any], bool]]): Further check of the value; a
+                value failing it is dropped like one of another version.
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss.
+        """
+        raise NotImplementedError
+
+    def put(self, key: Hashable, version: Any, value: Any, size: int) -> None:
+        """
+        Store a value computed for a version.
+
+        Args:
+            key (Hashable): Cache key.
+            version (Any): Version the value was computed for.
+            value (Any): Value to cache; must not be mutated afterwards.
+            size (int): Approximate size of the value in bytes.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Drop all entries (counters are kept).
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """
+        Snapshot of cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """
+    In-process LRU cache with a memory budget and hit/miss counters.
+
+    Every entry carries the version it was computed for and its approximate size
+    in bytes. A lookup with a different version is a miss and drops the entry, so
+    callers invalidate by bumping a version instead of tracking keys. When the
+    byte budget is exceeded, least recently used entries are evicted.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes (int): Memory budget; entries larger than it are not stored.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        # key -> (version, value, size)
+        self._entries: OrderedDict[Hashable, tuple[Any, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        version: Any,
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Any]:
+        """
+        Return the cached value for key if it was stored for this version.
+
+        Args:
+            key (Hashable): Cache key.
+            version (Any): Current version of the data the value depends on.
+            valid (Optional[Callable[[Any], bool]]): Further check of the value; a
+                value failing it is dropped like one of another version.
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or entry[0] != version
+                or (valid is not None and not valid(entry[1]))
+            ):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Any, value: Any, size: int) -> None:
+        """
+        Store a value and evict least recently used entries beyond the budget.
+
+        Args:
+            key (Hashable): Cache key.
+            version (Any): Version the value was computed for.
+            value (Any): Value to cache; must not be mutated afterwards.
+            size (int): Approximate size of the value in bytes.
+        """
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop all entries (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Snapshot of cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+class NullCache(CacheBackend):
+    """
+    Cache backend that stores nothing (caching disabled); every lookup is a miss.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        version: Any,
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Any]:
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: Hashable, version: Any, value: Any, size: int) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "hits": 0,
+            "misses": self.misses,
+            "evictions": 0,
+            "entries": 0,
+            "bytes": 0,
+            "max_bytes": 0,
+        }
+
+
+CACHE_BACKENDS: dict[str, type[CacheBackend]] = {
+    "memory": LRUCache,
+    "none": NullCache,
+}
+
+
+def create_cache(backend: str, max_bytes: int) -> CacheBackend:
+    """
+    Create a cache with the backend of the given name.
+
+    Args:
+        backend (str): Backend name (see CACHE_BACKENDS).
+        max_bytes (int): Memory budget of the cache.
+
+    Returns:
+        CacheBackend: The new cache.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(
+            f"Unknown cache backend {backend!r}; expected one of {sorted(CACHE_BACKENDS)}"
+        )
+    return CACHE_BACKENDS[backend](max_bytes=max_bytes)
+
+
+class DateVersionClock:
+    """
+    Monotonic version counter with per-date granularity.
+
+    Writes bump the dates they touch; the version of a date window is the latest
+    bump inside it (or of a global bump), so a write on one date does not
+    invalidate cached results for windows that do not contain it.
+
+    At most max_dates dates keep their own bump: beyond that, the least recently
+    bumped half is folded into the global version. Windows then look changed
+    earlier than they were (a cache miss), never later.
+    """
+
+    def __init__(self, max_dates: int = 4096):
+        """
+        Args:
+            max_dates (int): Number of dates tracked individually.
+        """
+        self._counter = 0
+        self._global = 0  # Version of the last bump that affected every date
+        self._dates: list[date] = []  # Sorted dates with their own bump
+        self._stamps: dict[date, int] = {}
+        self._max_dates = max_dates
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        """
+        Latest version handed out (global version of the whole table).
+        """
+        return self._counter
+
+    def bump(self, dates: Iterable[date]) -> int:
+        """
+        Mark the given dates as changed.
+
+        Args:
+            dates (Iterable[date]): Dates whose data changed.
+
+        Returns:
+            int: The new version.
+        """
+        with self._lock:
+            self._counter += 1
+            for changed in set(dates):
+                if changed not in self._stamps:
+                    self._dates.insert(bisect_left(self._dates, changed), changed)
+                self._stamps[changed] = self._counter
+            if len(self._dates) > self._max_dates:
+                self._fold()
+            return self._counter
+
+    def bump_all(self) -> int:
+        """
+        Mark every date as changed (bulk rebuilds, writes with unknown dates).
+
+        Returns:
+            int: The new version.
+        """
+        with self._lock:
+            self._counter += 1
+            self._global = self._counter
+            self._dates.clear()
+            self._stamps.clear()
+            return self._counter
+
+    def version(
+        self, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> int:
+        """
+        Version of an inclusive date window; open bounds extend to all dates.
+
+        Args:
+            date_from (Optional[date]): Window start.
+            date_to (Optional[date]): Window end.
+
+        Returns:
+            int: Latest bump that affected any date of the window.
+        """
+        with self._lock:
+            lo = bisect_left(self._dates, date_from) if date_from else 0
+            hi = bisect_right(self._dates, date_to) if date_to else len(self._dates)
+            return max(
+                [self._global, *(self._stamps[day] for day in self._dates[lo:hi])]
+            )
+
+    def _fold(self) -> None:
+        """Fold the least recently bumped half of the dates into the global version."""
+        by_stamp = sorted(self._stamps, key=self._stamps.__getitem__)
+        folded = by_stamp[: len(by_stamp) - self._max_dates // 2]
+        self._global = max([self._global, *(self._stamps.pop(day) for day in folded)])
+        self._dates = sorted(self._stamps)
+
+
+class RowVersionClock:
+    """
+    Monotonic version counter with per-row granularity.
+
+    Writes bump the rows they touch, or whole tables when the written rows are not
+    known (set-based statements); the version of a set of rows is the latest bump
+    of any of them or of their tables, so a cached value built from some rows stays
+    valid while other rows change.
+
+    At most max_rows rows keep their own bump: beyond that, the least recently
+    bumped half is folded into their tables' versions. Rows then look changed
+    earlier than they were (a cache miss), never later.
+    """
+
+    def __init__(self, max_rows: int = 65536):
+        """
+        Args:
+            max_rows (int): Number of rows tracked individually.
+        """
+        self._counter = 0
+        self._rows: dict[RowKey, int] = {}
+        self._tables: dict[str, int] = {}
+        self._max_rows = max_rows
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        """
+        Latest version handed out.
+        """
+        return self._counter
+
+    def bump(self, rows: Iterable[RowKey] = (), tables: Iterable[str] = ()) -> int:
+        """
+        Mark rows and whole tables as changed.
+
+        Args:
+            rows (Iterable[RowKey]): Rows that changed.
+            tables (Iterable[str]): Tables with changes to unknown rows.
+
+        Returns:
+            int: The new version.
+        """
+        with self._lock:
+            self._counter += 1
+            for row in rows:
+                self._rows[row] = self._counter
+            for table in tables:
+                self._tables[table] = self._counter
+            if len(self._rows) > self._max_rows:
+                self._fold()
+            return self._counter
+
+    def version(self, rows: Iterable[RowKey]) -> int:
+        """
+        Version of a set of rows.
+
+        Args:
+            rows (Iterable[RowKey]): Rows a value was built from.
+
+        Returns:
+            int: Latest bump that affected any of the rows (0 if none did).
+        """
+        with self._lock:
+            return max(
+                (
+                    max(self._rows.get(row, 0), self._tables.get(row[0], 0))
+                    for row in rows
+                ),
+                default=0,
+            )
+
+    def _fold(self) -> None:
+        """Fold the least recently bumped half of the rows into their tables' versions."""
+        by_stamp = sorted(self._rows, key=self._rows.__getitem__)
+        for row in by_stamp[: len(by_stamp) - self._max_rows // 2]:
+            stamp = self._rows.pop(row)
+            self._tables[row[0]] = max(self._tables.get(row[0], 0), stamp)
@@ -0,0 +1,47 @@
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+class ConditionalRequest:
+    """
+    Conditional GET support for list and calendar endpoints (FastAPI dependency).
+
+    Services compute the ETag of the data a request would return and call check()
+    before loading it: a client already holding that version gets 304 Not Modified,
+    otherwise the ETag is sent along with the response.
+    """
+
+    def __init__(self, request: Request, response: Response):
+        """
+        Args:
+            request (Request): Incoming request (If-None-Match is read from it).
+            response (Response): Outgoing response (the ETag header is set on it).
+        """
+        self.if_none_match: Optional[str] = request.headers.get("if-none-match")
+        self.response = response
+
+    def check(self, etag: str) -> None:
+        """
+        Answer 304 if the client's copy is current, otherwise attach the ETag.
+
+        Args:
+            etag (str): Quoted ETag of the current data.
+
+        Raises:
+            HTTPException: 304 if If-None-Match matches the ETag.
+        """
+        if self.matches(etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        self.response.headers["ETag"] = etag
+
+    def matches(self, etag: str) -> bool:
+        """
+        Whether If-None-Match names the ETag (weak comparison, as RFC 9110 requires).
+        """
+        if not self.if_none_match:
+            return False
+        tags = [tag.strip() for tag in self.if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
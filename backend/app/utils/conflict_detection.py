@@ -0,0 +1,198 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from .intervals import sweep_overlap_clusters
+
+# Compact lesson tuple shipped to worker processes (cheap to pickle, no ORM state):
+# (id, start_seconds, end_seconds, room_id, group_id, is_online, professor_user_id)
+LessonTuple = tuple[int, int, int, Optional[int], Optional[int], bool, Optional[int]]
+
+# (conflict type, resource id, ids of the lessons in the overlap cluster)
+ConflictTuple = tuple[str, int, list[int]]
+
+ID, START, END, ROOM, GROUP, ONLINE, PROFESSOR = range(7)
+
+CONFLICT_TYPES = ("room", "professor", "group")
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+
+
+def to_lesson_tuple(lesson, professor_id: Optional[int]) -> LessonTuple:
+    """
+    Pack the fields conflict rules need into a LessonTuple.
+
+    Args:
+        lesson (Lesson | LessonRow): Lesson to pack.
+        professor_id (Optional[int]): Resolved professor user ID of the lesson.
+
+    Returns:
+        LessonTuple: Times are converted to seconds since midnight.
+    """
+    start, end = lesson.start_time, lesson.end_time
+    return (
+        lesson.id,
+        start.hour * 3600 + start.minute * 60 + start.second,
+        end.hour * 3600 + end.minute * 60 + end.second,
+        lesson.room_id,
+        lesson.group_id,
+        bool(lesson.is_online),
+        professor_id,
+    )
+
+
+def is_room_conflict(professor_ids: set) -> bool:
+    """
+    Room rule: overlapping lessons in one room clash unless one professor teaches all
+    of them (a multi-group lesson).
+
+    Args:
+        professor_ids (set): Known professor IDs of the overlapping lessons.
+
+    Returns:
+        bool: True if the overlap is a conflict.
+    """
+    return len(professor_ids) != 1
+
+
+def is_professor_conflict(room_ids: set, online_lessons: int) -> bool:
+    """
+    Professor rule: overlapping lessons of one professor clash unless they are all in
+    the same room or all online (a multi-group lesson).
+
+    Args:
+        room_ids (set): Rooms of the on-site overlapping lessons.
+        online_lessons (int): Number of online lessons in the overlap.
+
+    Returns:
+        bool: True if the overlap is a conflict.
+    """
+    return not (len(room_ids) <= 1 and (len(room_ids) == 0 or online_lessons == 0))
+
+
+def _room_key(lesson: LessonTuple) -> Optional[int]:
+    return lesson[ROOM] if lesson[ROOM] and not lesson[ONLINE] else None
+
+
+def _professor_key(lesson: LessonTuple) -> Optional[int]:
+    return lesson[PROFESSOR]
+
+
+def _group_key(lesson: LessonTuple) -> Optional[int]:
+    return lesson[GROUP]
+
+
+def detect_day_conflicts(
+    lessons: list[LessonTuple], conflict_types: Optional[Iterable[str]] = None
+) -> list[ConflictTuple]:
+    """
+    Detect conflicts among LessonTuples of one date.
+
+    Pure function (no database, no ORM), so it can run in a worker process. Applies
+    the same sweep and rules as LessonService.find_conflicts_in_day and returns
+    conflicts in the same order: room, then professor, then group.
+
+    Args:
+        lessons (list[LessonTuple]): Lessons of a single date.
+        conflict_types (Optional[Iterable[str]]): Subset of CONFLICT_TYPES; None for all.
+
+    Returns:
+        list[ConflictTuple]: (type, resource id, lesson ids) per conflicting cluster.
+    """
+    key_funcs = {
+        "room": _room_key,
+        "professor": _professor_key,
+        "group": _group_key,
+    }
+    keys = {
+        conflict_type: key_funcs[conflict_type]
+        for conflict_type in CONFLICT_TYPES
+        if not conflict_types or conflict_type in conflict_types
+    }
+
+    overlaps = sweep_overlap_clusters(
+        lessons,
+        keys,
+        start=lambda lesson: lesson[START],
+        end=lambda lesson: lesson[END],
+    )
+    conflicts: list[ConflictTuple] = []
+
+    for room_id, clusters in overlaps.get("room", {}).items():
+        for cluster in clusters:
+            professors = {lesson[PROFESSOR] for lesson in cluster if lesson[PROFESSOR]}
+            if is_room_conflict(professors):
+                conflicts.append(("room", room_id, [lesson[ID] for lesson in cluster]))
+
+    for professor_id, clusters in overlaps.get("professor", {}).items():
+        for cluster in clusters:
+            rooms = {
+                lesson[ROOM]
+                for lesson in cluster
+                if not lesson[ONLINE] and lesson[ROOM]
+            }
+            online_lessons = sum(1 for lesson in cluster if lesson[ONLINE])
+            if is_professor_conflict(rooms, online_lessons):
+                conflicts.append(
+                    ("professor", professor_id, [lesson[ID] for lesson in cluster])
+                )
+
+    for group_id, clusters in overlaps.get("group", {}).items():
+        for cluster in clusters:
+            conflicts.append(("group", group_id, [lesson[ID] for lesson in cluster]))
+
+    return conflicts
+
+
+def resolve_workers(configured: int) -> int:
+    """
+    Translate the configured worker count into an actual one.
+
+    Args:
+        configured (int): Setting value; 0 (or negative) means "one per CPU".
+
+    Returns:
+        int: Number of worker processes to use (>= 1).
+    """
+    if configured > 0:
+        return configured
+    return os.cpu_count() or 1
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use.
+
+    Workers are spawned (not forked) so they never inherit open database
+    connections or other state of the API process.
+
+    Args:
+        workers (int): Pool size.
+
+    Returns:
+        ProcessPoolExecutor: Shared pool for conflict detection.
+    """
+    global _executor, _executor_workers
+
+    if _executor is None or _executor_workers != workers:
+        shutdown_executor()
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _executor_workers = workers
+
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """
+    Shut down the shared process pool if it was started (application shutdown).
+    """
+    global _executor, _executor_workers
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
@@ -0,0 +1,250 @@
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from .conflict_detection import CONFLICT_TYPES, ConflictTuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: without NumPy the Python sweep is used
+    np = None
+
+# Sentinel for missing room/group/professor IDs in the integer columns
+NULL_ID = -1
+
+# Offset separating (date, resource) segments in the running maximum of end times;
+# larger than any end time in seconds since midnight
+SEGMENT_SPAN = 2 * 86400
+
+
+def is_available() -> bool:
+    """
+    Whether the vectorized kernel can be used (NumPy is installed).
+    """
+    return np is not None
+
+
+class LessonColumns(NamedTuple):
+    """
+    Lesson window as parallel NumPy arrays (one entry per lesson, input order).
+    """
+
+    day: "np.ndarray"  # Date ordinal
+    start: "np.ndarray"  # Seconds since midnight
+    end: "np.ndarray"
+    room: "np.ndarray"  # NULL_ID if unset
+    group: "np.ndarray"
+    professor: "np.ndarray"
+    online: "np.ndarray"  # bool
+
+
+def _seconds(value) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _id_or_null(value: Optional[int]) -> int:
+    return NULL_ID if value is None else value
+
+
+def to_columns(lessons: Sequence) -> LessonColumns:
+    """
+    Load lessons (ORM objects or LessonRow projections) into NumPy columns.
+
+    Args:
+        lessons (Sequence[Lesson | LessonRow]): Lessons of the window.
+
+    Returns:
+        LessonColumns: Columns in the order of the input.
+    """
+    table = np.array(
+        [
+            (
+                lesson.date.toordinal(),
+                _seconds(lesson.start_time),
+                _seconds(lesson.end_time),
+                _id_or_null(lesson.room_id),
+                _id_or_null(lesson.group_id),
+                _id_or_null(lesson.professor_user_id),
+                bool(lesson.is_online),
+            )
+            for lesson in lessons
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 7)
+
+    day, start, end, room, group, professor, online = table.T
+    return LessonColumns(day, start, end, room, group, professor, online.astype(bool))
+
+
+def _distinct_per_cluster(cluster_ids, values, cluster_count: int):
+    """
+    Count distinct values per cluster (values must be non-negative).
+    """
+    if not len(values):
+        return np.zeros(cluster_count, dtype=np.int64)
+    stride = int(values.max()) + 1
+    pairs = np.unique(cluster_ids * stride + values)
+    return np.bincount(pairs // stride, minlength=cluster_count)
+
+
+def _clusters(columns: LessonColumns, keys, valid, day_rank, sweep_rank):
+    """
+    Overlap clusters of one resource type over the whole window.
+
+    Lessons are lexsorted into (date, resource) segments in sweep order; a lesson
+    opens a new cluster when it starts at or after the running maximum end of its
+    segment, which is what the Python sweep does one lesson at a time.
+
+    Returns:
+        tuple: (order, cluster start offsets into order, cluster sizes, order key of
+        each cluster's resource within its date).
+    """
+    positions = np.flatnonzero(valid)
+    order = positions[
+        np.lexsort((sweep_rank[positions], keys[positions], day_rank[positions]))
+    ]
+    if not len(order):
+        empty = np.zeros(0, dtype=np.int64)
+        return order, empty, empty, empty
+
+    day, key = day_rank[order], keys[order]
+    new_segment = np.ones(len(order), dtype=bool)
+    new_segment[1:] = (day[1:] != day[:-1]) | (key[1:] != key[:-1])
+    segment = np.cumsum(new_segment) - 1
+
+    offset = segment * SEGMENT_SPAN
+    running_end = np.maximum.accumulate(columns.end[order] + offset)
+    new_cluster = new_segment.copy()
+    new_cluster[1:] |= columns.start[order][1:] + offset[1:] >= running_end[:-1]
+
+    starts = np.flatnonzero(new_cluster)
+    sizes = np.diff(np.append(starts, len(order)))
+    cluster_segment = segment[starts]
+
+    # Resources enter the sweep result when their first multi-lesson cluster is
+    # closed by a later lesson of the same resource, or, if it is never closed, at
+    # the final flush in order of the resource's first lesson.
+    segment_starts = np.flatnonzero(new_segment)
+    resource_order = np.full(len(segment_starts), np.iinfo(np.int64).max)
+    multi = np.flatnonzero(sizes > 1)
+    first_multi = multi[np.unique(cluster_segment[multi], return_index=True)[1]]
+    segments = cluster_segment[first_multi]
+    count = len(order)
+    closing = np.minimum(starts[first_multi] + sizes[first_multi], count - 1)
+    is_closed = (starts[first_multi] + sizes[first_multi] < count) & ~new_segment[
+        closing
+    ]
+    # Closed during the sweep: rank of the closing lesson; flushed: after all of them
+    resource_order[segments] = np.where(
+        is_closed,
+        sweep_rank[order[closing]],
+        len(sweep_rank) + sweep_rank[order[segment_starts[segments]]],
+    )
+
+    return order, starts, sizes, resource_order[cluster_segment]
+
+
+def detect_conflicts(
+    columns: LessonColumns, conflict_types: Optional[Iterable[str]] = None
+) -> list[ConflictTuple]:
+    """
+    Detect conflicts over a whole lesson window with array operations.
+
+    Same rules and same output order as running detect_day_conflicts day by day
+    (dates in order of first appearance), but without a Python loop per lesson.
+    Lesson references in the result are positions in the input, not lesson IDs.
+
+    Args:
+        columns (LessonColumns): Lesson window from to_columns().
+        conflict_types (Optional[Iterable[str]]): Subset of CONFLICT_TYPES; None for all.
+
+    Returns:
+        list[ConflictTuple]: (type, resource id, input positions) per conflicting cluster.
+    """
+    count = len(columns.day)
+    if not count:
+        return []
+
+    position = np.arange(count)
+    _, first_seen, inverse = np.unique(
+        columns.day, return_index=True, return_inverse=True
+    )
+    day_rank = np.argsort(np.argsort(first_seen, kind="stable"), kind="stable")[inverse]
+    sweep_rank = np.empty(count, dtype=np.int64)
+    sweep_rank[np.lexsort((position, columns.end, columns.start, day_rank))] = position
+
+    on_site_room = (columns.room > 0) & ~columns.online
+    resources = {
+        "room": (columns.room, on_site_room),
+        "professor": (columns.professor, columns.professor != NULL_ID),
+        "group": (columns.group, columns.group != NULL_ID),
+    }
+
+    # Kept clusters of every type; begin/size index into the concatenated orders
+    orders, parts, base = [], [], 0
+    for type_index, conflict_type in enumerate(CONFLICT_TYPES):
+        if conflict_types and conflict_type not in conflict_types:
+            continue
+
+        keys, valid = resources[conflict_type]
+        order, starts, sizes, resource_order = _clusters(
+            columns, keys, valid, day_rank, sweep_rank
+        )
+        multi = sizes > 1
+        if not multi.any():
+            continue
+
+        cluster_of = np.repeat(np.arange(len(starts)), sizes)
+        if conflict_type == "room":
+            # Exempt: every lesson taught by the same professor (multi-group lesson)
+            professors = columns.professor[order]
+            known = professors > 0
+            distinct = _distinct_per_cluster(
+                cluster_of[known], professors[known], len(starts)
+            )
+            keep = multi & (distinct != 1)
+        elif conflict_type == "professor":
+            # Exempt: all lessons in one room, or all online (multi-group lesson)
+            rooms = columns.room[order]
+            on_site = on_site_room[order]
+            distinct = _distinct_per_cluster(
+                cluster_of[on_site], rooms[on_site], len(starts)
+            )
+            online = np.bincount(
+                cluster_of, weights=columns.online[order], minlength=len(starts)
+            )
+            keep = multi & ~((distinct <= 1) & ((distinct == 0) | (online == 0)))
+        else:
+            keep = multi
+
+        kept = np.flatnonzero(keep)
+        first = order[starts[kept]]
+        parts.append(
+            (
+                day_rank[first],
+                np.full(len(kept), type_index),
+                resource_order[kept],
+                base + starts[kept],
+                sizes[kept],
+                keys[first],
+            )
+        )
+        orders.append(order)
+        base += len(order)
+
+    if not parts:
+        return []
+
+    day, type_index, resource_order, begin, size, resource = (
+        np.concatenate(column) for column in zip(*parts)
+    )
+    sequence = np.lexsort((begin, resource_order, type_index, day))
+    members = np.concatenate(orders).tolist()
+
+    return [
+        (CONFLICT_TYPES[conflict_type], resource_id, members[start : start + length])
+        for conflict_type, resource_id, start, length in zip(
+            type_index[sequence].tolist(),
+            resource[sequence].tolist(),
+            begin[sequence].tolist(),
+            size[sequence].tolist(),
+        )
+    ]
@@ -32,3 +32,44 @@ class SemesterPeriodEnum(str, enum.Enum):
 class ExportFormat(str, enum.Enum):
     excel = "excel"
     pdf = "pdf"
+
+
+class ConflictStrategyEnum(str, enum.Enum):
+    index = "index"
+    scan = "scan"
+    sql = "sql"
+
+
+class CalendarFormatEnum(str, enum.Enum):
+    full = "full"
+    compact = "compact"
+
+
+class PaginationModeEnum(str, enum.Enum):
+    offset = "offset"
+    cursor = "cursor"
+
+
+class ConflictTypeEnum(str, enum.Enum):
+    room = "room"
+    professor = "professor"
+    group = "group"
+
+
+class ConflictScopeEnum(str, enum.Enum):
+    single = "single"
+    shared = "shared"
+
+
+class WeekParityEnum(str, enum.Enum):
+    odd = "odd"
+    even = "even"
+
+
+class JobStatusEnum(str, enum.Enum):
+    pending = "pending"
+    validating = "validating"
+    checking = "checking"
+    writing = "writing"
+    succeeded = "succeeded"
+    failed = "failed"
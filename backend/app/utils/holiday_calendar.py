@@ -0,0 +1,173 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Iterable, Optional
+
+
+class HolidayCalendar:
+    """
+    In-process calendar of holiday dates with annual holidays expanded per year.
+
+    Holds a snapshot of the holiday table: one-time holidays as a sorted array, and
+    annual holidays as (month, day) pairs that are expanded into concrete dates the
+    first time a year is queried. Each expanded year is kept as sorted arrays of
+    dates and holiday IDs, so range queries are two bisects per year.
+
+    The snapshot is loaded lazily by the caller and dropped by invalidate() after
+    any holiday write; a load that started before an invalidation is discarded.
+    """
+
+    def __init__(self):
+        self._loaded = False
+        self._generation = 0  # Bumped by invalidate()
+        self._one_time_dates: list[date] = []  # Sorted
+        self._one_time_ids: list[int] = []  # Aligned with _one_time_dates
+        self._annual: list[tuple[int, int, int]] = []  # (month, day, id)
+        self._years: dict[int, tuple[list[date], list[int]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether a snapshot of the holiday table is loaded.
+        """
+        return self._loaded
+
+    @property
+    def generation(self) -> int:
+        """
+        Invalidation counter; pass the value read before querying the table to load().
+        """
+        return self._generation
+
+    def load(self, holidays: Iterable[tuple[int, date, bool]], generation: int) -> None:
+        """
+        Replace the snapshot with the given holiday rows.
+
+        Args:
+            holidays (Iterable[tuple[int, date, bool]]): (id, date, is_annual) of every holiday.
+            generation (int): Value of `generation` read before the rows were queried.
+        """
+        one_time = []
+        annual = []
+        for holiday_id, holiday_date, is_annual in holidays:
+            if is_annual:
+                annual.append((holiday_date.month, holiday_date.day, holiday_id))
+            else:
+                one_time.append((holiday_date, holiday_id))
+        one_time.sort()
+
+        with self._lock:
+            if generation != self._generation:
+                return  # Invalidated while the rows were being read
+            self._one_time_dates = [holiday_date for holiday_date, _ in one_time]
+            self._one_time_ids = [holiday_id for _, holiday_id in one_time]
+            self._annual = sorted(annual)
+            self._years = {}
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        """
+        Drop the snapshot; the next query reloads it.
+        """
+        with self._lock:
+            self._generation += 1
+            self._loaded = False
+            self._one_time_dates = []
+            self._one_time_ids = []
+            self._annual = []
+            self._years = {}
+
+    def dates_between(self, start: date, end: date) -> set[date]:
+        """
+        Holiday dates in [start, end], annual holidays included.
+
+        Args:
+            start (date): First date (inclusive).
+            end (date): Last date (inclusive).
+
+        Returns:
+            set[date]: Dates that are holidays.
+        """
+        with self._lock:
+            holiday_dates = set()
+            for year in range(start.year, end.year + 1):
+                dates, _ = self._year(year)
+                holiday_dates.update(
+                    dates[bisect_left(dates, start) : bisect_right(dates, end)]
+                )
+            return holiday_dates
+
+    def ids_between(self, start: Optional[date], end: Optional[date]) -> set[int]:
+        """
+        IDs of holidays that fall in a date window.
+
+        With both bounds, a holiday matches if any of its dates lies in [start, end].
+        With one bound, one-time holidays match on their date, and annual holidays
+        match on their occurrence in the year of the given bound (on or after start,
+        or on or before end).
+
+        Args:
+            start (Optional[date]): First date (inclusive).
+            end (Optional[date]): Last date (inclusive).
+
+        Returns:
+            set[int]: Matching holiday IDs.
+        """
+        if start and end:
+            with self._lock:
+                holiday_ids = set()
+                for year in range(start.year, end.year + 1):
+                    dates, ids = self._year(year)
+                    holiday_ids.update(
+                        ids[bisect_left(dates, start) : bisect_right(dates, end)]
+                    )
+                return holiday_ids
+
+        with self._lock:
+            if start:
+                lo, hi = bisect_left(self._one_time_dates, start), None
+                annual_from, annual_to = start, date(start.year, 12, 31)
+            else:
+                lo, hi = 0, bisect_right(self._one_time_dates, end)
+                annual_from, annual_to = date(end.year, 1, 1), end
+            holiday_ids = set(self._one_time_ids[lo:hi])
+            holiday_ids.update(
+                holiday_id
+                for holiday_date, holiday_id in self._expand_annual(annual_from.year)
+                if annual_from <= holiday_date <= annual_to
+            )
+            return holiday_ids
+
+    def _year(self, year: int) -> tuple[list[date], list[int]]:
+        """
+        Sorted holiday dates of a year and their IDs (caller holds the lock).
+        """
+        expanded = self._years.get(year)
+        if expanded is None:
+            lo = bisect_left(self._one_time_dates, date(year, 1, 1))
+            hi = bisect_right(self._one_time_dates, date(year, 12, 31))
+            entries = sorted(
+                [
+                    *zip(self._one_time_dates[lo:hi], self._one_time_ids[lo:hi]),
+                    *self._expand_annual(year),
+                ]
+            )
+            expanded = (
+                [holiday_date for holiday_date, _ in entries],
+                [holiday_id for _, holiday_id in entries],
+            )
+            self._years[year] = expanded
+        return expanded
+
+    def _expand_annual(self, year: int) -> list[tuple[date, int]]:
+        """
+        Dates of the annual holidays in a year; Feb 29 is skipped in non-leap years.
+        """
+        expanded = []
+        for month, day, holiday_id in self._annual:
+            try:
+                expanded.append((date(year, month, day), holiday_id))
+            except ValueError:
+                continue
+        return expanded
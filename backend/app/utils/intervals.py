@@ -0,0 +1,83 @@
+from typing import Any, Callable, Hashable, Iterable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+KeyFunc = Callable[[T], Hashable | None]
+
+
+def _default_start(item) -> Any:
+    return item.start_time
+
+
+def _default_end(item) -> Any:
+    return item.end_time
+
+
+def sweep_overlap_clusters(
+    items: Iterable[T],
+    keys: Mapping[str, KeyFunc],
+    start: Callable[[T], Any] = _default_start,
+    end: Callable[[T], Any] = _default_end,
+) -> dict[str, dict[Hashable, list[list[T]]]]:
+    """
+    Find clusters of overlapping intervals for several resource keys in one sorted pass.
+
+    Items are sorted once by (start, end). The sweep keeps one open cluster per
+    (bucket, resource) pair together with the furthest end time seen in it; an item
+    joins the open cluster when it starts before that end, otherwise the cluster is
+    closed and a new one is opened. Clusters are therefore connected components of
+    the overlap graph, so chains (A overlaps B, B overlaps C) end up in one cluster
+    even when A and C do not overlap.
+
+    Intervals are half-open: an item ending at 10:00 does not overlap one starting at 10:00.
+
+    Args:
+        items (Iterable[T]): Intervals to analyze (e.g. lessons of a single date).
+        keys (Mapping[str, KeyFunc]): Bucket name -> function returning the resource
+            key of an item (room id, professor id, ...). Items whose key is None are
+            skipped for that bucket.
+        start (Callable[[T], Any]): Accessor for the interval start. Defaults to `start_time`.
+        end (Callable[[T], Any]): Accessor for the interval end. Defaults to `end_time`.
+
+    Returns:
+        dict[str, dict[Hashable, list[list[T]]]]: For every bucket name, a mapping of
+            resource key -> clusters (lists of >= 2 items ordered by start). Resources
+            appear in order of their first clustered item. Complexity is O(n log n)
+            for the sort plus O(n * len(keys)) for the sweep.
+    """
+    ordered = sorted(items, key=lambda item: (start(item), end(item)))
+
+    result: dict[str, dict[Hashable, list[list[T]]]] = {name: {} for name in keys}
+    # bucket name -> resource key -> [cluster items, furthest end]
+    open_clusters: dict[str, dict[Hashable, list]] = {name: {} for name in keys}
+
+    for item in ordered:
+        item_start = start(item)
+        item_end = end(item)
+
+        for name, key_func in keys.items():
+            resource = key_func(item)
+            if resource is None:
+                continue
+
+            bucket = open_clusters[name]
+            current = bucket.get(resource)
+
+            if current is not None and item_start < current[1]:
+                current[0].append(item)
+                if item_end > current[1]:
+                    current[1] = item_end
+                continue
+
+            if current is not None and len(current[0]) > 1:
+                result[name].setdefault(resource, []).append(current[0])
+            bucket[resource] = [[item], item_end]
+
+    # Flush clusters that are still open after the last item
+    for name, bucket in open_clusters.items():
+        for resource, (cluster, _) in bucket.items():
+            if len(cluster) > 1:
+                result[name].setdefault(resource, []).append(cluster)
+
+    return result
+
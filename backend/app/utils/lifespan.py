@@ -5,6 +5,9 @@ from pathlib import Path
 from ..database import SessionLocal
 import app.utils.seeder as seed
 from ..config import setting
+from ..services import LessonService
+from .background_jobs import shutdown_jobs
+from .conflict_detection import shutdown_executor
 
 
 async def update_env_file():
@@ -47,6 +50,14 @@ async def lifespan(app: FastAPI):
         print("📊 Database initialized with sample data")
 
     seed.seed_first_admin(db)
+
+    # Rebuild the conflict index so it also covers lessons written outside LessonService
+    LessonService(db).conflict_index.rebuild()
     db.close()
 
     yield
+
+    # Stop conflict detection workers, if a large scan ever started them
+    shutdown_executor()
+    # Let a running import finish its transaction; queued ones are dropped
+    shutdown_jobs()
@@ -0,0 +1,461 @@
+import json
+import math
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import AbstractSet, Iterable, Iterator, List, Optional, Union
+
+from .enums import WeekParityEnum
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# Virtual occurrences have no lesson row; their IDs are negative and encode the
+# template and the occurrence date (ordinals stay below this factor)
+VIRTUAL_ID_FACTOR = 10_000_000
+
+
+def parse_days_of_week(days_of_week: Optional[str]) -> frozenset[int]:
+    """
+    Weekdays (0=Monday) listed in a template's days_of_week string.
+
+    Mirrors the membership test of lesson generation (str(day) in days_of_week), so
+    "[1,3,5]" and "1,3,5" are read the same way.
+
+    Args:
+        days_of_week (Optional[str]): Stored value, e.g. "[1,3,5]".
+
+    Returns:
+        frozenset[int]: Weekday numbers.
+    """
+    return frozenset(day for day in range(7) if str(day) in (days_of_week or ""))
+
+
+def weekday_mask(days_of_week: Optional[str]) -> int:
+    """
+    Compile a days_of_week string into a weekday bitmask (bit 0 = Monday).
+
+    Args:
+        days_of_week (Optional[str]): Stored value, e.g. "[1,3,5]".
+
+    Returns:
+        int: Bitmask of the weekdays.
+    """
+    return sum(1 << day for day in parse_days_of_week(days_of_week))
+
+
+def mask_weekdays(mask: int) -> frozenset[int]:
+    """
+    Weekdays (0=Monday) set in a weekday bitmask.
+    """
+    return frozenset(day for day in range(7) if mask >> day & 1)
+
+
+def parse_dates(value: Union[str, Iterable[date], None]) -> frozenset[date]:
+    """
+    Dates of a stored JSON array of ISO dates, or of an already parsed list.
+
+    Args:
+        value (Union[str, Iterable[date], None]): Stored value, e.g. '["2025-09-01"]'.
+
+    Returns:
+        frozenset[date]: The dates; empty if not set or unreadable.
+    """
+    if not value:
+        return frozenset()
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return frozenset()
+    return frozenset(
+        day if isinstance(day, date) else date.fromisoformat(day) for day in value
+    )
+
+
+def format_dates(dates: Optional[Iterable[date]]) -> Optional[str]:
+    """
+    Stored form of a date list: JSON array of sorted ISO dates, or None when empty.
+    """
+    dates = parse_dates(dates)
+    if not dates:
+        return None
+    return json.dumps([day.isoformat() for day in sorted(dates)])
+
+
+def week_start(day: date) -> date:
+    """
+    Monday of the week a date falls in.
+    """
+    return day - timedelta(days=day.weekday())
+
+
+def parse_unavailable_days(unavailable_days: Optional[str]) -> Optional[set[int]]:
+    """
+    Weekdays (0=Monday) a professor profile marks as unavailable.
+
+    Args:
+        unavailable_days (Optional[str]): Stored JSON array, e.g. "[5, 6]".
+
+    Returns:
+        Optional[set[int]]: Weekday numbers, or None if not set or unreadable.
+    """
+    if not unavailable_days:
+        return None
+    try:
+        return set(json.loads(unavailable_days))
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def format_weekdays(weekdays: Iterable[int]) -> str:
+    """
+    Human-readable weekday list, e.g. "Mon, Wed".
+    """
+    return ", ".join(WEEKDAY_NAMES[day] for day in sorted(weekdays))
+
+
+def iter_weekdays(start: date, end: date, weekdays: AbstractSet[int]) -> Iterator[date]:
+    """
+    Yield the dates in [start, end] that fall on one of the weekdays, in order.
+
+    Jumps from one matching weekday to the next instead of walking every day.
+
+    Args:
+        start (date): First date (inclusive).
+        end (date): Last date (inclusive).
+        weekdays (AbstractSet[int]): Weekday numbers (0=Monday).
+
+    Yields:
+        date: Matching dates.
+    """
+    if not weekdays or end < start:
+        return
+
+    # Offsets from the start date to each weekday in the first week
+    offsets = sorted((day - start.weekday()) % 7 for day in weekdays)
+    week = start
+    while week <= end:
+        for offset in offsets:
+            current = week + timedelta(days=offset)
+            if current > end:
+                return
+            yield current
+        week += timedelta(days=7)
+
+
+def count_weekdays(start: date, end: date, weekdays: AbstractSet[int]) -> int:
+    """
+    Count the dates in [start, end] that fall on one of the weekdays, in O(1).
+
+    Args:
+        start (date): First date (inclusive).
+        end (date): Last date (inclusive).
+        weekdays (AbstractSet[int]): Weekday numbers (0=Monday).
+
+    Returns:
+        int: Number of matching dates.
+    """
+    if not weekdays or end < start:
+        return 0
+
+    full_weeks, rest = divmod((end - start).days + 1, 7)
+    first = start.weekday()
+    return full_weeks * len(weekdays) + sum(
+        1 for offset in range(rest) if (first + offset) % 7 in weekdays
+    )
+
+
+def count_occurrences(
+    start: date,
+    end: date,
+    weekdays: AbstractSet[int],
+    excluded: AbstractSet[date] = frozenset(),
+) -> int:
+    """
+    Count the dates a weekly pattern occurs on, minus excluded dates (holidays).
+
+    Exclusions only ever remove occurrences, so only those that fall on a matching
+    weekday inside the range are subtracted.
+
+    Args:
+        start (date): First date (inclusive).
+        end (date): Last date (inclusive).
+        weekdays (AbstractSet[int]): Weekday numbers (0=Monday).
+        excluded (AbstractSet[date]): Dates without occurrences.
+
+    Returns:
+        int: Number of occurrences.
+    """
+    removed = sum(
+        1 for day in excluded if start <= day <= end and day.weekday() in weekdays
+    )
+    return count_weekdays(start, end, weekdays) - removed
+
+
+def first_occurrence(
+    start: date,
+    end: date,
+    weekdays: AbstractSet[int],
+    excluded: AbstractSet[date] = frozenset(),
+) -> Optional[date]:
+    """
+    First date a weekly pattern occurs on, skipping excluded dates.
+
+    Args:
+        start (date): First date (inclusive).
+        end (date): Last date (inclusive).
+        weekdays (AbstractSet[int]): Weekday numbers (0=Monday).
+        excluded (AbstractSet[date]): Dates without occurrences.
+
+    Returns:
+        Optional[date]: The first occurrence, or None if there is none.
+    """
+    return next(
+        (day for day in iter_weekdays(start, end, weekdays) if day not in excluded),
+        None,
+    )
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    Compiled recurrence pattern of a template.
+
+    Lessons occur on the weekdays of the mask in every week_interval-th week, counted
+    from interval_anchor (Monday of the template's first week), optionally only in
+    odd or even academic weeks (week 1 starts on parity_anchor, the Monday of the
+    semester's first week). Explicit include dates are added to the pattern and
+    exclude dates are removed from it; exclusions win.
+
+    Fields:
+    - weekday_mask: weekdays as a bitmask (bit 0 = Monday)
+    - interval_anchor: Monday of the week interval counting starts from
+    - week_interval: lessons every N-th week (1 = every week)
+    - week_parity: only odd or even academic weeks (None = every week)
+    - parity_anchor: Monday of academic week 1 (required with week_parity)
+    - include_dates/exclude_dates: explicit extra and skipped dates
+    """
+
+    weekday_mask: int
+    interval_anchor: date
+    week_interval: int = 1
+    week_parity: Optional[WeekParityEnum] = None
+    parity_anchor: Optional[date] = None
+    include_dates: frozenset[date] = frozenset()
+    exclude_dates: frozenset[date] = frozenset()
+
+    @property
+    def weekdays(self) -> frozenset[int]:
+        """Weekdays (0=Monday) of the weekly pattern."""
+        return mask_weekdays(self.weekday_mask)
+
+    @property
+    def is_weekly(self) -> bool:
+        """Every week on the same weekdays, without explicit dates."""
+        return (
+            self.week_interval == 1
+            and self.week_parity is None
+            and not self.include_dates
+            and not self.exclude_dates
+        )
+
+    def without_weekdays(
+        self, weekdays: Optional[AbstractSet[int]]
+    ) -> "RecurrenceRule":
+        """
+        The same rule without occurrences on the given weekdays (include dates too).
+
+        Args:
+            weekdays (Optional[AbstractSet[int]]): Weekdays to drop, e.g. a professor's unavailable days.
+
+        Returns:
+            RecurrenceRule: Restricted rule (self if nothing is dropped).
+        """
+        if not weekdays:
+            return self
+        return replace(
+            self,
+            weekday_mask=self.weekday_mask & ~sum(1 << day for day in weekdays),
+            include_dates=frozenset(
+                day for day in self.include_dates if day.weekday() not in weekdays
+            ),
+        )
+
+    def occurs_on(self, day: date) -> bool:
+        """
+        Whether the rule has an occurrence on a date (date range not checked).
+        """
+        if day in self.exclude_dates:
+            return False
+        if day in self.include_dates:
+            return True
+        return bool(self.weekday_mask >> day.weekday() & 1) and self._week_matches(
+            week_start(day)
+        )
+
+    def dates(self, start: date, end: date) -> List[date]:
+        """
+        Occurrence dates in [start, end], in order.
+
+        Steps straight from one matching week to the next (the interval and parity
+        repeat every lcm(week_interval, 2) weeks, with at most one matching week per
+        period) and from one matching weekday to the next inside it.
+
+        Args:
+            start (date): First date (inclusive).
+            end (date): Last date (inclusive).
+
+        Returns:
+            List[date]: Occurrence dates.
+        """
+        if end < start:
+            return []
+
+        dates = []
+        offsets = sorted(self.weekdays)
+        week = self._first_week(week_start(start)) if offsets else None
+        step = timedelta(weeks=self._period())
+        while week is not None and week <= end:
+            for offset in offsets:
+                day = week + timedelta(days=offset)
+                if day > end:
+                    break
+                if day >= start and day not in self.exclude_dates:
+                    dates.append(day)
+            week += step
+
+        extra = [
+            day
+            for day in self.include_dates
+            if start <= day <= end and day not in self.exclude_dates
+        ]
+        if extra:
+            dates = sorted(set(dates).union(extra))
+        return dates
+
+    def _period(self) -> int:
+        """Number of weeks after which the week pattern repeats."""
+        if self.week_parity is None:
+            return self.week_interval
+        return math.lcm(self.week_interval, 2)
+
+    def _week_matches(self, monday: date) -> bool:
+        """Whether the week starting on a Monday is part of the pattern."""
+        if self.week_interval > 1:
+            weeks = (monday - self.interval_anchor).days // 7
+            if weeks % self.week_interval:
+                return False
+        if self.week_parity is not None:
+            number = (monday - self.parity_anchor).days // 7 + 1
+            if (number % 2 == 1) != (self.week_parity == WeekParityEnum.odd):
+                return False
+        return True
+
+    def _first_week(self, monday: date) -> Optional[date]:
+        """First matching week starting on or after a Monday, or None if there is none."""
+        for weeks in range(self._period()):
+            candidate = monday + timedelta(weeks=weeks)
+            if self._week_matches(candidate):
+                return candidate
+        return None
+
+
+def template_rule(template) -> RecurrenceRule:
+    """
+    Recurrence rule of a template, from its compiled weekday mask.
+
+    Templates store the mask when they are saved; unsaved candidates without one
+    are compiled from days_of_week.
+
+    Args:
+        template (RecurringLessonTemplate | SimpleNamespace): Template or candidate.
+
+    Returns:
+        RecurrenceRule: The template's rule (professor unavailability and holidays not applied).
+    """
+    mask = getattr(template, "weekday_mask", None)
+    if mask is None:
+        mask = weekday_mask(template.days_of_week)
+
+    week_parity = template.week_parity
+    return RecurrenceRule(
+        weekday_mask=mask,
+        interval_anchor=week_start(template.start_date),
+        week_interval=template.week_interval or 1,
+        week_parity=WeekParityEnum(week_parity) if week_parity else None,
+        parity_anchor=(
+            week_start(template.schedule.semester.start_date) if week_parity else None
+        ),
+        include_dates=parse_dates(template.include_dates),
+        exclude_dates=parse_dates(template.exclude_dates),
+    )
+
+
+def shared_occurrences(
+    rule: RecurrenceRule,
+    other: RecurrenceRule,
+    start: date,
+    end: date,
+    excluded: AbstractSet[date] = frozenset(),
+) -> tuple[Optional[date], int, frozenset[int]]:
+    """
+    Dates in [start, end] on which two rules both occur, minus excluded dates (holidays).
+
+    Plain weekly rules are counted with weekday arithmetic; rules with an interval,
+    parity or explicit dates have their (sparse) date lists intersected.
+
+    Args:
+        rule (RecurrenceRule): First rule.
+        other (RecurrenceRule): Second rule.
+        start (date): First date (inclusive).
+        end (date): Last date (inclusive).
+        excluded (AbstractSet[date]): Dates without occurrences.
+
+    Returns:
+        tuple: (first shared date or None, number of shared dates, shared weekdays).
+    """
+    if rule.is_weekly and other.is_weekly:
+        weekdays = rule.weekdays & other.weekdays
+        first_date = first_occurrence(start, end, weekdays, excluded)
+        if first_date is None:
+            return None, 0, weekdays
+        return first_date, count_occurrences(start, end, weekdays, excluded), weekdays
+
+    shared = sorted(
+        set(rule.dates(start, end)).intersection(other.dates(start, end)) - excluded
+    )
+    if not shared:
+        return None, 0, frozenset()
+    return shared[0], len(shared), frozenset(day.weekday() for day in shared)
+
+
+def virtual_lesson_id(template_id: int, occurrence_date: date) -> int:
+    """
+    Stable ID of an occurrence of a virtual template.
+
+    Negative, so it never collides with a lesson row, and decodable with
+    parse_virtual_lesson_id().
+
+    Args:
+        template_id (int): Virtual template.
+        occurrence_date (date): Date of the occurrence in the template's pattern.
+
+    Returns:
+        int: Synthetic lesson ID.
+    """
+    return -(template_id * VIRTUAL_ID_FACTOR + occurrence_date.toordinal())
+
+
+def parse_virtual_lesson_id(lesson_id: int) -> Optional[tuple[int, date]]:
+    """
+    Decode an ID produced by virtual_lesson_id().
+
+    Args:
+        lesson_id (int): Lesson ID.
+
+    Returns:
+        Optional[tuple[int, date]]: (template ID, occurrence date), or None for lesson rows.
+    """
+    if lesson_id >= 0:
+        return None
+    template_id, ordinal = divmod(-lesson_id, VIRTUAL_ID_FACTOR)
+    return template_id, date.fromordinal(ordinal)
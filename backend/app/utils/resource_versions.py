@@ -0,0 +1,315 @@
+import hashlib
+import time
+from functools import lru_cache
+from typing import Any, Iterable, Set, Tuple
+
+from sqlalchemy import column, event, insert, inspect, select, table, tuple_, update
+from sqlalchemy.orm import Session
+
+from .cache import DateVersionClock, RowKey, RowVersionClock
+
+# Scope of a table-wide version, bumped by every write to the table
+ALL_ROWS = 0
+# Scope bumped by set-based writes to a scoped table whose rows' scopes are unknown
+UNKNOWN_SCOPE = -1
+
+# Session.info keys of the versions to bump on commit
+_PENDING = "resource_versions"
+_PENDING_ROWS = "row_versions"
+_PENDING_DATES = "date_versions"
+
+resource_version = table(
+    "resource_version",
+    column("resource"),
+    column("scope_id"),
+    column("version"),
+)
+
+VersionKey = Tuple[str, int]
+
+
+def track_resource_versions(session_factory) -> None:
+    """
+    Maintain resource versions for every session created by a session factory.
+
+    Written tables (and, for models declaring __version_scope__, the scope values of
+    the written rows) are collected on flush and on set-based INSERT/UPDATE/DELETE
+    statements, and their versions are bumped in the committing transaction.
+    Writes through a bare connection (migrations) are not tracked.
+
+    Args:
+        session_factory: sessionmaker (or Session class) to instrument.
+    """
+    event.listen(session_factory, "before_flush", _collect_flush)
+    event.listen(session_factory, "do_orm_execute", _collect_statement)
+    event.listen(session_factory, "before_commit", _bump_pending)
+    event.listen(session_factory, "after_rollback", _discard_pending)
+
+
+def track_row_versions(session_factory, clock: RowVersionClock) -> None:
+    """
+    Bump an in-process row clock for the rows committed by a session factory's sessions.
+
+    Updated and deleted rows are collected on flush, tables written by set-based
+    UPDATE/DELETE statements as a whole; inserted rows are skipped (nothing cached
+    can have been built from them). The clock is bumped after commit, so a value
+    cached from the old rows in between is stale rather than kept.
+
+    Args:
+        session_factory: sessionmaker (or Session class) to instrument.
+        clock (RowVersionClock): Clock to bump.
+    """
+
+    def collect_flush(session: Session, flush_context, instances) -> None:
+        rows, _ = session.info.setdefault(_PENDING_ROWS, (set(), set()))
+        for obj in (*session.dirty, *session.deleted):
+            state = inspect(obj)
+            if state.identity is not None and (
+                obj in session.deleted or session.is_modified(obj)
+            ):
+                rows.add(row_key(state))
+
+    def collect_statement(orm_execute_state) -> None:
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            _, tables = orm_execute_state.session.info.setdefault(
+                _PENDING_ROWS, (set(), set())
+            )
+            tables.add(orm_execute_state.statement.table.name)
+
+    def bump(session: Session) -> None:
+        pending = session.info.pop(_PENDING_ROWS, None)
+        if pending and any(pending):
+            clock.bump(*pending)
+
+    def discard(session: Session) -> None:
+        session.info.pop(_PENDING_ROWS, None)
+
+    event.listen(session_factory, "before_flush", collect_flush)
+    event.listen(session_factory, "do_orm_execute", collect_statement)
+    event.listen(session_factory, "after_commit", bump)
+    event.listen(session_factory, "after_rollback", discard)
+
+
+def track_date_versions(session_factory) -> None:
+    """
+    Bump in-process date clocks for the dates a session's transaction queued with
+    mark_dates(), once that transaction has committed.
+
+    Bumping after commit means a value cached from the old data in between is stale
+    rather than kept under the new version; rolled back transactions bump nothing.
+
+    Args:
+        session_factory: sessionmaker (or Session class) to instrument.
+    """
+
+    def bump(session: Session) -> None:
+        for clock, dates in session.info.pop(_PENDING_DATES, {}).items():
+            clock.bump(dates)
+
+    def discard(session: Session) -> None:
+        session.info.pop(_PENDING_DATES, None)
+
+    event.listen(session_factory, "after_commit", bump)
+    event.listen(session_factory, "after_rollback", discard)
+
+
+def mark_dates(session: Session, clock: DateVersionClock, dates: Iterable) -> None:
+    """
+    Queue a bump of dates on a date clock until the session commits.
+
+    Args:
+        session (Session): Session whose transaction wrote the data.
+        clock (DateVersionClock): Clock to bump.
+        dates (Iterable[date]): Dates whose data changed.
+    """
+    session.info.setdefault(_PENDING_DATES, {}).setdefault(clock, set()).update(dates)
+
+
+def row_key(state) -> RowKey:
+    """
+    Clock key of a persistent object.
+
+    Args:
+        state (InstanceState): Inspected object.
+
+    Returns:
+        RowKey: (table name, primary key identity).
+    """
+    return state.mapper.local_table.name, state.identity
+
+
+def loaded_rows(objects: Iterable[Any]) -> Set[RowKey]:
+    """
+    Keys of persistent objects and of every object reachable from them through
+    relationships that are already loaded (nothing is lazy loaded).
+
+    These are the rows a response serialized from the objects can show.
+
+    Args:
+        objects (Iterable[Any]): Mapped instances.
+
+    Returns:
+        Set[RowKey]: Keys of the reachable rows.
+    """
+    seen = set()
+    rows = set()
+    pending = [inspect(obj) for obj in objects]
+    while pending:
+        state = pending.pop()
+        if state.identity is None or id(state) in seen:
+            continue
+        seen.add(id(state))
+        rows.add(row_key(state))
+        for relationship in state.mapper.relationships:
+            value = state.dict.get(relationship.key)
+            if value is None:
+                continue
+            related = value if relationship.uselist else [value]
+            pending.extend(inspect(obj) for obj in related)
+    return rows
+
+
+def resource_etag(db: Session, resources: Iterable[VersionKey], *parts: Any) -> str:
+    """
+    Strong ETag of the data read from a set of resources.
+
+    Computed with one query on the version table, before the data itself is loaded,
+    so a write in between makes the tag stale rather than the response.
+
+    Args:
+        db (Session): Active SQLAlchemy session.
+        resources (Iterable[VersionKey]): (table, scope) pairs the response depends on.
+        *parts: Request values the response depends on (e.g. query parameters).
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    resources = sorted(set(resources))
+    versions = {
+        (resource, scope_id): version
+        for resource, scope_id, version in db.execute(
+            select(
+                resource_version.c.resource,
+                resource_version.c.scope_id,
+                resource_version.c.version,
+            ).where(
+                tuple_(resource_version.c.resource, resource_version.c.scope_id).in_(
+                    resources
+                )
+            )
+        )
+    }
+    digest = hashlib.sha1()
+    for resource, scope_id in resources:
+        version = versions.get((resource, scope_id), 0)
+        digest.update(f"{resource}:{scope_id}:{version};".encode())
+    for part in parts:
+        digest.update(f"{part};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+@lru_cache(maxsize=None)
+def related_tables(model) -> frozenset[str]:
+    """
+    Tables of a model and of every model reachable through its relationships.
+
+    Responses built from a model can nest any of them, so their versions cover it.
+
+    Args:
+        model: Mapped class.
+
+    Returns:
+        frozenset[str]: Table names.
+    """
+    seen = {inspect(model)}
+    pending = [inspect(model)]
+    while pending:
+        for relationship in pending.pop().relationships:
+            if relationship.mapper not in seen:
+                seen.add(relationship.mapper)
+                pending.append(relationship.mapper)
+    return frozenset(mapper.local_table.name for mapper in seen)
+
+
+def _mark(session: Session, resource: str, scopes: Iterable[int] = ()) -> None:
+    """Queue version bumps of a table (and of scopes of its rows) until commit."""
+    if resource == resource_version.name:
+        return
+    pending: Set[VersionKey] = session.info.setdefault(_PENDING, set())
+    pending.add((resource, ALL_ROWS))
+    pending.update((resource, scope_id) for scope_id in scopes)
+
+
+def _collect_flush(session: Session, flush_context, instances) -> None:
+    """Collect tables (and scopes) of the objects a flush writes."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        scope = getattr(state.mapper.class_, "__version_scope__", None)
+        scopes = set()
+        if scope is not None:
+            # Both the old and the new scope of a moved row change
+            history = state.attrs[scope].history
+            scopes = {
+                value
+                for value in (*history.added, *history.unchanged, *history.deleted)
+                if value is not None
+            }
+        _mark(session, state.mapper.local_table.name, scopes)
+
+
+def _collect_statement(orm_execute_state) -> None:
+    """Collect the table (and scopes, when known) of a set-based write statement."""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    scope = getattr(mapper.class_, "__version_scope__", None) if mapper else None
+    scopes = set()
+    if scope is not None:
+        rows = orm_execute_state.parameters
+        if isinstance(rows, dict):
+            rows = [rows]
+        if orm_execute_state.is_insert and rows and all(scope in row for row in rows):
+            scopes = {row[scope] for row in rows}
+        else:
+            scopes = {UNKNOWN_SCOPE}
+    _mark(
+        session=orm_execute_state.session,
+        resource=orm_execute_state.statement.table.name,
+        scopes=scopes,
+    )
+
+
+def _bump_pending(session: Session) -> None:
+    """Write the queued version bumps in the committing transaction."""
+    session.flush()
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+
+    connection = session.connection()
+    version = time.time_ns()
+    for resource, scope_id in sorted(pending):
+        key = (resource_version.c.resource == resource) & (
+            resource_version.c.scope_id == scope_id
+        )
+        result = connection.execute(
+            update(resource_version).where(key).values(version=version)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(resource_version).values(
+                    resource=resource, scope_id=scope_id, version=version
+                )
+            )
+
+
+def _discard_pending(session: Session) -> None:
+    """Drop the queued version bumps of a rolled back transaction."""
+    session.info.pop(_PENDING, None)
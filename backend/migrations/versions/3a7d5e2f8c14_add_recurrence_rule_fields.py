@@ -0,0 +1,100 @@
+"""Add recurrence rule fields to recurring lesson templates
+
+Revision ID: 3a7d5e2f8c14
+Revises: 9c4e2b7d1a60
+Create Date: 2026-10-18 19:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7d5e2f8c14'
+down_revision: Union[str, None] = '9c4e2b7d1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RULE_COLUMNS = (
+    "weekday_mask",
+    "week_interval",
+    "week_parity",
+    "include_dates",
+    "exclude_dates",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the columns from Base.metadata.create_all on startup
+    if not inspector.has_table("recurring_lesson_template"):
+        return
+
+    columns = {
+        column["name"]
+        for column in inspector.get_columns("recurring_lesson_template")
+    }
+    if "weekday_mask" in columns:
+        return
+
+    with op.batch_alter_table("recurring_lesson_template") as batch_op:
+        batch_op.add_column(sa.Column("weekday_mask", sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "week_interval", sa.Integer(), nullable=False, server_default="1"
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "week_parity",
+                sa.Enum("odd", "even", name="week_parity_enum"),
+                nullable=True,
+            )
+        )
+        batch_op.create_check_constraint(
+            "week_parity_enum", "week_parity IN ('odd', 'even')"
+        )
+        batch_op.add_column(sa.Column("include_dates", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("exclude_dates", sa.Text(), nullable=True))
+
+    # Compile days_of_week of existing templates, matching weekdays the way lesson
+    # generation did (substring test of each weekday number)
+    bind = op.get_bind()
+    templates = sa.table(
+        "recurring_lesson_template",
+        sa.column("id", sa.Integer),
+        sa.column("days_of_week", sa.String),
+        sa.column("weekday_mask", sa.Integer),
+    )
+    for template_id, days_of_week in bind.execute(
+        sa.select(templates.c.id, templates.c.days_of_week)
+    ):
+        mask = sum(1 << day for day in range(7) if str(day) in (days_of_week or ""))
+        bind.execute(
+            templates.update()
+            .where(templates.c.id == template_id)
+            .values(weekday_mask=mask)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("recurring_lesson_template"):
+        return
+
+    columns = {
+        column["name"]
+        for column in inspector.get_columns("recurring_lesson_template")
+    }
+    with op.batch_alter_table("recurring_lesson_template") as batch_op:
+        if "week_parity" in columns:
+            batch_op.drop_constraint("week_parity_enum", type_="check")
+        for column in RULE_COLUMNS:
+            if column in columns:
+                batch_op.drop_column(column)
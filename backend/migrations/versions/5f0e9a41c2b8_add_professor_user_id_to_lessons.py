@@ -0,0 +1,108 @@
+"""Add denormalized professor_user_id to lessons and templates
+
+Revision ID: 5f0e9a41c2b8
+Revises: d2c7357c4e3f
+Create Date: 2026-10-18 14:03:27.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0e9a41c2b8'
+down_revision: Union[str, None] = 'd2c7357c4e3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# subject_assignment -> workload -> contract.professor_profile_id (= professor user id)
+PROFESSOR_OF_ASSIGNMENT = """
+    SELECT pc.professor_profile_id
+    FROM subject_assignment sa
+    JOIN professor_workload pw ON pw.id = sa.workload_id
+    JOIN professor_contract pc ON pc.id = pw.contract_id
+    WHERE sa.id = {table}.subject_assignment_id
+"""
+
+TABLE_INDEXES = {
+    "lesson": (
+        "idx_professor_time_conflict",
+        ["professor_user_id", "date", "start_time", "end_time"],
+    ),
+    "recurring_lesson_template": (
+        "ix_recurring_lesson_template_professor_user_id",
+        ["professor_user_id"],
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    for table, (index_name, index_columns) in TABLE_INDEXES.items():
+        # Fresh databases get the column from Base.metadata.create_all on startup
+        if not inspector.has_table(table):
+            continue
+
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "professor_user_id" not in columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(
+                    sa.Column("professor_user_id", sa.Integer(), nullable=True)
+                )
+                batch_op.create_foreign_key(
+                    f"fk_{table}_professor_user_id",
+                    "user",
+                    ["professor_user_id"],
+                    ["id"],
+                )
+
+        # Backfill from the assignment chain
+        op.execute(
+            f"UPDATE {table} SET professor_user_id = ("
+            + PROFESSOR_OF_ASSIGNMENT.format(table=table)
+            + ")"
+        )
+
+        existing = {
+            index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)
+        }
+        if index_name not in existing:
+            op.create_index(index_name, table, index_columns)
+
+    # The professor probe no longer goes through subject assignments
+    if inspector.has_table("lesson"):
+        existing = {index["name"] for index in inspector.get_indexes("lesson")}
+        if "idx_assignment_time_conflict" in existing:
+            op.drop_index("idx_assignment_time_conflict", table_name="lesson")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    for table, (index_name, _) in TABLE_INDEXES.items():
+        if not inspector.has_table(table):
+            continue
+
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if index_name in existing:
+            op.drop_index(index_name, table_name=table)
+
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "professor_user_id" in columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column("professor_user_id")
+
+    if inspector.has_table("lesson"):
+        existing = {index["name"] for index in inspector.get_indexes("lesson")}
+        if "idx_assignment_time_conflict" not in existing:
+            op.create_index(
+                "idx_assignment_time_conflict",
+                "lesson",
+                ["subject_assignment_id", "date", "start_time", "end_time"],
+            )
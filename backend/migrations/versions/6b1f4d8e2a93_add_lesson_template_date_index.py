@@ -0,0 +1,47 @@
+"""Add lesson template/date index
+
+Revision ID: 6b1f4d8e2a93
+Revises: 3a7d5e2f8c14
+Create Date: 2026-10-18 21:04:52.309127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1f4d8e2a93'
+down_revision: Union[str, None] = '3a7d5e2f8c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the index from Base.metadata.create_all on startup
+    if not inspector.has_table("lesson"):
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("lesson")}
+    if "idx_lesson_template_date" not in existing:
+        op.create_index(
+            "idx_lesson_template_date",
+            "lesson",
+            ["recurring_template_id", "date"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("lesson"):
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("lesson")}
+    if "idx_lesson_template_date" in existing:
+        op.drop_index("idx_lesson_template_date", table_name="lesson")
@@ -0,0 +1,44 @@
+"""Add resource versions for ETags
+
+Revision ID: 8e3c5a7b9d21
+Revises: 6b1f4d8e2a93
+Create Date: 2026-10-18 22:17:05.641938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3c5a7b9d21'
+down_revision: Union[str, None] = '6b1f4d8e2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the table from Base.metadata.create_all on startup;
+    # existing data starts at version 0 until its first tracked write
+    if not inspector.has_table("lesson") or inspector.has_table("resource_version"):
+        return
+
+    op.create_table(
+        "resource_version",
+        sa.Column("resource", sa.String(length=64), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("resource", "scope_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("resource_version"):
+        op.drop_table("resource_version")
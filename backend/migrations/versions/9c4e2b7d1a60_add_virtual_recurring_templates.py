@@ -0,0 +1,103 @@
+"""Add virtual recurring templates and their occurrence exceptions
+
+Revision ID: 9c4e2b7d1a60
+Revises: 5f0e9a41c2b8
+Create Date: 2026-10-18 17:41:09.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1a60'
+down_revision: Union[str, None] = '5f0e9a41c2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the column and table from Base.metadata.create_all on startup
+    if not inspector.has_table("recurring_lesson_template"):
+        return
+
+    columns = {
+        column["name"]
+        for column in inspector.get_columns("recurring_lesson_template")
+    }
+    if "is_virtual" not in columns:
+        with op.batch_alter_table("recurring_lesson_template") as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    "is_virtual",
+                    sa.Boolean(),
+                    nullable=False,
+                    server_default=sa.false(),
+                )
+            )
+
+    if not inspector.has_table("recurring_lesson_exception"):
+        op.create_table(
+            "recurring_lesson_exception",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("template_id", sa.Integer(), nullable=False),
+            sa.Column("occurrence_date", sa.Date(), nullable=False),
+            sa.Column("is_cancelled", sa.Boolean(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=True),
+            sa.Column("start_time", sa.Time(), nullable=True),
+            sa.Column("end_time", sa.Time(), nullable=True),
+            sa.Column("room_id", sa.Integer(), nullable=True),
+            sa.Column("is_online", sa.Boolean(), nullable=True),
+            sa.Column(
+                "lesson_type",
+                sa.Enum(
+                    "lecture",
+                    "seminar",
+                    "lab",
+                    "practice",
+                    name="lesson_type_enum",
+                    create_constraint=True,
+                ),
+                nullable=True,
+            ),
+            sa.ForeignKeyConstraint(
+                ["template_id"],
+                ["recurring_lesson_template.id"],
+                ondelete="CASCADE",
+            ),
+            sa.ForeignKeyConstraint(["room_id"], ["room.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "template_id",
+                "occurrence_date",
+                name="uq_recurring_exception_occurrence",
+            ),
+        )
+        op.create_index(
+            "idx_recurring_exception_date", "recurring_lesson_exception", ["date"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("recurring_lesson_exception"):
+        op.drop_index(
+            "idx_recurring_exception_date", table_name="recurring_lesson_exception"
+        )
+        op.drop_table("recurring_lesson_exception")
+
+    if inspector.has_table("recurring_lesson_template"):
+        columns = {
+            column["name"]
+            for column in inspector.get_columns("recurring_lesson_template")
+        }
+        if "is_virtual" in columns:
+            with op.batch_alter_table("recurring_lesson_template") as batch_op:
+                batch_op.drop_column("is_virtual")
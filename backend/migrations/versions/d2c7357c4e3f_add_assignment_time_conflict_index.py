@@ -0,0 +1,47 @@
+"""Add professor-side lesson conflict index
+
+Revision ID: d2c7357c4e3f
+Revises: b8453aa25d91
+Create Date: 2026-10-18 10:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c7357c4e3f'
+down_revision: Union[str, None] = 'b8453aa25d91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the index from Base.metadata.create_all on startup
+    if not inspector.has_table("lesson"):
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("lesson")}
+    if "idx_assignment_time_conflict" not in existing:
+        op.create_index(
+            "idx_assignment_time_conflict",
+            "lesson",
+            ["subject_assignment_id", "date", "start_time", "end_time"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("lesson"):
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("lesson")}
+    if "idx_assignment_time_conflict" in existing:
+        op.drop_index("idx_assignment_time_conflict", table_name="lesson")
@@ -0,0 +1,96 @@
+"""Add lesson change log for delta sync
+
+Revision ID: d5b8e1f3a7c6
+Revises: 8e3c5a7b9d21
+Create Date: 2026-10-18 23:41:26.204815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b8e1f3a7c6'
+down_revision: Union[str, None] = '8e3c5a7b9d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same triggers as app.models.lesson_change, frozen at this revision
+TRIGGERS = {
+    "lesson_change_insert": """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_insert AFTER INSERT ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = NEW.id AND schedule_id = NEW.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (NEW.id, NEW.schedule_id, 0);
+    END
+    """,
+    "lesson_change_update": """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_update AFTER UPDATE ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = OLD.id AND schedule_id IN (OLD.schedule_id, NEW.schedule_id);
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        SELECT OLD.id, OLD.schedule_id, 1 WHERE OLD.schedule_id IS NOT NEW.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (NEW.id, NEW.schedule_id, 0);
+    END
+    """,
+    "lesson_change_delete": """
+    CREATE TRIGGER IF NOT EXISTS lesson_change_delete AFTER DELETE ON lesson
+    BEGIN
+        DELETE FROM lesson_change
+        WHERE lesson_id = OLD.id AND schedule_id = OLD.schedule_id;
+        INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted)
+        VALUES (OLD.id, OLD.schedule_id, 1);
+    END
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the table and triggers from Base.metadata.create_all on startup
+    if not inspector.has_table("lesson") or inspector.has_table("lesson_change"):
+        return
+
+    op.create_table(
+        "lesson_change",
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("lesson_id", sa.Integer(), nullable=False),
+        sa.Column("schedule_id", sa.Integer(), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(
+        "idx_lesson_change_schedule_seq", "lesson_change", ["schedule_id", "seq"]
+    )
+    op.create_index(
+        "idx_lesson_change_lesson", "lesson_change", ["lesson_id", "schedule_id"]
+    )
+
+    # Existing lessons are logged once, so a first sync from 0 returns all of them
+    op.execute(
+        "INSERT INTO lesson_change (lesson_id, schedule_id, is_deleted) "
+        "SELECT id, schedule_id, 0 FROM lesson ORDER BY id"
+    )
+    for trigger in TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    if inspector.has_table("lesson_change"):
+        op.drop_index("idx_lesson_change_lesson", table_name="lesson_change")
+        op.drop_index("idx_lesson_change_schedule_seq", table_name="lesson_change")
+        op.drop_table("lesson_change")
@@ -0,0 +1,95 @@
+"""Add persisted lesson conflict index
+
+Revision ID: f3a9c1d6b274
+Revises: d5b8e1f3a7c6
+Create Date: 2026-10-18 23:58:12.470316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c1d6b274'
+down_revision: Union[str, None] = 'd5b8e1f3a7c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the tables from Base.metadata.create_all on startup;
+    # the index itself is rebuilt from the lesson table on every startup
+    if not inspector.has_table("lesson"):
+        return
+
+    if not inspector.has_table("lesson_conflict"):
+        op.create_table(
+            "lesson_conflict",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("type", sa.String(length=20), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("resource_id", sa.Integer(), nullable=False),
+            sa.Column("start_time", sa.Time(), nullable=False),
+            sa.Column("end_time", sa.Time(), nullable=False),
+            sa.Column("severity", sa.String(length=20), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "idx_lesson_conflict_resource",
+            "lesson_conflict",
+            ["date", "type", "resource_id"],
+        )
+    else:
+        # Tables created by create_all before messages were built at read time
+        columns = {
+            column["name"] for column in inspector.get_columns("lesson_conflict")
+        }
+        if "message" in columns:
+            with op.batch_alter_table("lesson_conflict") as batch_op:
+                batch_op.drop_column("message")
+
+    if not inspector.has_table("lesson_conflict_member"):
+        op.create_table(
+            "lesson_conflict_member",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("conflict_id", sa.Integer(), nullable=False),
+            sa.Column("lesson_id", sa.Integer(), nullable=False),
+            sa.Column("schedule_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["conflict_id"], ["lesson_conflict.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_lesson_conflict_member_conflict_id",
+            "lesson_conflict_member",
+            ["conflict_id"],
+        )
+        op.create_index(
+            "ix_lesson_conflict_member_lesson_id",
+            "lesson_conflict_member",
+            ["lesson_id"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("lesson_conflict_member"):
+        op.drop_index(
+            "ix_lesson_conflict_member_lesson_id", table_name="lesson_conflict_member"
+        )
+        op.drop_index(
+            "ix_lesson_conflict_member_conflict_id",
+            table_name="lesson_conflict_member",
+        )
+        op.drop_table("lesson_conflict_member")
+    if inspector.has_table("lesson_conflict"):
+        op.drop_index("idx_lesson_conflict_resource", table_name="lesson_conflict")
+        op.drop_table("lesson_conflict")